@@ -0,0 +1,437 @@
+# analyses.py
+"""
+The dashboard analyses as pure functions (the sections of streamlit.py and
+the year-level views of streamlit2.py), plus a memoized result store.
+
+Each analysis is registered under a name and takes the shared
+``ElectionSet`` and keyword parameters (years, parties, ...). It only reads
+its inputs and returns DataFrames (or a dict of them), so a result is fully
+determined by (dataset version, name, parameters). ``AnalysisStore`` keeps
+results under that key: revisiting a section, or switching a widget back to
+an earlier value, is a dictionary lookup. Results are shared between
+callers and must not be modified in place.
+"""
+from collections import OrderedDict
+
+import pandas as pd
+
+import data_store
+import dims
+from facts import margins
+
+ANALYSES = {}
+
+
+def analysis(name):
+    """Register ``fn(elections, **params)`` under ``name``."""
+    def register(fn):
+        ANALYSES[name] = fn
+        return fn
+    return register
+
+
+# -----------------------------
+# Memoized store
+# -----------------------------
+class AnalysisStore:
+    def __init__(self, elections, version, maxsize=256):
+        self.elections = elections
+        self.version = version
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._results = OrderedDict()
+
+    @staticmethod
+    def _freeze(value):
+        if isinstance(value, (list, tuple)):
+            return tuple(value)
+        if isinstance(value, (set, frozenset)):
+            return tuple(sorted(value))
+        return value
+
+    def run(self, name, **params):
+        """Result of analysis ``name`` for ``params``, computed at most once."""
+        params = {k: self._freeze(v) for k, v in params.items()}
+        key = (self.version, name, tuple(sorted(params.items())))
+        if key in self._results:
+            self.hits += 1
+            self._results.move_to_end(key)
+            return self._results[key]
+
+        self.misses += 1
+        result = ANALYSES[name](self.elections, **params)
+        self._results[key] = result
+        if len(self._results) > self.maxsize:
+            self._results.popitem(last=False)
+        return result
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._results)}
+
+
+# -----------------------------
+# Turnout
+# -----------------------------
+@analysis("constituency_turnout")
+def constituency_turnout(elections, year, n=10):
+    """Top and bottom ``n`` candidate rows of one election by turnout (section 1)."""
+    ranked = elections.frame(year).sort_values("turnout", ascending=False)
+    return {"top": ranked.head(n), "bottom": ranked.sort_values("turnout").head(n)}
+
+
+@analysis("state_turnout")
+def state_turnout(elections, year):
+    """Average turnout per state for one election, ascending (section 2)."""
+    return elections.turnout_by(["state_name"])[year].dropna().sort_values().rename("turnout")
+
+
+@analysis("state_turnout_change")
+def state_turnout_change(elections, y0, y1):
+    """Per-state average turnout in both elections and the change (sections 12, 13)."""
+    state_turnout = elections.turnout_by(["state_name"])
+    return pd.DataFrame({
+        "t0": state_turnout[y0],
+        "t1": state_turnout[y1],
+        "change": elections.delta("turnout", ["state_name"], y0, y1),
+    }).dropna().reset_index()
+
+
+@analysis("turnout_consistency")
+def turnout_consistency(elections, y0, y1):
+    """Constituencies in the top / bottom 10% of turnout in both elections (section 19)."""
+    pivot = elections.turnout_by(["pc_name"])[[y0, y1]].dropna()
+    high = (pivot[y0] >= pivot[y0].quantile(0.9)) & (pivot[y1] >= pivot[y1].quantile(0.9))
+    low = (pivot[y0] <= pivot[y0].quantile(0.1)) & (pivot[y1] <= pivot[y1].quantile(0.1))
+    return {"pivot": pivot, "high": pivot[high], "low": pivot[low]}
+
+
+@analysis("age_turnout")
+def age_turnout(elections, y0, y1):
+    """General votes per age group and their change between two elections (section 20)."""
+    df_all = elections.df
+    if "age" not in df_all.columns or "general_votes" not in df_all.columns:
+        return None
+
+    df_age = df_all[df_all["age"].notna()].copy()
+    bins = [18, 25, 35, 45, 55, 65, 100]
+    labels = ["18-24", "25-34", "35-44", "45-54", "55-64", "65+"]
+    df_age["age_group"] = pd.cut(df_age["age"], bins=bins, labels=labels, right=False)
+
+    grouped = df_age.groupby(["year", "age_group"], observed=True)["general_votes"].sum().reset_index()
+    out = {"rows": len(df_age), "years": df_age["year"].unique(), "grouped": grouped, "pivot": None, "change": None}
+    if grouped.empty:
+        return out
+
+    pivot = grouped.pivot(index="age_group", columns="year", values="general_votes").fillna(0).reset_index()
+    out["pivot"] = pivot.copy()
+
+    pivot.columns = pivot.columns.astype(str)
+    a, b = str(y0), str(y1)
+    if a not in pivot.columns: pivot[a] = 0
+    if b not in pivot.columns: pivot[b] = 0
+    pivot["change"] = pivot[b] - pivot[a]
+    pivot["abs_change"] = pivot["change"].abs()
+    out["change"] = pivot.sort_values("abs_change", ascending=False)
+    return out
+
+
+@analysis("youth_turnout")
+def youth_turnout(elections, y0, y1, n=20):
+    """Constituencies with the largest rise in 18-25 vote share, with the later winner (section 21)."""
+    df_all = elections.df
+    if "age" not in df_all.columns or "general_votes" not in df_all.columns:
+        return None
+
+    # Constituency names repeat across states (Aurangabad, Hamirpur, ...): key by state too
+    keys = ["year", "state", "pc_name"]
+    youth_votes = df_all[(df_all["age"] >= 18) & (df_all["age"] <= 25)]
+    youth = youth_votes.groupby(keys, observed=True)["general_votes"].sum().reset_index(name="youth_votes")
+    total_votes_pc = df_all.groupby(keys, observed=True)["total_votes"].max().reset_index()
+    youth = youth.merge(total_votes_pc, on=keys, how="left")
+    youth["youth_turnout_pct"] = (youth["youth_votes"] / youth["total_votes"]) * 100
+
+    pivot = youth.pivot(index=["state", "pc_name"], columns="year", values="youth_turnout_pct").reset_index()
+    for year in [y0, y1]:
+        if year not in pivot.columns: pivot[year] = 0
+    pivot = pivot.rename(columns={y0: f"turnout_{y0}", y1: f"turnout_{y1}"}).fillna(0)
+    pivot["youth_turnout_change"] = pivot[f"turnout_{y1}"] - pivot[f"turnout_{y0}"]
+
+    winners_latest = elections.winners(y1)[["state", "pc_name", "party", "state_name"]]
+    pivot = pivot.merge(winners_latest, on=["state", "pc_name"], how="left")
+    return pivot.sort_values("youth_turnout_change", ascending=False).head(n)
+
+
+# -----------------------------
+# Winners and margins
+# -----------------------------
+@analysis("same_party")
+def same_party(elections, y0, y1):
+    """Constituencies won by the same party twice, ranked by the later vote % (section 3)."""
+    merged = elections.compare(y0, y1)
+    same = merged[merged[f"winner_party_{y0}"] == merged[f"winner_party_{y1}"]].rename(
+        columns={f"winner_party_{y1}": f"party_{y1}", f"winner_vote_pct_{y1}": f"vote_pct_{y1}"}
+    )
+    return same[["pc_name", f"party_{y1}", f"vote_pct_{y1}"]].sort_values(f"vote_pct_{y1}", ascending=False)
+
+
+@analysis("party_switch")
+def party_switch(elections, y0, y1):
+    """Constituencies that changed party, ranked by the change in winner vote % (section 4)."""
+    merged = elections.compare(y0, y1)
+    diff = merged[merged[f"winner_party_{y0}"] != merged[f"winner_party_{y1}"]].rename(columns={
+        f"winner_party_{y0}": f"party_{y0}", f"winner_vote_pct_{y0}": f"vote_pct_{y0}",
+        f"winner_party_{y1}": f"party_{y1}", f"winner_vote_pct_{y1}": f"vote_pct_{y1}",
+    })
+    diff["vote_pct_diff"] = (diff[f"vote_pct_{y1}"] - diff[f"vote_pct_{y0}"]).abs()
+    cols = ["pc_name", f"party_{y0}", f"vote_pct_{y0}", f"party_{y1}", f"vote_pct_{y1}", "vote_pct_diff"]
+    return diff[cols].sort_values("vote_pct_diff", ascending=False)
+
+
+@analysis("margin_change")
+def margin_change(elections, y0, y1, n=10):
+    """Largest increases in winning margin (section 5)."""
+    merged = elections.compare(y0, y1)[["pc_name", "state", f"margin_{y0}", f"margin_{y1}"]].copy()
+    merged["margin_diff"] = merged[f"margin_{y1}"] - merged[f"margin_{y0}"]
+    return merged.sort_values("margin_diff", ascending=False).head(n)
+
+
+@analysis("competitive")
+def competitive(elections, year, n=10):
+    """
+    Smallest winning margins for one election (section 14). Unlike the fact
+    table's margin (total votes, NOTA excluded), this is the top two on
+    general (EVM) votes with NOTA counted among them, and 0 in a seat with
+    a single candidate, as the dashboard has always defined it.
+    """
+    top = margins(elections.frame(year), ["state", "pc_name"], value="general_votes")
+    top["margin"] = top["margin"].where(top["runner_up"].notna(), 0)
+    names = elections.facts.loc[elections.facts["year"] == year, ["state", "pc_name", "state_name"]]
+    rows = top.merge(names, on=["state", "pc_name"], how="left")
+    rows = rows.rename(columns={"winner": "candidate", "winner_party": "party"}).assign(year=year)
+    return rows.nsmallest(n, "margin")[["pc_name", "margin", "state_name", "candidate", "party", "year"]]
+
+
+@analysis("low_share_winners")
+def low_share_winners(elections, year, threshold=10):
+    """Winners whose party polled under ``threshold`` % in their state (sections 11, 16)."""
+    share = elections.share_by(["state_name", "party"], within=["state_name"])[year]
+    low = share.rename("vote_pct").reset_index()
+    low = low[low["vote_pct"] < threshold]
+    winners = elections.winners(year)[["pc_name", "state_name", "party", "candidate", "total_votes"]]
+    return winners.merge(low[["state_name", "party"]], on=["state_name", "party"])
+
+
+@analysis("seat_transitions")
+def seat_transitions(elections, y0, y1, state=None, zone=None):
+    """
+    Seats per (``y0`` winner, ``y1`` winner) party pair: rows are the party
+    that held a seat, columns the party that won it next, the diagonal the
+    seats retained. Narrowed to one ``state`` or ``zone`` (dims.ZONES)
+    when given (sections 3, 4 and 18).
+    """
+    merged = elections.compare(y0, y1)
+    if state is not None:
+        merged = merged[merged[f"state_name_{y1}"] == state]
+    elif zone is not None:
+        merged = merged[merged[f"state_name_{y1}"].isin(dims.ZONES[zone])]
+    return pd.crosstab(
+        merged[f"winner_party_{y0}"].astype(object).rename(f"party_{y0}"),
+        merged[f"winner_party_{y1}"].astype(object).rename(f"party_{y1}"),
+    )
+
+
+def transition_flows(matrix):
+    """A transition matrix as one row per (from, to) party pair with its seats, largest first."""
+    flows = matrix.stack().rename("seats").reset_index()
+    return flows[flows["seats"] > 0].sort_values("seats", ascending=False, kind="stable", ignore_index=True)
+
+
+@analysis("seat_gains")
+def seat_gains(elections, y0, y1, state=None, zone=None):
+    """Seats each party took from a different party (section 18)."""
+    flows = transition_flows(seat_transitions(elections, y0, y1, state, zone))
+    changed = flows[flows[f"party_{y1}"] != flows[f"party_{y0}"]]
+    return (
+        changed.groupby(f"party_{y1}")["seats"].sum().reset_index(name="gains")
+        .sort_values("gains", ascending=False)
+    )
+
+
+# -----------------------------
+# Votes and vote share
+# -----------------------------
+@analysis("national_share")
+def national_share(elections, y0, y1):
+    """National vote share per party in both elections (section 6)."""
+    party_share = elections.share_by(["party"])
+    return pd.DataFrame({
+        f"{y0}_pct": party_share[y0],
+        f"{y1}_pct": party_share[y1],
+    }).reset_index().sort_values(f"{y1}_pct", ascending=False)
+
+
+@analysis("state_party_share")
+def state_party_share(elections, y0, y1):
+    """Party vote share within each state in both elections (section 7)."""
+    share = elections.share_by(["state_name", "party"], within=["state_name"])
+    merged = pd.DataFrame({
+        f"vote_share_{y0}": share[y0],
+        f"vote_share_{y1}": share[y1],
+    }).fillna(0).reset_index()
+    return merged[(merged[f"vote_share_{y0}"] > 0) | (merged[f"vote_share_{y1}"] > 0)]
+
+
+@analysis("party_vote_changes")
+def party_vote_changes(elections, y0, y1, parties, gains=True, n=10):
+    """Per party, the ``n`` constituencies with the largest vote gains or losses (sections 8, 9)."""
+    keys = ["pc_name", "party"]
+    votes = elections.votes_by(keys)
+    merged = pd.DataFrame({
+        f"total_votes_{y0}": votes[y0],
+        f"total_votes_{y1}": votes[y1],
+        "vote_diff": elections.delta("votes", keys, y0, y1),
+    }).reset_index()
+    merged = merged[merged["party"].isin(parties)]
+    return {
+        party: merged[merged["party"] == party].sort_values("vote_diff", ascending=not gains).head(n)
+        for party in parties
+    }
+
+
+@analysis("share_shift")
+def share_shift(elections, y0, y1, n=20):
+    """Largest changes in a party's constituency vote share, parties present in both years (section 15)."""
+    keys = ["pc_name", "party"]
+    votes = elections.votes_by(keys)
+    share = elections.share_by(keys, within=["pc_name"])
+    both = (votes[y0] > 0) & (votes[y1] > 0)
+    merged = pd.DataFrame({
+        f"share_{y0}": share[y0],
+        f"share_{y1}": share[y1],
+        "vote_share_change": elections.delta("share", keys, y0, y1, within=["pc_name"]),
+    })[both].reset_index()
+    merged["abs_change"] = merged["vote_share_change"].abs()
+    return merged.sort_values("abs_change", ascending=False).head(n)
+
+
+# -----------------------------
+# NOTA
+# -----------------------------
+@analysis("nota_top")
+def nota_top(elections, y0, y1, n=10):
+    """Constituencies with the most NOTA votes over two elections (section 10)."""
+    nota = elections.compare(y0, y1, how="outer").rename(columns={
+        f"nota_votes_{y0}": f"nota_{y0}",
+        f"nota_votes_{y1}": f"nota_{y1}",
+    })[["pc_name", f"nota_{y0}", f"nota_{y1}"]].fillna(0)
+    nota["total_nota"] = nota[f"nota_{y0}"] + nota[f"nota_{y1}"]
+    return nota.sort_values("total_nota", ascending=False).head(n).reset_index(drop=True)
+
+
+@analysis("nota_distribution")
+def nota_distribution(elections, n=20):
+    """NOTA votes per state and year, and the top constituencies over all years (section 17)."""
+    nota = elections.df[elections.df["party"] == "NOTA"]
+    by_state = nota.groupby(["state_name", "year"], observed=True)["total_votes"].sum().reset_index()
+    by_pc = nota.groupby(["pc_name", "year"], observed=True)["total_votes"].sum().reset_index()
+    pivot = by_pc.pivot(index="pc_name", columns="year", values="total_votes").fillna(0)
+    pivot["total"] = pivot.sum(axis=1)
+    return {"state": by_state, "top": pivot.sort_values("total", ascending=False).head(n).reset_index()}
+
+
+# -----------------------------
+# Candidate dashboard (streamlit2.py), by year only
+# -----------------------------
+@analysis("state_votes")
+def state_votes(elections, years):
+    """Total votes per state over the given elections."""
+    df = elections.df[elections.df["year"].isin(years)]
+    return (
+        df.groupby("state", as_index=False, observed=True)["total_votes"].sum()
+        .sort_values("total_votes", ascending=False)
+    )
+
+
+@analysis("party_votes")
+def party_votes(elections, years):
+    """Total votes per party and election."""
+    df = elections.df[elections.df["year"].isin(years)]
+    return (
+        df.groupby(["year", "party"], as_index=False, observed=True)["total_votes"].sum()
+        .sort_values(["party", "year"])
+    )
+
+
+@analysis("top_candidates")
+def top_candidates(elections, years, n=5):
+    """The ``n`` candidates with the most votes in each state."""
+    return state_top_candidates(elections, n, year=years)
+
+
+def state_top_candidates(elections, n=5, **where):
+    """The ``n`` candidates with the most votes in each state, over rows matching ``where``."""
+    votes = elections.backend.group_sum(["state", "candidate", "party"], ["total_votes"], where).reset_index()
+    return (
+        votes.sort_values(["state", "total_votes"], ascending=[True, False])
+        .groupby("state", observed=True)
+        .head(n)
+    )
+
+
+@analysis("state_turnout_pct")
+def state_turnout_pct(elections):
+    """Turnout % per state and election from summed votes and electors."""
+    turnout = elections.backend.group_sum(["state", "year"], ["total_votes", "total_electors"]).reset_index()
+    turnout["turnout_pct"] = (turnout["total_votes"] / turnout["total_electors"]) * 100
+    return turnout
+
+
+@analysis("state_turnout_pct_change")
+def state_turnout_pct_change(elections, y0, y1):
+    """Per-state turnout % in two elections and the change, states in both only."""
+    turnout = state_turnout_pct(elections)
+    pivot = turnout.pivot(index="state", columns="year", values="turnout_pct").reset_index()
+    pivot.columns.name = None
+    pivot = pivot[["state", y0, y1]].dropna()
+    pivot["change_pct"] = pivot[y1] - pivot[y0]
+    return pivot
+
+
+# -----------------------------
+# Candidate dashboard pages over the sidebar's filtered rows
+# -----------------------------
+# Not registered: they take the rows the sidebar filters select (FilterIndex
+# masks over the results dataset) rather than an ElectionSet, and are
+# shared by streamlit2.py and bench.py.
+def _votes(rows, keys):
+    """Total votes per ``keys`` as columns, summed as int64."""
+    votes = rows.groupby(keys, as_index=False, observed=True)["total_votes"].sum()
+    return data_store.widen_sums(votes, {"total_votes": votes["total_votes"].dtype})
+
+
+def home_state_votes(rows):
+    """Total votes per (state_id, state) for the Home map."""
+    return _votes(rows, ["state_id", "state"])
+
+
+def statewise_votes(rows):
+    """Total votes per state, descending."""
+    return _votes(rows, ["state"]).sort_values("total_votes", ascending=False)
+
+
+def party_performance(rows):
+    """(votes per year and party, votes per party descending)."""
+    trend_data = _votes(rows, ["year", "party"]).sort_values(["party", "year"])
+    bar_data = _votes(rows, ["party"]).sort_values("total_votes", ascending=False)
+    return trend_data, bar_data
+
+
+def state_party_votes(rows, by_year=False):
+    """Total votes per (state, party), or per (year, state, party)."""
+    return _votes(rows, ["year", "state", "party"] if by_year else ["state", "party"])
+
+
+def candidate_votes(rows):
+    """Total votes per (year, state, candidate, party), ordered for the comparison charts."""
+    return _votes(rows, ["year", "state", "candidate", "party"]).sort_values(["state", "candidate", "year"])
@@ -0,0 +1,176 @@
+# backends.py
+"""
+Aggregation engines behind ``ElectionSet``.
+
+    ELECTION_BACKEND=duckdb streamlit run streamlit.py
+    ELECTION_BACKEND=parallel streamlit run streamlit2.py
+    python backends.py --check            # compare DuckDB against pandas
+
+The grouped sums that feed the vote-share and turnout views (sections 6, 7
+and 11 of streamlit.py, the turnout pages of streamlit2.py) go through a
+backend's ``group_sum(keys, values, where)``, where ``where`` maps columns
+to the values rows must have (the streamlit2.py sidebar filters):
+
+- ``PandasBackend`` (default, the reference) groups the in-memory frame.
+- ``DuckDBBackend`` runs the same aggregation as SQL in an embedded DuckDB
+  instance, over a Parquet cache file (data_store.dataset_path()) or a
+  registered DataFrame. Only the key and value columns are scanned, the
+  query uses every core, and a Parquet source never has to fit in memory;
+  only the small grouped result comes back to pandas.
+- ``ParallelBackend`` (parallel.py) shards the rows by state and sums the
+  shards in a process pool over shared memory.
+
+DuckDB is optional: it is imported when the backend is created, and the
+pandas backend needs nothing beyond pandas. Results are indexed by
+``keys``; the DuckDB backend returns key columns as plain values in sorted
+order rather than categoricals, so compare results by label, not position.
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+import data_store
+from parallel import ParallelBackend
+
+BACKENDS = ("pandas", "duckdb", "parallel")
+# Engine used when none is passed explicitly
+DEFAULT = os.environ.get("ELECTION_BACKEND", "pandas")
+
+
+class PandasBackend:
+    name = "pandas"
+
+    def __init__(self, df):
+        self.df = df
+
+    def group_sum(self, keys, values, where=None):
+        """Sum of ``values`` per ``keys`` over rows matching ``where``, indexed by ``keys``."""
+        df = self.df
+        if where:
+            mask = np.ones(len(df), dtype=bool)
+            for col, selected in where.items():
+                mask &= df[col].isin(list(selected)).to_numpy()
+            df = df[mask]
+        return data_store.widen_sums(df.groupby(list(keys), observed=True)[list(values)].sum())
+
+
+class DuckDBBackend:
+    name = "duckdb"
+
+    def __init__(self, source, threads=None):
+        """``source``: a Parquet path or a DataFrame."""
+        try:
+            import duckdb
+        except ImportError as e:
+            raise ImportError("the duckdb backend needs `pip install duckdb`") from e
+
+        self.con = duckdb.connect()
+        if threads:
+            self.con.execute(f"SET threads = {int(threads)}")
+        if isinstance(source, pd.DataFrame):
+            self.con.register("candidates", source)
+            self._dtypes = source.dtypes
+        else:
+            import pyarrow.parquet as pq
+            path = str(source).replace("'", "''")
+            self.con.execute(f"CREATE VIEW candidates AS SELECT * FROM read_parquet('{path}')")
+            schema = pq.read_schema(source)
+            self._dtypes = pd.Series({f.name: np.dtype(f.type.to_pandas_dtype()) for f in schema
+                                      if not str(f.type).startswith("dictionary")})
+
+    @staticmethod
+    def _ident(name):
+        return '"' + name.replace('"', '""') + '"'
+
+    def group_sum(self, keys, values, where=None):
+        """Sum of ``values`` per ``keys`` over rows matching ``where``, indexed by ``keys``."""
+        keys, values = list(keys), list(values)
+        k = ", ".join(map(self._ident, keys))
+        sums = ", ".join(f"SUM({self._ident(v)}) AS {self._ident(v)}" for v in values)
+        clauses, params = [], []
+        for col, selected in (where or {}).items():
+            selected = [v.item() if hasattr(v, "item") else v for v in selected]
+            if not selected:
+                clauses.append("FALSE")
+                continue
+            clauses.append(f"{self._ident(col)} IN ({', '.join('?' * len(selected))})")
+            params += selected
+        filt = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        out = self.con.execute(
+            f"SELECT {k}, {sums} FROM candidates {filt} GROUP BY {k} ORDER BY {k}", params
+        ).df()
+        # SUM widens integers (HUGEINT arrives as float); integer sums are int64
+        out = data_store.widen_sums(out, {v: self._dtypes[v] for v in values if v in self._dtypes})
+        return out.set_index(keys)
+
+
+def create(df, name=None, dataset=None):
+    """
+    Backend ``name`` (default: $ELECTION_BACKEND or pandas) over ``df``. SQL
+    engines read the Parquet cache of ``dataset`` ("combined" or "results")
+    instead when it is given; it is only resolved for them.
+    """
+    name = name or DEFAULT
+    if name == "pandas":
+        return PandasBackend(df)
+    if name == "duckdb":
+        return DuckDBBackend(data_store.dataset_path(dataset) if dataset else df)
+    if name == "parallel":
+        return ParallelBackend(df)
+    raise ValueError(f"unknown backend {name!r}; expected one of {BACKENDS}")
+
+
+# -----------------------------
+# Reference check
+# -----------------------------
+CHECKED = ["national_share", "state_party_share", "low_share_winners", "state_turnout_pct_change",
+           "top_candidates"]
+
+
+def _comparable(result):
+    """A result frame with plain columns, rows sorted by their labels."""
+    df = result.reset_index(drop=True)
+    for c in df.columns:
+        if isinstance(df[c].dtype, pd.CategoricalDtype):
+            df[c] = df[c].astype(str)
+    keys = [c for c in df.columns if not pd.api.types.is_float_dtype(df[c])]
+    return df.sort_values(keys or list(df.columns)).reset_index(drop=True)
+
+
+def check(name="duckdb"):
+    """Run the backend-driven analyses on pandas and on ``name``; True if all match."""
+    import analyses
+    import batch
+    import facts
+    from elections import ElectionSet
+
+    df, pc_facts = data_store.load_combined(), facts.load_facts()
+    reference = ElectionSet(df, pc_facts, backend=PandasBackend(df))
+    other = ElectionSet(df, pc_facts, backend=create(df, name, "combined"))
+    ok = True
+    for analysis, params in batch.plan(CHECKED, reference.years, reference.pairs()):
+        want = _comparable(analyses.ANALYSES[analysis](reference, **params))
+        got = _comparable(analyses.ANALYSES[analysis](other, **params))
+        try:
+            pd.testing.assert_frame_equal(got, want, check_dtype=False, check_column_type=False)
+            print(f"ok    {batch.task_stem(analysis, params)}")
+        except AssertionError as e:
+            ok = False
+            print(f"FAIL  {batch.task_stem(analysis, params)}\n{e}")
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--check", action="store_true", help="compare a backend's results with pandas")
+    parser.add_argument("--backend", choices=BACKENDS, default="duckdb")
+    args = parser.parse_args(argv)
+    if args.check:
+        raise SystemExit(0 if check(args.backend) else 1)
+    parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+# batch.py
+"""
+Run the registered analyses (analyses.py) without Streamlit and write the
+result tables to disk.
+
+    python batch.py                          # every analysis, every year / pair
+    python batch.py --only same_party nota_top --format json
+    python batch.py --pair 2014 2019 --workers 4 --out results/
+
+Each (analysis, parameters) task is independent, so tasks run in a process
+pool. Every worker loads the dataset once and writes its own outputs; only
+file names and timings travel back to the parent, which writes
+``manifest.json`` (dataset version, tasks, files, seconds) for nightly
+precomputation and regression diffs.
+"""
+import argparse
+import inspect
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import analyses
+import backends
+import data_store
+import facts
+from elections import ElectionSet
+
+DEFAULT_PARTIES = ("BJP", "INC")
+
+_elections = None
+
+
+def load_elections():
+    global _elections
+    if _elections is None:
+        # Memory-mapped: the worker processes share one copy of the data
+        df = data_store.load_combined(mapped=True)
+        backend = backends.create(df, dataset="combined")
+        _elections = ElectionSet(df, facts.load_facts(mapped=True), backend)
+    return _elections
+
+
+# -----------------------------
+# Planning
+# -----------------------------
+def param_grid(name, years, pairs):
+    """Parameter sets to run ``name`` with, from its signature."""
+    sig = inspect.signature(analyses.ANALYSES[name])
+    grid = [{}]
+    if "year" in sig.parameters:
+        grid = [dict(g, year=y) for g in grid for y in years]
+    if "y0" in sig.parameters:
+        grid = [dict(g, y0=a, y1=b) for g in grid for a, b in pairs]
+    if "years" in sig.parameters:
+        grid = [dict(g, years=tuple(years)) for g in grid]
+    if "parties" in sig.parameters:
+        grid = [dict(g, parties=DEFAULT_PARTIES) for g in grid]
+    if "gains" in sig.parameters:
+        grid = [dict(g, gains=flag) for g in grid for flag in (True, False)]
+    return grid
+
+
+def plan(names=None, years=None, pairs=None):
+    """Every (analysis, params) task for ``names`` (default: all registered)."""
+    es_years = years or load_elections().years
+    pairs = pairs or load_elections().pairs(es_years)
+    return [
+        (name, params)
+        for name in (names or sorted(analyses.ANALYSES))
+        for params in param_grid(name, es_years, pairs)
+    ]
+
+
+# -----------------------------
+# Writing results
+# -----------------------------
+def task_stem(name, params):
+    parts = [name]
+    for k, v in sorted(params.items()):
+        v = "-".join(map(str, v)) if isinstance(v, tuple) else v
+        parts.append(f"{k}={v}")
+    return "__".join(parts)
+
+
+def _tables(result, key=None):
+    """Flatten a result into (suffix, DataFrame) pairs and a dict of scalar values."""
+    if result is None:
+        return [], {}
+    if isinstance(result, pd.Series):
+        result = result.to_frame()
+    if isinstance(result, pd.DataFrame):
+        return [(key, result)], {}
+    if isinstance(result, dict):
+        tables, values = [], {}
+        for k, v in result.items():
+            sub = str(k) if key is None else f"{key}.{k}"
+            if isinstance(v, (pd.Series, pd.DataFrame, dict)) or v is None:
+                t, vals = _tables(v, sub)
+                tables += t
+                values.update(vals)
+            else:
+                values[sub] = np.asarray(v).tolist()
+        return tables, values
+    return [], {key or "value": np.asarray(result).tolist()}
+
+
+def _portable(df):
+    """Plain columns and index, string column names (Parquet/JSON friendly)."""
+    if not isinstance(df.index, pd.RangeIndex) or any(n is not None for n in df.index.names):
+        df = df.reset_index()
+    df = df.copy()
+    df.columns = [str(c) for c in df.columns]
+    for c in df.columns:
+        if isinstance(df[c].dtype, pd.CategoricalDtype):
+            df[c] = df[c].astype(str)
+    return df
+
+
+def write_result(result, stem, out_dir, fmt):
+    tables, values = _tables(result)
+    files = []
+    for suffix, df in tables:
+        path = out_dir / (stem + (f".{suffix}" if suffix else "") + f".{fmt}")
+        df = _portable(df)
+        if fmt == "parquet":
+            df.to_parquet(path, index=False)
+        else:
+            df.to_json(path, orient="records", indent=1)
+        files.append(path.name)
+    if values:
+        path = out_dir / f"{stem}.values.json"
+        path.write_text(json.dumps(values, indent=1, default=str))
+        files.append(path.name)
+    return files
+
+
+def run_task(task, out_dir, fmt):
+    name, params = task
+    t = time.perf_counter()
+    result = analyses.ANALYSES[name](load_elections(), **params)
+    seconds = time.perf_counter() - t
+    files = write_result(result, task_stem(name, params), Path(out_dir), fmt)
+    return {"analysis": name, "params": params, "files": files, "seconds": round(seconds, 4)}
+
+
+# -----------------------------
+# Runner
+# -----------------------------
+def run(tasks, out_dir, fmt="parquet", workers=None):
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+
+    t = time.perf_counter()
+    if workers == 1:
+        done = [run_task(task, out_dir, fmt) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            done = list(pool.map(run_task, tasks, [out_dir] * len(tasks), [fmt] * len(tasks)))
+
+    manifest = {
+        "dataset_version": data_store.dataset_version(),
+        "format": fmt,
+        "workers": workers,
+        "seconds": round(time.perf_counter() - t, 3),
+        "tasks": done,
+    }
+    (out_dir / "manifest.json").write_text(json.dumps(manifest, indent=1, default=str))
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--only", nargs="+", choices=sorted(analyses.ANALYSES), help="analyses to run (default: all)")
+    parser.add_argument("--pair", nargs=2, type=int, metavar=("Y0", "Y1"), help="compare these two elections (default: every consecutive pair)")
+    parser.add_argument("--format", choices=["parquet", "json"], default="parquet")
+    parser.add_argument("--out", default="batch_output")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count; 1 runs inline)")
+    parser.add_argument("--list", action="store_true", help="print the planned tasks and exit")
+    args = parser.parse_args(argv)
+
+    years = sorted(args.pair) if args.pair else None
+    pairs = [tuple(args.pair)] if args.pair else None
+    tasks = plan(args.only, years, pairs)
+    if args.list:
+        for name, params in tasks:
+            print(task_stem(name, params))
+        return
+
+    manifest = run(tasks, args.out, args.format, args.workers)
+    print(f"Ran {len(tasks)} tasks in {manifest['seconds']:.2f}s -> {args.out}/")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+# bench.py
+"""
+Benchmarks for the dashboard computations.
+
+    python bench.py                       # real data, 10x and 100x copies
+    python bench.py --scales 1 10 100 1000 --repeat 5 --out bench_results.json
+    python bench.py compare old.json new.json
+    python bench.py --data synthetic/ --scales 1   # a synth.py dataset
+
+Times every registered analysis (the streamlit.py sections, analyses.py)
+on the combined dataset, and each streamlit2.py page (the app's own filter
+cascade, aggregations and chart builders) on the results dataset it serves,
+each at its real size and on scaled copies. A scaled copy repeats every constituency ``k``
+times under a new name, so group counts grow with the data, as they would
+with more elections or finer geography. Each timing records the median
+wall time over ``--repeat`` runs and the peak traced memory of one run;
+results go to a JSON file tagged with the git commit so runs can be
+compared across commits.
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+
+import pandas as pd
+
+import analyses
+import backends
+import batch
+import charts
+import data_store
+import dims
+import facts
+import synth
+from elections import ElectionSet
+from filter_index import FilterIndex
+
+FILTER_COLUMNS = ["year", "state", "pc_name", "party", "candidate"]
+
+
+# -----------------------------
+# Scaled datasets
+# -----------------------------
+def scale_frame(df, k):
+    """``k`` copies of ``df``; copy i > 0 renames every constituency to '<name> #i'."""
+    if k == 1:
+        return df
+    pc = df["pc_name"].astype(str)
+    copies = [df] + [df.assign(pc_name=pc + f" #{i}") for i in range(1, k)]
+    out = pd.concat(copies, ignore_index=True)
+    for col in ("pc_name", "state", "state_name", "party"):
+        if col in out.columns:
+            out[col] = out[col].astype("category")
+    return out
+
+
+# -----------------------------
+# streamlit2.py pages (default sidebar filters)
+# -----------------------------
+# Each page runs the app's own code on the results dataset it serves: the
+# FilterIndex cascade, the analyses.py aggregations and the charts.py
+# figures, with the Streamlit calls left out.
+ESSENTIAL_STATES = ["NCT OF Delhi", "Chandigarh"]
+
+
+def default_selection(index):
+    """The sidebar's defaults: latest year, every zone, state and constituency, BJP and INC."""
+    years = index.values("year")[-1:]
+    zone_states = sorted({s for states in dims.ZONES.values() for s in states})
+    mask = index.select(year=years, state=zone_states)
+    states = sorted(set(index.options("state", mask)) | set(ESSENTIAL_STATES))
+    mask &= index.mask("state", states)
+    consts = index.options("pc_name", mask)
+    mask &= index.mask("pc_name", consts)
+    parties = [p for p in ["BJP", "INC"] if p in index.values("party")]
+    mask &= index.mask("party", parties)
+    index.options("candidate", mask)
+    return {
+        "mask": mask,
+        "years": years,
+        "states": states,
+        "consts": consts,
+        "parties": parties,
+        "filters": {
+            "year": years,
+            "state": sorted(set(zone_states) & set(states)),
+            "pc_name": consts,
+            "party": parties,
+        },
+    }
+
+
+def page_home(app):
+    return analyses.home_state_votes(app.df[app.sel["mask"]])
+
+
+def page_statewise(app):
+    return charts.statewise(analyses.statewise_votes(app.df[app.sel["mask"]]), app.sel["years"])
+
+
+def page_party_trends(app):
+    sel = app.sel
+    rows = app.df[app.index.select(year=sel["years"], state=sel["states"],
+                                   pc_name=sel["consts"] or None, party=sel["parties"])]
+    trend_data, bar_data = analyses.party_performance(rows)
+    return charts.party_performance(trend_data, bar_data[bar_data["party"].isin(sel["parties"])], sel["years"])
+
+
+def page_party_state(app):
+    sel = app.sel
+    rows = app.df[app.index.select(year=sel["years"], state=sel["states"], party=sel["parties"])]
+    state_party = analyses.state_party_votes(rows)
+    return charts.party_state_treemap(state_party), charts.party_state_bar(state_party)
+
+
+def page_turnout(app):
+    return charts.state_turnout(analyses.state_turnout_pct(app.elections))
+
+
+def page_top_candidates(app):
+    return charts.top_candidates(analyses.state_top_candidates(app.elections, 5, **app.sel["filters"]),
+                                 app.sel["years"])
+
+
+def page_candidate_comparison(app):
+    return analyses.candidate_votes(app.df[app.sel["mask"]])
+
+
+def page_turnout_change(app):
+    years = app.index.values("year")
+    return charts.turnout_change(analyses.state_turnout_pct_change(app.elections, years[0], years[-1]),
+                                 years[0], years[-1])
+
+
+def page_sidebar(app):
+    return default_selection(app.index)
+
+
+PAGES = {
+    "home": page_home,
+    "statewise_votes": page_statewise,
+    "party_trends": page_party_trends,
+    "party_state_insights": page_party_state,
+    "turnout_comparison": page_turnout,
+    "top_candidates": page_top_candidates,
+    "candidate_comparison": page_candidate_comparison,
+    "turnout_change": page_turnout_change,
+    "sidebar_filters": page_sidebar,
+}
+
+
+class Dashboard:
+    """What streamlit2.py holds per process: the rows, their FilterIndex and ElectionSet, and the default selection."""
+
+    def __init__(self, df, backend=None):
+        self.df = df
+        self.index = FilterIndex(df, FILTER_COLUMNS)
+        self.elections = ElectionSet(df, backend=backend or backends.create(df))
+        self.sel = default_selection(self.index)
+
+
+# -----------------------------
+# Measurement
+# -----------------------------
+def measure(fn, repeat):
+    """(median seconds over ``repeat`` runs, peak traced MB of one run)."""
+    times = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t)
+
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return statistics.median(times), peak / 1e6
+
+
+def bench_scale(df, results, k, repeat, only=None):
+    """Rows of results for one scale factor: analyses on ``df``, streamlit2.py pages on ``results``."""
+    scaled = scale_frame(df, k)
+    rows = []
+
+    def record(group, name, fn):
+        seconds, peak_mb = measure(fn, repeat)
+        rows.append({"scale": k, "rows": len(scaled), "group": group, "name": name,
+                     "seconds": round(seconds, 6), "peak_mb": round(peak_mb, 2)})
+        print(f"  x{k:<5} {group:<9} {name:<70} {seconds * 1000:9.1f} ms {peak_mb:8.1f} MB")
+
+    record("build", "facts", lambda: facts.build_facts(scaled))
+    pc_facts = facts.build_facts(scaled)
+
+    # A fresh ElectionSet per run, so memoized wide tables don't hide the cost;
+    # the aggregation backend ($ELECTION_BACKEND) is set up once per scale
+    backend = backends.create(scaled)
+    years = sorted(int(y) for y in scaled["year"].unique())
+    es = ElectionSet(scaled, pc_facts, backend)
+    names = [n for n in only if n in analyses.ANALYSES] if only else None
+    tasks = batch.plan(names, years, es.pairs(years)) if names or not only else []
+    for name, params in tasks:
+        fn = analyses.ANALYSES[name]
+        record("analysis", batch.task_stem(name, params),
+               lambda fn=fn, params=params: fn(ElectionSet(scaled, pc_facts, backend), **params))
+
+    pages = [(name, fn) for name, fn in PAGES.items() if only is None or name in only]
+    if pages:
+        scaled_results = scale_frame(results, k)
+        record("build", "filter_index", lambda: FilterIndex(scaled_results, FILTER_COLUMNS))
+        app = Dashboard(scaled_results)
+        for name, fn in pages:
+            record("page", name, lambda fn=fn: fn(app))
+    return rows
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=data_store.DATA_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run(scales, repeat, only=None, data=None):
+    # The two dashboards' datasets: combined for streamlit.py, results for streamlit2.py
+    if data:
+        df = frame = synth.load(data)
+    else:
+        df, frame = data_store.load_combined(), data_store.load_results()
+    results = []
+    for k in scales:
+        print(f"scale x{k}")
+        results += bench_scale(df, frame, k, repeat, only)
+    return {
+        "commit": git_commit(),
+        "dataset_version": f"synthetic:{data}" if data else data_store.dataset_version(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "backend": backends.DEFAULT,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+# -----------------------------
+# Comparing runs
+# -----------------------------
+def compare(old_path, new_path):
+    """Print new/old time ratios for every (scale, group, name) in both files."""
+    old, new = (json.loads(open(p).read()) for p in (old_path, new_path))
+    key = lambda r: (r["scale"], r["group"], r["name"])
+    before = {key(r): r for r in old["results"]}
+    print(f"{old['commit']} -> {new['commit']}")
+    for r in new["results"]:
+        b = before.get(key(r))
+        if b and b["seconds"] > 0:
+            print(f"x{r['scale']:<5} {r['group']:<9} {r['name']:<70} "
+                  f"{b['seconds'] * 1000:9.1f} -> {r['seconds'] * 1000:9.1f} ms  x{r['seconds'] / b['seconds']:.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    sub = parser.add_subparsers(dest="command")
+    cmp_parser = sub.add_parser("compare", help="compare two result files")
+    cmp_parser.add_argument("old")
+    cmp_parser.add_argument("new")
+    parser.add_argument("--scales", nargs="+", type=int, default=[1, 10, 100])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="+", help="analysis or page names to run (default: all)")
+    parser.add_argument("--data", help="directory of synth.py results files to use instead of the real data")
+    parser.add_argument("--out", default="bench_results.json")
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        compare(args.old, args.new)
+        return
+
+    report = run(args.scales, args.repeat, args.only, args.data)
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=1)
+    print(f"Wrote {len(report['results'])} timings to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+# charts.py
+"""
+Figures of the candidate dashboard (streamlit2.py) pages.
+
+Each function takes the page's aggregated frame (most come straight from
+analyses.py) and returns the page's Plotly figures, so the dashboard and the
+offline report (report.py) draw the same charts. ``years`` is only used in
+titles.
+"""
+import render
+from startup import lazy_import
+
+px = lazy_import("plotly.express")
+
+
+def _years(years):
+    return ", ".join(map(str, years))
+
+
+# -----------------------------
+# Statewise Votes
+# -----------------------------
+def statewise(state_votes, years):
+    """Bar and pie of total votes per state."""
+    fig_bar = px.bar(
+        state_votes,
+        x="state",
+        y="total_votes",
+        color="total_votes",
+        color_continuous_scale="Blues",
+        title=f"({_years(years)})"
+    )
+    fig_bar.update_layout(height=450)
+
+    fig_pie = px.pie(
+        state_votes,
+        names="state",
+        values="total_votes",
+        hole=0.35
+    )
+    fig_pie.update_traces(textposition="inside", textinfo="percent+label")
+    return fig_bar, fig_pie
+
+
+# -----------------------------
+# Party Performance (Trends)
+# -----------------------------
+def party_performance(trend_data, bar_data, years):
+    """Bar, trend line and pie of party votes: ``trend_data`` per (year, party), ``bar_data`` per party."""
+    fig_bar = px.bar(
+        bar_data,
+        x="party",
+        y="total_votes",
+        color="party",
+        title=_years(years),
+    )
+    fig_bar.update_layout(height=450, showlegend=False)
+
+    fig_line = px.line(
+        trend_data,
+        x="year",
+        y="total_votes",
+        color="party",
+        markers=True,
+        title=_years(years),
+    )
+    fig_line.update_layout(
+        height=500,
+        xaxis=dict(tickmode="linear"),
+        legend_title_text="Party",
+    )
+
+    fig_pie = px.pie(
+        bar_data,
+        names="party",
+        values="total_votes",
+        hole=0.3,
+        title=_years(years),
+    )
+    fig_pie.update_traces(textposition="inside", textinfo="percent+label")
+    fig_pie.update_layout(showlegend=True, title_x=0.5)
+    return fig_bar, fig_line, fig_pie
+
+
+# -----------------------------
+# Party-State Insights
+# -----------------------------
+def _bounded_state_party(state_party):
+    """State x party totals within the point budget: each state's smallest parties summed into "Other"."""
+    n_parties = render.categories_within(render.POINT_BUDGET, state_party["state"].nunique())
+    return render.top_categories(state_party, "state", "party", "total_votes", n_parties)
+
+
+def party_state_treemap(state_party):
+    fig_tree = px.treemap(
+        _bounded_state_party(state_party),
+        path=["state", "party"],
+        values="total_votes",
+        title="State-wise Party Vote Distribution",
+    )
+    fig_tree.update_layout(height=750)
+    return fig_tree
+
+
+def party_state_bar(state_party):
+    fig_bar = px.bar(
+        _bounded_state_party(state_party),
+        x="state",
+        y="total_votes",
+        color="party",
+        barmode="group",
+        title="State-wise Party Vote Distribution",
+        labels={"total_votes": "Total Votes", "state": "State"},
+    )
+
+    # Improve readability
+    fig_bar.update_layout(
+        height=750,
+        xaxis_tickangle=-45,
+        legend_title_text="Party",
+        title_x=0.5,
+        margin=dict(t=80, l=20, r=20, b=80)
+    )
+    return fig_bar
+
+
+def party_state_sunburst(year_state_party):
+    """Sunburst of votes per (year, state, party), bounded like the other Party-State charts."""
+    n_sun = render.categories_within(render.POINT_BUDGET, len(year_state_party[["year", "state"]].drop_duplicates()))
+    fig_sun = px.sunburst(
+        render.top_categories(year_state_party, ["year", "state"], "party", "total_votes", n_sun),
+        path=["year", "state", "party"],
+        values="total_votes",
+        title="Party Dominance by Year and State",
+    )
+    fig_sun.update_layout(height=750)
+    return fig_sun
+
+
+# -----------------------------
+# Turnout Comparison
+# -----------------------------
+def state_turnout(turnout):
+    """Turnout % per state, one bar per election."""
+    fig_bar = px.bar(
+        turnout,
+        x="state",
+        y="turnout_pct",
+        color="year",
+        barmode="group",
+    )
+    fig_bar.update_layout(height=600)
+    return fig_bar
+
+
+# -----------------------------
+# Top Candidates
+# -----------------------------
+def top_candidates(top, years):
+    """Bar faceted by state and party-share pie of the top candidates per state."""
+    fig_bar = px.bar(
+        top,
+        x="candidate",
+        y="total_votes",
+        color="party",
+        facet_col="state",
+        facet_col_wrap=3,
+        text="total_votes",
+        title=f"({_years(years)})",
+    )
+    fig_bar.update_traces(texttemplate="%{text:,}", textposition="outside")
+    fig_bar.update_layout(
+        height=900,
+        bargap=0.3,
+        showlegend=True,
+        title_x=0.5,
+        margin=dict(t=80, l=20, r=20, b=80)
+    )
+
+    pie_data = (
+        top.groupby("party", as_index=False, observed=True)["total_votes"]
+        .sum()
+        .sort_values("total_votes", ascending=False)
+    )
+    fig_pie = px.pie(
+        pie_data,
+        names="party",
+        values="total_votes",
+        hole=0.3,
+        title=f"({_years(years)})"
+    )
+    fig_pie.update_traces(textposition="inside", textinfo="percent+label")
+    fig_pie.update_layout(showlegend=True, title_x=0.5)
+    return fig_bar, fig_pie
+
+
+# -----------------------------
+# Turnout Change Analysis
+# -----------------------------
+def turnout_change(pivot_df, y0, y1):
+    """Bars of the 10 largest turnout % rises and falls, and a one-line summary."""
+    top_increase = pivot_df.nlargest(10, "change_pct")
+    top_decrease = pivot_df.nsmallest(10, "change_pct")
+
+    fig_up = px.bar(
+        top_increase.sort_values("change_pct", ascending=True),
+        x="change_pct",
+        y="state",
+        orientation="h",
+        color="change_pct",
+        color_continuous_scale="Greens",
+        labels={"change_pct": "Turnout % Change"},
+        title="🔼 States with Highest Increase in Turnout",
+    )
+
+    fig_down = px.bar(
+        top_decrease.sort_values("change_pct"),
+        x="change_pct",
+        y="state",
+        orientation="h",
+        color="change_pct",
+        color_continuous_scale="Reds",
+        labels={"change_pct": "Turnout % Change"},
+        title="🔽 States with Decline in Turnout",
+    )
+
+    # Insight Summary (auto-generated)
+    best_state = top_increase.iloc[-1]["state"]
+    best_val = top_increase.iloc[-1]["change_pct"]
+    worst_state = top_decrease.iloc[0]["state"]
+    worst_val = top_decrease.iloc[0]["change_pct"]
+    summary = (
+        f"🔍 Between {y0} and {y1}, "
+        f"{best_state} recorded the highest turnout growth (+{best_val:.2f}%), "
+        f"while {worst_state} saw the steepest decline ({worst_val:.2f}%). "
+        f"On average, national turnout changed by {pivot_df['change_pct'].mean():.2f}%."
+    )
+    return fig_up, fig_down, summary
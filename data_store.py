@@ -0,0 +1,368 @@
+# data_store.py
+"""
+Columnar cache for the election CSVs.
+
+Each dataset is parsed from CSV once, cleaned, and written to Parquet under
+``.cache/``. The cache file name carries a fingerprint of the source files'
+bytes, so editing a CSV invalidates its cache on the next load.
+
+Loaders called with ``mapped=True`` keep the dataset as an uncompressed
+Arrow IPC file instead and return a read-only DataFrame over a memory map
+of it: numeric columns are views of the mapped pages and strings stay in
+Arrow buffers, so every session and process on the host shares one
+physical copy through the page cache. Such frames must not be modified in
+place.
+"""
+import hashlib
+import json
+import os
+import re
+import uuid
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+import dims
+
+DATA_DIR = Path(__file__).resolve().parent
+CACHE_DIR = DATA_DIR / ".cache"
+
+# Columns coerced with pd.to_numeric(...).fillna(0) in the dashboards
+NUMERIC_COLS = ["total_votes", "total_electors", "general_votes", "age"]
+
+_fingerprints = {}
+
+
+# -----------------------------
+# Fingerprinting
+# -----------------------------
+def _file_digest(path):
+    """SHA-1 of one file's bytes, memoized per (path, size, mtime)."""
+    stat = path.stat()
+    key = (str(path), stat.st_size, stat.st_mtime_ns)
+    if key not in _fingerprints:
+        h = hashlib.sha1()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        _fingerprints[key] = h.hexdigest()
+    return _fingerprints[key]
+
+
+def fingerprint(paths):
+    """Short content hash over a list of source files."""
+    h = hashlib.sha1()
+    for p in paths:
+        p = Path(p)
+        h.update(p.name.encode())
+        h.update(_file_digest(p).encode())
+    return h.hexdigest()[:16]
+
+
+def cache_path(name, sources, version=1, suffix=".parquet"):
+    """File that holds (or will hold) dataset ``name`` built from ``sources``."""
+    sources = [DATA_DIR / s for s in sources]
+    return CACHE_DIR / f"{name}-{fingerprint(sources)}v{version}{suffix}"
+
+
+def _write_arrow(df, path):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with pa.OSFile(str(path), "wb") as f, pa.ipc.new_file(f, table.schema) as writer:
+        writer.write_table(table)
+
+
+def _read_arrow(path):
+    """Zero-copy DataFrame over a memory-mapped Arrow IPC file."""
+    table = pa.ipc.open_file(pa.memory_map(str(path))).read_all()
+    return table.to_pandas(split_blocks=True)
+
+
+def _cache_stamp(path, name, suffix):
+    """(fingerprint, version) from a cache_path() file name; version -1 if unreadable."""
+    fp, _, version = path.name[len(name) + 1:-len(suffix)].rpartition("v")
+    return fp, int(version) if version.isdigit() else -1
+
+
+def cached_frame(name, sources, build, version=1, mapped=False):
+    """
+    Return the DataFrame produced by ``build(*sources)``, reading it from the
+    Parquet cache when the fingerprint of ``sources`` is unchanged. Bump
+    ``version`` whenever ``build`` changes what it produces. ``mapped``
+    uses a memory-mapped Arrow file instead (see the module docstring).
+    """
+    suffix = ".arrow" if mapped else ".parquet"
+    path = cache_path(name, sources, version, suffix)
+    if path.exists():
+        return _read_arrow(path) if mapped else pd.read_parquet(path)
+
+    df = build(*[DATA_DIR / s for s in sources])
+    CACHE_DIR.mkdir(exist_ok=True)
+    # One temporary file per writer, so processes building the same cache
+    # at once never write into each other's file
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{uuid.uuid4().hex}.tmp")
+    try:
+        if mapped:
+            _write_arrow(df, tmp)
+        else:
+            df.to_parquet(tmp, index=False)
+        tmp.replace(path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+    # Drop caches of the same sources built by older versions of ``build``,
+    # and caches written before the current sources were last modified. A
+    # cache another process built from newer sources is left alone.
+    sources_mtime = max((DATA_DIR / s).stat().st_mtime for s in sources)
+    current, _ = _cache_stamp(path, name, suffix)
+    for stale in CACHE_DIR.glob(f"{name}-*{suffix}"):
+        if stale == path:
+            continue
+        built_from, built_version = _cache_stamp(stale, name, suffix)
+        try:
+            older = (built_from == current and built_version < version) or stale.stat().st_mtime < sources_mtime
+        except OSError:
+            continue
+        if older:
+            stale.unlink(missing_ok=True)
+    return _read_arrow(path) if mapped else df
+
+
+# -----------------------------
+# Build steps (run once per source version)
+# -----------------------------
+# Every encoded dataset shares one set of dimension keys, so each is
+# fingerprinted over all the files the dimensions are built from: the fixed
+# sources plus every per-year results file (see raw_files)
+DATA_SOURCES = [
+    "dim_states_codes.csv",
+    "cleaned_combined_data.csv",
+]
+RAW_PATTERN = re.compile(r"constituency_wise_results_(\d{4})\.csv$")
+# Per-candidate results files loaded under other names (ingest.py), {year: path}
+RAW_REGISTRY = "raw_sources.json"
+DATA_VERSION = 5
+
+
+def raw_files(src=DATA_DIR):
+    """
+    {year: path} of the per-year results files, by year: every
+    ``constituency_wise_results_<year>.csv`` in ``src`` plus the files
+    registered in its RAW_REGISTRY (which win for the same year).
+    """
+    src = Path(src)
+    found = {}
+    for path in src.glob("constituency_wise_results_*.csv"):
+        m = RAW_PATTERN.search(path.name)
+        if m:
+            found[int(m.group(1))] = path
+    registry = src / RAW_REGISTRY
+    if registry.exists():
+        for year, path in json.loads(registry.read_text(encoding="utf-8")).items():
+            found[int(year)] = src / path
+    return dict(sorted(found.items()))
+
+
+def register_raw(year, path, src=DATA_DIR):
+    """Record ``path`` as the results file of ``year`` in RAW_REGISTRY (relative to ``src`` when inside it)."""
+    src, path = Path(src), Path(path).resolve()
+    registry = src / RAW_REGISTRY
+    entries = json.loads(registry.read_text(encoding="utf-8")) if registry.exists() else {}
+    entries[str(year)] = str(path.relative_to(src.resolve())) if path.is_relative_to(src.resolve()) else str(path)
+    tmp = registry.with_name(f".{registry.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(dict(sorted(entries.items())), indent=2), encoding="utf-8")
+    os.replace(tmp, registry)
+
+
+def data_sources():
+    """Source files of every encoded dataset: DATA_SOURCES, then the raw files by year."""
+    return DATA_SOURCES + [str(path) for path in raw_files().values()]
+
+
+def dataset_version():
+    """Identifier of the current source files and build logic."""
+    return f"{fingerprint([DATA_DIR / s for s in data_sources()])}v{DATA_VERSION}"
+
+
+def coerce_numeric(df):
+    for c in NUMERIC_COLS:
+        if c in df.columns:
+            df[c] = pd.to_numeric(df[c], errors="coerce").fillna(0)
+    return df
+
+
+# -----------------------------
+# Compact dtypes
+# -----------------------------
+# String columns with at most this share of distinct values become categoricals
+CATEGORY_MAX_RATIO = 0.5
+INT_TYPES = [np.int8, np.int16, np.int32, np.int64]
+
+
+def _smallest_int(lo, hi):
+    for t in INT_TYPES:
+        info = np.iinfo(t)
+        if info.min <= lo and hi <= info.max:
+            return np.dtype(t)
+    return np.dtype(np.int64)
+
+
+def compact(df):
+    """
+    Low-cardinality strings as categoricals, integers at the smallest signed
+    width that holds their range, and ``age`` as a nullable integer (NA
+    where unknown rather than 0). pandas keeps that width through many
+    aggregations (an int32 groupby sum can stay int32), so sum narrow
+    columns through ``widen_sums``, as every backend does.
+    """
+    df = df.copy()
+    for col in df.columns:
+        s = df[col]
+        if col == "age":
+            s = pd.to_numeric(s, errors="coerce").round()
+            s = s.where(s > 0)
+            hi = s.max() if s.notna().any() else 0
+            df[col] = s.astype(_smallest_int(0, hi).name.capitalize())
+        elif isinstance(s.dtype, pd.CategoricalDtype):
+            continue
+        elif pd.api.types.is_string_dtype(s):
+            if s.nunique() <= CATEGORY_MAX_RATIO * len(s):
+                df[col] = s.astype("category")
+        elif pd.api.types.is_integer_dtype(s) and not isinstance(s.dtype, pd.api.extensions.ExtensionDtype):
+            if len(s):
+                df[col] = s.astype(_smallest_int(s.min(), s.max()))
+    return df
+
+
+def widen_sums(sums, dtypes=None):
+    """
+    ``sums`` cast back to the dtypes of the columns summed (``dtypes``,
+    default: its own), with integer and boolean columns as int64 (Int64 for
+    nullable ones) whatever their width.
+    """
+    dtypes = sums.dtypes if dtypes is None else dtypes
+    wide = {}
+    for c in sums.columns:
+        if c not in dtypes:
+            continue
+        dtype = dtypes[c]
+        if dtype.kind in "iub":
+            dtype = "Int64" if isinstance(dtype, pd.api.extensions.ExtensionDtype) else np.int64
+        wide[c] = dtype
+    return sums.astype(wide)
+
+
+def memory_report(df):
+    """Deep memory use per column, largest first, with dtype and share of the total."""
+    mem = df.memory_usage(deep=True, index=False)
+    return pd.DataFrame({
+        "column": mem.index,
+        "dtype": df.dtypes.astype(str).to_numpy(),
+        "mb": (mem / 1e6).round(3).to_numpy(),
+        "share_pct": (mem / mem.sum() * 100).round(1).to_numpy(),
+    }).sort_values("mb", ascending=False, ignore_index=True)
+
+
+def _read_state_codes(path):
+    return pd.read_csv(path, encoding="utf-8-sig")
+
+
+def _read_combined(path, states):
+    df = dims.canonicalize(coerce_numeric(pd.read_csv(path)), states)
+    # turnout %
+    df["turnout"] = (df["total_votes"] / df["total_electors"]) * 100
+    return df
+
+
+def _read_results(raw_paths, states):
+    years = {Path(path): year for year, path in raw_files().items()}
+    frames = [pd.read_csv(path).assign(year=years[Path(path)]) for path in raw_paths]
+
+    # Canonical names; also moves 2014's Telangana seats out of Andhra Pradesh
+    df = dims.canonicalize(pd.concat(frames, ignore_index=True), states)
+
+    # Numeric columns stay numeric: 'age' is NaN-free after coercion
+    df = coerce_numeric(df)
+
+    # Fill missing categorical fields with 'Unknown'
+    for col in ["sex", "category", "party_symbol"]:
+        if col in df.columns:
+            df[col] = df[col].fillna("Unknown")
+
+    # Standardize 'sex' column values for consistency
+    if "sex" in df.columns:
+        df["sex"] = (
+            df["sex"]
+            .astype(str)
+            .str.strip()
+            .str.title()
+            .replace({"Nan": "Unknown"})
+        )
+    return df
+
+
+def _build_dims(codes_path, combined_path, *raw_paths):
+    state_codes = _read_state_codes(codes_path)
+    states = dims.build_states(state_codes)
+    frames = [
+        _read_combined(combined_path, states),
+        _read_results(raw_paths, states),
+    ]
+    return dims.build_dims(frames, state_codes)
+
+
+def _build_combined(codes_path, combined_path, *raw_paths):
+    states = dims.build_states(_read_state_codes(codes_path))
+    return compact(dims.encode(_read_combined(combined_path, states), load_dims()))
+
+
+def _build_results(codes_path, combined_path, *raw_paths):
+    states = dims.build_states(_read_state_codes(codes_path))
+    return compact(dims.encode(_read_results(raw_paths, states), load_dims()))
+
+
+# -----------------------------
+# Public loaders
+# -----------------------------
+def load_dims():
+    """State, constituency and party dimension tables (see dims.py)."""
+    built = {}
+
+    def build(name):
+        def _build(*paths):
+            if not built:
+                built.update(_build_dims(*paths))
+            return built[name]
+        return _build
+
+    return {
+        name: cached_frame(f"dim_{name}", data_sources(), build(name), version=DATA_VERSION)
+        for name in ("state", "pc", "party")
+    }
+
+
+def load_combined(mapped=False):
+    """Cleaned candidate rows for every election, with numeric columns, turnout % and dimension keys."""
+    return cached_frame("combined", data_sources(), _build_combined, version=DATA_VERSION, mapped=mapped)
+
+
+def load_results(mapped=False):
+    """Raw per-year results concatenated, as used by streamlit2.py."""
+    return cached_frame("results", data_sources(), _build_results, version=DATA_VERSION, mapped=mapped)
+
+
+def dataset_path(name):
+    """Parquet file behind ``load_<name>()`` ("combined" or "results"), built if missing; for SQL engines."""
+    path = cache_path(name, data_sources(), DATA_VERSION)
+    if not path.exists():
+        {"combined": load_combined, "results": load_results}[name]()
+    return path
+
+
+def load_state_codes():
+    return cached_frame("state_codes", ["dim_states_codes.csv"], _read_state_codes)
+
+
+def load_party_summary():
+    return cached_frame("party_summary", ["party_summary.csv"], pd.read_csv)
@@ -0,0 +1,194 @@
+# dims.py
+"""
+Canonical dimension tables for states, parliamentary constituencies and
+parties.
+
+Names arrive in several spellings (trailing spaces such as ``"Aruku "``,
+``"Nct Of Delhi"`` vs ``"NCT OF Delhi"``, ``"CHELVELLA"`` vs ``"Chevella"``).
+They are resolved once, when a dataset's cache is built, against
+``dim_states_codes.csv`` plus the alias lists below. Each dimension gets a
+small integer key, and the fact rows carry those keys alongside categorical
+name columns, so joins and groupbys work on ints rather than Python strings.
+"""
+import pandas as pd
+
+# Canonical state name (as in dim_states_codes.csv) -> other spellings seen
+# in the results files, GeoJSON sources and older cleaning code
+STATE_ALIASES = {
+    "NCT OF Delhi": ["Delhi", "NCT of Delhi", "National Capital Territory of Delhi"],
+    "Odisha": ["Orissa"],
+    "Uttarakhand": ["Uttaranchal"],
+    "Telangana": ["Telengana"],
+    "Puducherry": ["Pondicherry"],
+    "Andaman & Nicobar Islands": ["Andaman & Nicobar Island"],
+    "Arunachal Pradesh": ["Arunanchal Pradesh"],
+    "Dadra & Nagar Haveli": ["Dadara & Nagar Havelli", "Dadra and Nagar Haveli and Daman and Diu"],
+}
+
+# Constituency spellings that differ between the 2014 and 2019 files
+PC_ALIASES = {
+    "Chelvella": "Chevella",
+    "Secunderabad": "Secundrabad",
+    "Bikaner (Sc)": "Bikaner",
+    "Burdwan - Durgapur": "Bardhaman Durgapur",
+    "Joynagar": "Jaynagar",
+    "Dadar & Nagar Haveli": "Dadra & Nagar Haveli",
+    "Dadra And Nagar Haveli": "Dadra & Nagar Haveli",
+}
+
+# Constituencies filed under Andhra Pradesh before the 2014 bifurcation
+TELANGANA_PCS = {
+    "Adilabad", "Peddapalle", "Karimnagar", "Nizamabad", "Zahirabad", "Medak",
+    "Malkajgiri", "Secundrabad", "Hyderabad", "Chevella", "Mahbubnagar",
+    "Nagarkurnool", "Nalgonda", "Bhongir", "Warangal", "Mahabubabad", "Khammam",
+}
+
+NAME_COLUMNS = ["state", "state_name", "pc_name", "party"]
+
+# Regions of the country (all states + UTs included as states), used by the
+# candidate dashboard's zone filter and the seat transition drill-down
+ZONES = {
+    "🧭 North Zone": [
+        "Jammu & Kashmir", "Ladakh", "Himachal Pradesh", "Punjab",
+        "Haryana", "Uttarakhand", "Uttar Pradesh", "NCT OF Delhi", "Chandigarh"
+    ],
+    "🌾 East Zone": [
+        "Bihar", "Jharkhand", "Odisha", "West Bengal"
+    ],
+    "🐪 West Zone": [
+        "Rajasthan", "Gujarat", "Maharashtra", "Goa", "Dadra & Nagar Haveli", "Daman & Diu"
+    ],
+    "🌴 South Zone": [
+        "Andhra Pradesh", "Karnataka", "Kerala", "Tamil Nadu", "Telangana",
+        "Puducherry", "Andaman & Nicobar Islands", "Lakshadweep"
+    ],
+    "🌿 Central Zone": [
+        "Madhya Pradesh", "Chhattisgarh"
+    ],
+    "⛰️ North East Zone": [
+        "Assam", "Arunachal Pradesh", "Manipur", "Meghalaya",
+        "Mizoram", "Nagaland", "Tripura", "Sikkim"
+    ]
+}
+
+
+def name_key(s):
+    """Spelling-insensitive lookup key: trimmed, single-spaced, casefolded, '&' as 'and'."""
+    return (
+        s.astype("string")
+        .str.strip()
+        .str.replace(r"\s+", " ", regex=True)
+        .str.replace("&", "and", regex=False)
+        .str.casefold()
+    )
+
+
+def _map_unique(values, fn):
+    """Apply a Series -> Series transform to the distinct values only."""
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    mapped = fn(pd.Series(uniques)).to_numpy()
+    out = pd.Series(mapped.take(codes), index=values.index, dtype=object)
+    out[codes < 0] = None
+    return out
+
+
+# -----------------------------
+# Building the dimensions
+# -----------------------------
+def build_states(state_codes):
+    """State dimension: state_id, state_name, abbreviation (ids follow file order)."""
+    states = state_codes.rename(columns=lambda c: c.strip().lstrip("﻿"))
+    states = states[["state_name", "abbreviation"]].reset_index(drop=True)
+    states.insert(0, "state_id", range(1, len(states) + 1))
+    return states
+
+
+def _state_lookup(states):
+    lookup = dict(zip(name_key(states["state_name"]), states["state_name"]))
+    for canonical, aliases in STATE_ALIASES.items():
+        lookup.update(dict.fromkeys(name_key(pd.Series(aliases)), canonical))
+    return lookup
+
+
+def lookup_states(names, states):
+    """Canonical state name for each of ``names`` (NaN where unknown)."""
+    return name_key(pd.Series(names)).map(_state_lookup(states))
+
+
+def canonicalize(df, states):
+    """
+    Replace state, constituency and party names with their canonical
+    spellings and move pre-bifurcation Telangana seats to Telangana.
+    Unknown states are kept, trimmed.
+    """
+    df = df.copy()
+    df["state"] = _map_unique(df["state"], lambda u: lookup_states(u, states).fillna(u.str.strip()))
+    df["pc_name"] = _map_unique(df["pc_name"], lambda u: (
+        u.str.strip().str.replace(r"\s+", " ", regex=True).str.title().replace(PC_ALIASES)
+    ))
+    df["party"] = _map_unique(df["party"], lambda u: u.str.strip())
+
+    telangana = (df["state"] == "Andhra Pradesh") & df["pc_name"].isin(TELANGANA_PCS)
+    df.loc[telangana, "state"] = "Telangana"
+
+    df["state_name"] = df["state"]
+    df["abbreviation"] = df["state"].map(dict(zip(states["state_name"], states["abbreviation"])))
+    return df
+
+
+def build_dims(frames, state_codes):
+    """
+    State, constituency and party dimensions over already-canonicalized
+    ``frames``. Returns ``{"state": ..., "pc": ..., "party": ...}``.
+    """
+    states = build_states(state_codes)
+    rows = pd.concat([f[["state", "pc_name", "party"]] for f in frames], ignore_index=True)
+
+    # States present in the data but missing from dim_states_codes.csv
+    extra = sorted(set(rows["state"].dropna()) - set(states["state_name"]))
+    if extra:
+        states = pd.concat([states, pd.DataFrame({
+            "state_id": range(len(states) + 1, len(states) + len(extra) + 1),
+            "state_name": extra,
+            "abbreviation": None,
+        })], ignore_index=True)
+
+    pcs = (
+        rows[["state", "pc_name"]].drop_duplicates()
+        .merge(states[["state_id", "state_name"]], left_on="state", right_on="state_name")
+        .sort_values(["state_id", "pc_name"])[["state_id", "pc_name"]]
+        .reset_index(drop=True)
+    )
+    pcs.insert(0, "pc_id", range(1, len(pcs) + 1))
+
+    parties = pd.DataFrame({"party": sorted(rows["party"].dropna().unique())})
+    parties.insert(0, "party_id", range(1, len(parties) + 1))
+    return {"state": states, "pc": pcs, "party": parties}
+
+
+# -----------------------------
+# Encoding fact rows
+# -----------------------------
+def encode(df, dims):
+    """
+    Add integer ``state_id``, ``pc_id`` and ``party_id`` keys and store the
+    name columns as categoricals ordered like their dimension.
+    """
+    states, pcs, parties = dims["state"], dims["pc"], dims["party"]
+    state_cat = pd.CategoricalDtype(states["state_name"])
+    party_cat = pd.CategoricalDtype(parties["party"])
+    pc_cat = pd.CategoricalDtype(sorted(pcs["pc_name"].unique()))
+
+    df = df.copy()
+    df["state_id"] = (df["state"].astype(state_cat).cat.codes + 1).astype("int16")
+    df["party_id"] = (df["party"].astype(party_cat).cat.codes + 1).astype("int32")
+
+    pc_index = pd.MultiIndex.from_frame(pcs[["state_id", "pc_name"]])
+    pc_pos = pc_index.get_indexer(pd.MultiIndex.from_arrays([df["state_id"], df["pc_name"]]))
+    df["pc_id"] = pd.Series(pcs["pc_id"].to_numpy().take(pc_pos), index=df.index).where(pc_pos >= 0, 0).astype("int32")
+
+    df["state"] = df["state"].astype(state_cat)
+    df["state_name"] = df["state_name"].astype(state_cat)
+    df["pc_name"] = df["pc_name"].astype(pc_cat)
+    df["party"] = df["party"].astype(party_cat)
+    return df
@@ -0,0 +1,107 @@
+# elections.py
+"""
+Year-agnostic analysis layer over the long-format candidate frame.
+
+``ElectionSet`` wraps every election in one frame (one row per candidate,
+with a ``year`` column) and answers per-year and cross-year questions for
+any pair or sequence of years. Per-year slices, wide tables and pairwise
+deltas are computed on first use and memoized on the instance. Grouped
+sums run on a pluggable engine (backends.py); pandas by default.
+"""
+import backends
+import facts as fact_table
+
+
+class ElectionSet:
+    def __init__(self, df, facts=None, backend=None):
+        self.df = df
+        self.backend = backend or backends.create(df)
+        self.years = sorted(int(y) for y in df["year"].unique())
+        self._facts = facts
+        self._memo = {}
+
+    def _cached(self, key, build):
+        if key not in self._memo:
+            self._memo[key] = build()
+        return self._memo[key]
+
+    # -----------------------------
+    # Per-year views
+    # -----------------------------
+    @property
+    def facts(self):
+        """Per-(year, constituency) fact table (see facts.py)."""
+        if self._facts is None:
+            self._facts = fact_table.build_facts(self.df)
+        return self._facts
+
+    def frame(self, year):
+        """Candidate rows for one election."""
+        return self._cached(("frame", year), lambda: self.df[self.df["year"] == year])
+
+    def winners(self, year):
+        return self._cached(("winners", year), lambda: fact_table.winners(self.facts, year))
+
+    def pairs(self, years=None):
+        """Consecutive (earlier, later) pairs over ``years`` (default: all)."""
+        years = sorted(years or self.years)
+        return list(zip(years[:-1], years[1:]))
+
+    # -----------------------------
+    # Wide tables: one column per year
+    # -----------------------------
+    def votes_by(self, keys):
+        """Summed total_votes per ``keys``, one column per year (0 where absent)."""
+        keys = list(keys)
+        return self._cached(("votes", tuple(keys)), lambda: (
+            self.backend.group_sum(keys + ["year"], ["total_votes"])["total_votes"]
+            .unstack("year", fill_value=0)
+        ))
+
+    def share_by(self, keys, within=None):
+        """
+        Vote share (%) per ``keys`` and year. Shares are taken within the
+        ``within`` prefix of ``keys`` (e.g. party share within a state), or
+        nationally when ``within`` is None.
+        """
+        keys = list(keys)
+        within = list(within or [])
+
+        def build():
+            votes = self.votes_by(keys)
+            totals = votes.groupby(level=within, observed=True).transform("sum") if within else votes.sum()
+            return votes / totals * 100
+
+        return self._cached(("share", tuple(keys), tuple(within)), build)
+
+    def turnout_by(self, keys):
+        """Mean candidate-row turnout per ``keys``, one column per year."""
+        keys = list(keys)
+        return self._cached(("turnout", tuple(keys)), lambda: (
+            self.df.groupby(keys + ["year"], observed=True)["turnout"].mean().unstack("year")
+        ))
+
+    # -----------------------------
+    # Cross-election comparisons
+    # -----------------------------
+    def compare(self, year_a, year_b, how="inner"):
+        """Constituency facts of two elections side by side, suffixed ``_<year>``."""
+        return self._cached(
+            ("compare", year_a, year_b, how),
+            lambda: fact_table.compare(self.facts, year_a, year_b, how=how),
+        )
+
+    def delta(self, metric, keys, year_a, year_b, within=None):
+        """
+        Change from ``year_a`` to ``year_b`` of a wide table, where ``metric``
+        is ``"votes"``, ``"share"`` or ``"turnout"``. Memoized per pair.
+        """
+        def build():
+            if metric == "share":
+                table = self.share_by(keys, within)
+            else:
+                table = getattr(self, f"{metric}_by")(keys)
+            return table[year_b] - table[year_a]
+
+        key = ("delta", metric, tuple(keys), tuple(within or []), year_a, year_b)
+        return self._cached(key, build)
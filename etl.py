@@ -0,0 +1,191 @@
+# etl.py
+"""
+Rebuild the cleaned dataset and its summaries from the raw per-year files.
+
+    python etl.py                     # only the steps whose inputs changed
+    python etl.py --workers 4 --force
+
+Replaces the cleaning cells of project1.ipynb with three steps:
+
+1. ``clean:<year>`` for every raw file (``data_store.raw_files``: each
+   ``constituency_wise_results_<year>.csv`` plus the files ingest.py
+   recorded in ``raw_sources.json``), run in a process pool: ``ingest.clean_results`` (vectorized string clean-up,
+   the 2014 Telangana fix and the state-code merge), written with compact
+   dtypes to ``etl/results_<year>.parquet``. ``age`` stays a nullable
+   integer (NA where unknown) instead of the notebook's ``'Unknown'``
+   strings, which made the column object dtype;
+2. ``combine``: the years concatenated to ``etl/combined.parquet`` and to
+   ``cleaned_combined_data.csv``, byte for byte the layout the notebook
+   wrote (so data_store.py and ingest.py keep reading it unchanged);
+3. ``summaries``: ``party_summary`` and ``state_summary`` (ingest.VIEWS)
+   as CSV and Parquet.
+
+Each step is stamped in ``etl/state.json`` with a fingerprint of its input
+files' bytes; a step whose stamp is unchanged and whose outputs exist is
+skipped. Bump ETL_VERSION when a step changes what it writes.
+
+A year already in ``cleaned_combined_data.csv`` without a raw file (one
+streamed in with ``ingest.py --chunksize``) can't be rebuilt, so the run
+stops rather than drop its rows.
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+import ingest
+from data_store import DATA_DIR, compact, fingerprint, raw_files
+
+ETL_VERSION = 1
+STATE_CODES = "dim_states_codes.csv"
+
+
+def _write(df, path):
+    """Write via a temporary file so a failed run never leaves half an output."""
+    tmp = path.with_name(f".{path.name}.tmp")
+    if path.suffix == ".parquet":
+        df.to_parquet(tmp, index=False)
+    else:
+        df.to_csv(tmp, index=False)
+    os.replace(tmp, path)
+
+
+# -----------------------------
+# Steps
+# -----------------------------
+def clean_year(raw_path, year, codes_path, out_path):
+    """Step ``clean:<year>``: one raw file to a typed Parquet file."""
+    state_codes = pd.read_csv(codes_path, encoding="utf-8-sig")
+    _write(compact(ingest.clean_results(pd.read_csv(raw_path), year, state_codes)), out_path)
+    return year
+
+
+def combine(year_paths, parquet_path, csv_path):
+    df = pd.concat([pd.read_parquet(p) for p in year_paths], ignore_index=True)
+    # Categories differ per year; concat falls back to plain strings
+    _write(compact(df), parquet_path)
+
+    # The notebook saved ages as floats (NaN where unknown)
+    csv = df.astype({c: "object" for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)})
+    csv["age"] = csv["age"].astype("float64")
+    _write(csv, csv_path)
+
+
+def summaries(combined_path, outputs):
+    df = pd.read_parquet(combined_path)
+    for name, view in ingest.VIEWS.items():
+        out = (
+            ingest.aggregate(df, view)
+            .reset_index()
+            .sort_values(ingest.SUMMARY_ORDER[name])
+            .reset_index(drop=True)
+        )
+        out[view["keys"]] = out[view["keys"]].astype("object")
+        csv_path, parquet_path = outputs[name]
+        _write(out, csv_path)
+        _write(compact(out), parquet_path)
+
+
+# -----------------------------
+# Runner
+# -----------------------------
+class State:
+    """Per-step stamps in ``etl/state.json``."""
+
+    def __init__(self, path):
+        self.path = path
+        self.stamps = json.loads(path.read_text()) if path.exists() else {}
+
+    @staticmethod
+    def stamp(inputs):
+        return f"{fingerprint(inputs)}v{ETL_VERSION}"
+
+    def fresh(self, step, inputs, outputs):
+        return self.stamps.get(step) == self.stamp(inputs) and all(Path(p).exists() for p in outputs)
+
+    def done(self, step, inputs):
+        self.stamps[step] = self.stamp(inputs)
+        tmp = self.path.with_name(f".{self.path.name}.tmp")
+        tmp.write_text(json.dumps(self.stamps, indent=2, sort_keys=True))
+        os.replace(tmp, self.path)
+
+
+def run(src=DATA_DIR, out=DATA_DIR, workers=None, force=False):
+    """Run every stale step; returns {step: "ran" | "skipped"}."""
+    src, out = Path(src), Path(out)
+    work = out / "etl"
+    work.mkdir(parents=True, exist_ok=True)
+    state = State(work / "state.json")
+    codes = src / STATE_CODES
+    raw = raw_files(src)
+    if not raw:
+        raise FileNotFoundError(f"no constituency_wise_results_<year>.csv files in {src}")
+    combined_csv = out / ingest.COMBINED_CSV.name
+    if combined_csv.exists():
+        orphans = sorted(ingest.existing_years(combined_csv) - set(raw))
+        if orphans:
+            raise ValueError(
+                f"{combined_csv.name} has rows for {', '.join(map(str, orphans))} with no raw file to "
+                f"rebuild them from; ingest the candidate-level file with ingest.py first"
+            )
+    status = {}
+
+    # 1. clean: one task per stale year
+    cleaned = {year: work / f"results_{year}.parquet" for year in raw}
+    stale = [year for year in raw
+             if force or not state.fresh(f"clean:{year}", [raw[year], codes], [cleaned[year]])]
+    tasks = [(raw[year], year, codes, cleaned[year]) for year in stale]
+    workers = min(workers or os.cpu_count() or 1, max(len(tasks), 1))
+    if workers == 1:
+        for task in tasks:
+            clean_year(*task)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(clean_year, *zip(*tasks)))
+    for year in raw:
+        if year in stale:
+            state.done(f"clean:{year}", [raw[year], codes])
+        status[f"clean:{year}"] = "ran" if year in stale else "skipped"
+
+    # 2. combine
+    year_paths = [cleaned[year] for year in sorted(raw)]
+    combined_parquet = work / "combined.parquet"
+    if force or not state.fresh("combine", year_paths, [combined_parquet, combined_csv]):
+        combine(year_paths, combined_parquet, combined_csv)
+        state.done("combine", year_paths)
+        status["combine"] = "ran"
+    else:
+        status["combine"] = "skipped"
+
+    # 3. summaries
+    outputs = {name: (out / view["path"].name, work / f"{name}.parquet") for name, view in ingest.VIEWS.items()}
+    if force or not state.fresh("summaries", [combined_parquet], [p for pair in outputs.values() for p in pair]):
+        summaries(combined_parquet, outputs)
+        state.done("summaries", [combined_parquet])
+        status["summaries"] = "ran"
+    else:
+        status["summaries"] = "skipped"
+    return status
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--src", default=str(DATA_DIR), help="directory of the raw files and dim_states_codes.csv")
+    parser.add_argument("--out", default=str(DATA_DIR), help="where the CSVs go; Parquet outputs go to <out>/etl")
+    parser.add_argument("--workers", type=int, help="processes for the per-year step (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="rerun every step")
+    args = parser.parse_args(argv)
+
+    t = time.perf_counter()
+    status = run(args.src, args.out, args.workers, args.force)
+    for step, result in status.items():
+        print(f"{step:<14} {result}")
+    print(f"Done in {time.perf_counter() - t:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+# facts.py
+"""
+Per-(year, constituency) fact table.
+
+One row per constituency and election holding the winner, the runner-up,
+the winning margin, turnout, NOTA votes and total votes polled. The
+dashboard sections look results up here instead of re-running
+``groupby('pc_name')['total_votes'].idxmax()`` on candidate rows.
+"""
+import numpy as np
+import pandas as pd
+
+import data_store
+
+KEY = ["year", "state", "pc_name"]
+
+# Bump when build_facts() changes its output
+FACTS_VERSION = 5
+
+FACT_COLUMNS = KEY + [
+    "state_name",
+    "winner", "winner_party", "winner_votes",
+    "runner_up", "runner_up_party", "runner_up_votes",
+    "margin", "margin_pct", "winner_vote_pct",
+    "total_votes", "total_electors", "turnout", "nota_votes",
+]
+
+
+# -----------------------------
+# Top-2 margin kernel
+# -----------------------------
+def top2(codes, votes):
+    """
+    Winner and runner-up per group from flat arrays.
+
+    ``codes`` are dense group ids (0..n_groups-1) and ``votes`` the value to
+    rank on. One lexsort orders every group at once; group boundaries then
+    give the top two rows directly. Returns ``(groups, first, second)``
+    where ``first``/``second`` are row positions into the inputs and
+    ``second`` is -1 for single-candidate groups. Equal votes rank in row
+    order, so a tie goes to the earlier row, as ``idxmax`` would.
+    """
+    codes = np.asarray(codes)
+    votes = np.asarray(votes)
+    if len(codes) == 0:
+        empty = np.array([], dtype=np.intp)
+        return empty, empty, empty
+
+    # Ascending within each group, so the top two sit at the end of the run;
+    # equal votes in reverse row order, so a tie goes to the earlier row (as idxmax)
+    order = np.lexsort((-np.arange(len(codes)), votes, codes))
+    g = codes[order]
+    ends = np.flatnonzero(np.r_[g[1:] != g[:-1], True])
+    starts = np.r_[0, ends[:-1] + 1]
+
+    first = order[ends]
+    second = np.where(ends > starts, order[np.maximum(ends - 1, 0)], -1)
+    return g[ends], first, second
+
+
+def margins(df, by, value="total_votes"):
+    """
+    Winner, runner-up, absolute margin and margin % for every group of ``df``.
+
+    ``margin_pct`` is relative to the total of ``value`` over the rows passed
+    in. Works in a single pass regardless of the number of groups.
+    """
+    codes = df.groupby(by, sort=False, observed=True).ngroup().to_numpy()
+    votes = df[value].to_numpy()
+    groups, first, second = top2(codes, votes)
+    has_second = second >= 0
+
+    out = df[by].iloc[first].reset_index(drop=True)
+    out["winner"] = df["candidate"].to_numpy()[first]
+    out["winner_party"] = df["party"].to_numpy()[first]
+    out["winner_votes"] = votes[first]
+    out["runner_up"] = np.where(has_second, df["candidate"].to_numpy()[second], None)
+    out["runner_up_party"] = np.where(has_second, df["party"].to_numpy()[second], None)
+    out["runner_up_votes"] = np.where(has_second, votes[second], 0)
+    out["margin"] = out["winner_votes"] - out["runner_up_votes"]
+    group_total = np.bincount(codes, weights=votes)[groups]
+    out["margin_pct"] = out["margin"] / group_total * 100
+    return out
+
+
+def build_facts(df):
+    """Build the fact table from candidate-level rows."""
+    is_nota = df["party"] == "NOTA"
+
+    # Constituency totals (NOTA counts towards votes polled)
+    totals = df.groupby(KEY, as_index=False, observed=True).agg(
+        state_name=("state_name", "first"),
+        total_votes=("total_votes", "sum"),
+        total_electors=("total_electors", "max"),
+    )
+    nota = (
+        df[is_nota].groupby(KEY, observed=True)["total_votes"].sum()
+        .rename("nota_votes").reset_index()
+    )
+
+    # NOTA can't win or come second
+    top = margins(df[~is_nota], KEY).drop(columns="margin_pct")
+
+    facts = totals.merge(top, on=KEY, how="left").merge(nota, on=KEY, how="left")
+    facts["state_name"] = facts["state_name"].fillna(facts["state"])
+    facts["nota_votes"] = facts["nota_votes"].fillna(0)
+    facts["margin_pct"] = facts["margin"] / facts["total_votes"] * 100
+    facts["winner_vote_pct"] = facts["winner_votes"] / facts["total_votes"] * 100
+    facts["turnout"] = facts["total_votes"] / facts["total_electors"] * 100
+    return facts[FACT_COLUMNS]
+
+
+def load_facts(mapped=False):
+    """
+    Fact table for the cleaned dataset, cached per source fingerprint. With
+    ``mapped`` it is built from the same memory-mapped copy of the dataset
+    the dashboards load, so the Parquet cache is not read as well.
+    """
+    return data_store.cached_frame(
+        "facts",
+        data_store.data_sources(),
+        lambda *paths: data_store.compact(build_facts(data_store.load_combined(mapped=mapped))),
+        version=FACTS_VERSION,
+        mapped=mapped,
+    )
+
+
+# -----------------------------
+# Lookups used by the dashboard sections
+# -----------------------------
+def winners(facts, year):
+    """Winning candidate per constituency for one election; total_votes is the winner's tally."""
+    w = facts[facts["year"] == year]
+    return w[["pc_name", "state", "state_name", "winner", "winner_party", "winner_votes",
+              "winner_vote_pct", "margin", "turnout"]].rename(columns={
+        "winner": "candidate",
+        "winner_party": "party",
+        "winner_votes": "total_votes",
+    })
+
+
+def compare(facts, year_a, year_b, how="inner"):
+    """Join two elections' facts on constituency, suffixing columns with the year."""
+    a = facts[facts["year"] == year_a].drop(columns="year")
+    b = facts[facts["year"] == year_b].drop(columns="year")
+    return a.merge(b, on=["state", "pc_name"], how=how, suffixes=(f"_{year_a}", f"_{year_b}"))
@@ -0,0 +1,99 @@
+# filter_index.py
+"""
+Row index for the sidebar filters in streamlit2.py.
+
+Each filter column is factorized once. Low-cardinality columns (year,
+state) keep a packed row bitmap per value. High-cardinality columns
+(constituency, party, candidate) keep each value's row ids as a posting
+list instead, which is the same information in far less memory. A filter
+combination is answered by OR-ing the selected values within a column and
+AND-ing the columns together, without rescanning any string column.
+Option lists come from the same codes.
+"""
+import numpy as np
+import pandas as pd
+
+# Columns with at most this many distinct values get packed bitmaps
+MAX_BITMAPS = 64
+
+
+class FilterIndex:
+    def __init__(self, df, columns, max_bitmaps=MAX_BITMAPS):
+        self.n_rows = len(df)
+        self._cols = {}
+        for col in columns:
+            codes, values = self._factorize(df[col])
+            order = np.argsort(codes, kind="stable")
+            bounds = np.searchsorted(codes[order], np.arange(len(values) + 1))
+            entry = {
+                "values": list(values),
+                "lookup": {v: i for i, v in enumerate(values)},
+                "codes": codes,
+                "rows": order,
+                "bounds": bounds,
+                "bitmaps": None,
+            }
+            if len(values) <= max_bitmaps:
+                entry["bitmaps"] = np.stack([
+                    np.packbits(self._rows_to_bits(order[bounds[i]:bounds[i + 1]]))
+                    for i in range(len(values))
+                ]) if len(values) else None
+            self._cols[col] = entry
+
+    @staticmethod
+    def _factorize(s):
+        """Codes into the naturally sorted distinct values (-1 for missing)."""
+        codes, uniques = pd.factorize(s)
+        uniques = [v.item() if hasattr(v, "item") else v for v in np.asarray(uniques, dtype=object)]
+        order = sorted(range(len(uniques)), key=uniques.__getitem__)
+        rank = np.empty(len(uniques), dtype=np.int32)
+        rank[order] = np.arange(len(uniques), dtype=np.int32)
+        codes = np.where(codes >= 0, rank[np.maximum(codes, 0)], -1).astype(np.int32)
+        return codes, [uniques[i] for i in order]
+
+    def _rows_to_bits(self, rows):
+        bits = np.zeros(self.n_rows, dtype=bool)
+        bits[rows] = True
+        return bits
+
+    # -----------------------------
+    # Masks
+    # -----------------------------
+    def all(self):
+        return np.ones(self.n_rows, dtype=bool)
+
+    def mask(self, col, selected):
+        """Boolean row mask for ``col`` in ``selected`` (OR over the selected values)."""
+        entry = self._cols[col]
+        codes = [entry["lookup"][v] for v in selected if v in entry["lookup"]]
+        if not codes:
+            return np.zeros(self.n_rows, dtype=bool)
+        if entry["bitmaps"] is not None:
+            packed = np.bitwise_or.reduce(entry["bitmaps"][codes], axis=0)
+            return np.unpackbits(packed, count=self.n_rows).astype(bool)
+        rows, bounds = entry["rows"], entry["bounds"]
+        return self._rows_to_bits(np.concatenate([rows[bounds[c]:bounds[c + 1]] for c in codes]))
+
+    def select(self, **filters):
+        """AND of ``mask(col, values)`` over the keyword filters; None skips a column."""
+        out = self.all()
+        for col, selected in filters.items():
+            if selected is not None:
+                out &= self.mask(col, selected)
+        return out
+
+    # -----------------------------
+    # Option lists
+    # -----------------------------
+    def values(self, col):
+        """Every distinct value of ``col``, sorted."""
+        return list(self._cols[col]["values"])
+
+    def options(self, col, within=None):
+        """Sorted distinct values of ``col`` among the rows of mask ``within``."""
+        entry = self._cols[col]
+        if within is None:
+            return self.values(col)
+        codes = entry["codes"][within]
+        present = np.bincount(codes[codes >= 0], minlength=len(entry["values"])) > 0
+        return [v for v, p in zip(entry["values"], present) if p]
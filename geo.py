@@ -0,0 +1,177 @@
+# geo.py
+"""
+Bundled India state geometry for the Home map.
+
+    python geo.py india_telengana.geojson    # source GeoJSON, not an output name
+
+The build step reads a state-level GeoJSON (e.g. geohacker/india's
+``state/india_telengana.geojson``), simplifies every ring, resolves each
+feature's state name to a ``state_id`` from the state dimension (dims.py)
+and writes two files next to this module:
+
+- ``india_states.geojson``: simplified geometry, one feature per state,
+  with the feature ``id`` set to ``state_id``
+- ``geo_states.csv``: ``state_id, state_name, feature_name`` for every
+  matched feature
+
+At runtime the dashboard reads these files: no network access, and no
+name matching. The choropleth joins on ``state_id`` directly. When they
+are missing ``load`` fails at once with the build instruction, and the
+dashboard shows the state totals as a bar chart instead.
+"""
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import data_store
+import dims
+
+GEOJSON_PATH = data_store.DATA_DIR / "india_states.geojson"
+IDS_PATH = data_store.DATA_DIR / "geo_states.csv"
+
+# Property names that hold the state name in common India GeoJSON sources
+NAME_PROPERTIES = ("ST_NM", "st_name", "st_nm", "st_name_1", "NAME_1", "NAME", "state")
+
+# Simplification: coordinates rounded to ~100 m, then Douglas-Peucker with
+# a tolerance in degrees. Plenty for a state-level choropleth.
+PRECISION = 3
+TOLERANCE = 0.01
+
+
+# -----------------------------
+# Simplification
+# -----------------------------
+def simplify_line(points, tolerance=TOLERANCE):
+    """Douglas-Peucker on an (n, 2) array; endpoints are always kept."""
+    n = len(points)
+    if n < 3:
+        return points
+    keep = np.zeros(n, dtype=bool)
+    keep[[0, -1]] = True
+    stack = [(0, n - 1)]
+    while stack:
+        lo, hi = stack.pop()
+        if hi - lo < 2:
+            continue
+        a, b = points[lo], points[hi]
+        seg = points[lo + 1:hi]
+        d = b - a
+        norm = np.hypot(*d)
+        if norm == 0:
+            dist = np.hypot(*(seg - a).T)
+        else:
+            dist = np.abs(d[0] * (seg[:, 1] - a[1]) - d[1] * (seg[:, 0] - a[0])) / norm
+        i = int(np.argmax(dist))
+        if dist[i] > tolerance:
+            mid = lo + 1 + i
+            keep[mid] = True
+            stack += [(lo, mid), (mid, hi)]
+    return points[keep]
+
+
+def simplify_ring(ring, tolerance=TOLERANCE):
+    pts = np.round(np.asarray(ring, dtype=float)[:, :2], PRECISION)
+    pts = pts[np.r_[True, np.any(pts[1:] != pts[:-1], axis=1)]]
+    out = simplify_line(pts, tolerance)
+    # A closed ring needs at least four positions
+    if len(out) < 4:
+        out = pts
+    return out.tolist()
+
+
+def _polygons(geometry):
+    if geometry["type"] == "Polygon":
+        return [geometry["coordinates"]]
+    if geometry["type"] == "MultiPolygon":
+        return geometry["coordinates"]
+    return []
+
+
+# -----------------------------
+# Build step
+# -----------------------------
+def name_property(geo):
+    props = geo["features"][0]["properties"]
+    for cand in NAME_PROPERTIES:
+        for k in props:
+            if k.upper() == cand.upper():
+                return k
+    raise ValueError(f"no state name property among {sorted(props)}")
+
+
+def build(source, tolerance=TOLERANCE):
+    """
+    Simplify the GeoJSON file ``source`` and resolve its features to state
+    ids; returns (geojson, ids, names of features matching no state).
+    """
+    with open(source, encoding="utf-8") as f:
+        geo = json.load(f)
+    prop = name_property(geo)
+
+    states = data_store.load_dims()["state"]
+    names = [feat["properties"].get(prop) or "" for feat in geo["features"]]
+    ids = pd.DataFrame({"feature_name": names, "state_name": dims.lookup_states(names, states)})
+    ids = ids.merge(states[["state_id", "state_name"]], on="state_name", how="left")
+
+    unmatched = sorted(ids.loc[ids["state_id"].isna(), "feature_name"])
+
+    # One MultiPolygon per state; several source features may share a state
+    polygons = {}
+    for feat, state_id in zip(geo["features"], ids["state_id"]):
+        if pd.isna(state_id):
+            continue
+        polygons.setdefault(int(state_id), []).extend(
+            [simplify_ring(ring, tolerance) for ring in poly] for poly in _polygons(feat["geometry"])
+        )
+
+    out = {
+        "type": "FeatureCollection",
+        "features": [
+            {"type": "Feature", "id": sid, "properties": {},
+             "geometry": {"type": "MultiPolygon", "coordinates": polys}}
+            for sid, polys in sorted(polygons.items())
+        ],
+    }
+    ids = ids.dropna(subset=["state_id"]).astype({"state_id": "int64"})
+    ids = ids[["state_id", "state_name", "feature_name"]].drop_duplicates()
+    return out, ids.sort_values("state_id").reset_index(drop=True), unmatched
+
+
+# -----------------------------
+# Runtime loader
+# -----------------------------
+def load():
+    """Bundled (geojson, ids) written by the build step; FileNotFoundError when not built."""
+    missing = [p.name for p in (GEOJSON_PATH, IDS_PATH) if not p.exists()]
+    if missing:
+        raise FileNotFoundError(
+            f"{' and '.join(missing)} not built; run `python geo.py <source.geojson>` once and commit the output"
+        )
+    with open(GEOJSON_PATH, encoding="utf-8") as f:
+        geo = json.load(f)
+    return geo, pd.read_csv(IDS_PATH)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("source", help="state-level India GeoJSON")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="simplification tolerance in degrees")
+    args = parser.parse_args(argv)
+    if Path(args.source).resolve() in (GEOJSON_PATH, IDS_PATH):
+        parser.error(f"{args.source} is an output of this script; pass the source GeoJSON")
+
+    geo, ids, unmatched = build(args.source, args.tolerance)
+    if unmatched:
+        print("Unmatched features (not in the state dimension):", ", ".join(unmatched))
+    with open(GEOJSON_PATH, "w", encoding="utf-8") as f:
+        json.dump(geo, f, separators=(",", ":"))
+    ids.to_csv(IDS_PATH, index=False)
+    print(f"Wrote {len(geo['features'])} states to {GEOJSON_PATH.name} "
+          f"({GEOJSON_PATH.stat().st_size / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
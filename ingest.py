@@ -0,0 +1,225 @@
+# ingest.py
+"""
+Append one election's results to the combined dataset.
+
+    python ingest.py constituency_wise_results_2024.csv --year 2024
+    python ingest.py booths_2024.csv --year 2024 --chunksize 1000000 \
+        --booth-column booth_no --parquet-dir booths/
+
+The combined CSV is partitioned by ``year``: a new election only appends its
+own rows. ``party_summary.csv`` and ``state_summary.csv`` are kept as
+materialized views: the new rows are aggregated on their own and folded into
+the existing summaries, so the cost of adding a year is proportional to the
+size of that year's file, not to the history already loaded.
+
+With ``--chunksize`` the results file is streamed instead of read whole,
+for polling-station files far larger than memory. Each chunk is cleaned
+and folded into running per-candidate totals (votes summed over booths;
+electors summed once per booth with ``--booth-column``, else taken per
+constituency), and optionally written to a Parquet dataset partitioned by
+year and state. Only the rolled-up candidate rows, the same layout as the
+constituency-level files, reach the combined CSV, so every analysis runs
+on them unchanged.
+
+A candidate-level file is recorded in ``raw_sources.json`` under its year,
+so ``etl.py`` and ``data_store.load_results()`` rebuild from the same
+files. Streamed years are not: etl.py refuses to rewrite them.
+"""
+import argparse
+from pathlib import Path
+
+import pandas as pd
+
+import data_store
+
+DATA_DIR = Path(__file__).resolve().parent
+COMBINED_CSV = DATA_DIR / "cleaned_combined_data.csv"
+STATE_CODES_CSV = DATA_DIR / "dim_states_codes.csv"
+
+# Same list the notebook uses when it builds cleaned_combined_data.csv
+TELANGANA_CONSTITUENCIES = [
+    "Adilabad", "Nizamabad", "Karimnagar", "Medak", "Malkajgiri", "Secundrabad",
+    "Hyderabad", "Chelvella", "Mahbubnagar", "Nagarkurnool", "Nalgonda",
+    "Bhongir", "Warangal", "Mahabubabad", "Khammam", "Zahirabad"
+]
+
+# Row order of each summary file, as the notebook wrote them (etl.py too)
+SUMMARY_ORDER = {"party_summary": ["party", "year"], "state_summary": ["year", "state"]}
+
+# Summary tables maintained incrementally: output file, group keys and
+# decomposable aggregations {output column: (source column, "sum" | "count")}
+VIEWS = {
+    "party_summary": {
+        "path": DATA_DIR / "party_summary.csv",
+        "keys": ["party", "year"],
+        "aggs": {"total_votes": ("total_votes", "sum"), "no_of_seats": ("pc_name", "count")},
+    },
+    "state_summary": {
+        "path": DATA_DIR / "state_summary.csv",
+        "keys": ["state", "year"],
+        "aggs": {"total_votes": ("total_votes", "sum")},
+    },
+}
+
+
+# -----------------------------
+# Cleaning (mirrors project1.ipynb)
+# -----------------------------
+def clean_results(df, year, state_codes):
+    """Normalize one year's raw results into the combined-dataset layout."""
+    df = df.copy()
+    for col in ["pc_name", "state"]:
+        if col in df.columns:
+            df[col] = df[col].str.strip().str.title()
+
+    if year == 2014:
+        df.loc[df["pc_name"].isin(TELANGANA_CONSTITUENCIES), "state"] = "Telangana"
+
+    df["year"] = year
+    return df.merge(state_codes, left_on="state", right_on="state_name", how="left")
+
+
+# -----------------------------
+# Streaming roll-up (booth / polling-station files)
+# -----------------------------
+# One output row per candidate; the attributes tell namesakes apart
+ROLLUP_KEYS = ["state", "pc_name", "candidate", "sex", "age", "category", "party", "party_symbol"]
+VOTE_COLUMNS = ["general_votes", "postal_votes", "total_votes"]
+
+
+def _sum_by(df, keys, cols):
+    return df.groupby(keys, dropna=False, sort=False)[cols].sum().reset_index()
+
+
+def stream_results(results_path, year, state_codes, chunksize, booth_column=None, parquet_dir=None):
+    """
+    Clean ``results_path`` ``chunksize`` rows at a time and roll it up to one
+    row per candidate; memory is bounded by the chunk and the running totals.
+    """
+    votes, electors = None, None
+    for chunk in pd.read_csv(results_path, chunksize=chunksize):
+        rows = clean_results(chunk, year, state_codes)
+        for col in VOTE_COLUMNS + ["total_electors"]:
+            rows[col] = pd.to_numeric(rows[col], errors="coerce").fillna(0).astype("int64")
+        if parquet_dir is not None:
+            rows.to_parquet(parquet_dir, partition_cols=["year", "state"], index=False)
+
+        part = _sum_by(rows, ROLLUP_KEYS, VOTE_COLUMNS)
+        votes = part if votes is None else _sum_by(pd.concat([votes, part]), ROLLUP_KEYS, VOTE_COLUMNS)
+
+        # Electors: once per booth (booths may straddle chunks), else the constituency's own figure
+        if booth_column:
+            part = rows[["state", "pc_name", booth_column, "total_electors"]].drop_duplicates(
+                ["state", "pc_name", booth_column])
+            if electors is not None:
+                part = pd.concat([electors, part]).drop_duplicates(["state", "pc_name", booth_column])
+        else:
+            part = rows.groupby(["state", "pc_name"], sort=False)["total_electors"].max().reset_index()
+            if electors is not None:
+                part = pd.concat([electors, part]).groupby(["state", "pc_name"], sort=False)["total_electors"].max().reset_index()
+        electors = part
+
+    if votes is None:
+        raise ValueError(f"{results_path} has no rows")
+    electors = electors.groupby(["state", "pc_name"], sort=False)["total_electors"].sum().reset_index()
+    out = votes.merge(electors, on=["state", "pc_name"], how="left")
+    out["year"] = year
+    return out.merge(state_codes, left_on="state", right_on="state_name", how="left")
+
+
+# -----------------------------
+# Materialized views
+# -----------------------------
+def aggregate(rows, view):
+    """Partial aggregate of ``rows`` for one view, indexed by its keys."""
+    return rows.groupby(view["keys"]).agg(**view["aggs"])
+
+
+def fold(existing, delta, name, gone=None):
+    """
+    Merge a partial aggregate into the stored summary ``name`` (sums and
+    counts add up), dropping the groups in ``gone``, which have no rows left.
+    """
+    view = VIEWS[name]
+    merged = existing.set_index(view["keys"]).add(delta, fill_value=0)
+    if gone is not None and len(gone):
+        merged = merged[~merged.index.isin(gone)]
+    cols = list(view["aggs"])
+    merged[cols] = merged[cols].astype("int64")
+    return merged.reset_index().sort_values(SUMMARY_ORDER[name]).reset_index(drop=True)
+
+
+def refresh_views(new_rows, removed_rows=None):
+    """
+    Apply added (and optionally removed) rows to every summary view.
+    ``removed_rows`` is a whole year, so a group it has and ``new_rows``
+    doesn't is dropped rather than left at 0.
+    """
+    for name, view in VIEWS.items():
+        delta = aggregate(new_rows, view)
+        gone = None
+        if removed_rows is not None and not removed_rows.empty:
+            removed = aggregate(removed_rows, view)
+            gone = removed.index.difference(delta.index)
+            delta = delta.sub(removed, fill_value=0)
+        existing = pd.read_csv(view["path"])
+        fold(existing, delta, name, gone).to_csv(view["path"], index=False)
+
+
+# -----------------------------
+# Ingest
+# -----------------------------
+def existing_years(path=None):
+    return set(pd.read_csv(path or COMBINED_CSV, usecols=["year"])["year"].unique())
+
+
+def ingest(results_path, year, replace=False, chunksize=None, booth_column=None, parquet_dir=None):
+    """Append ``results_path`` as election ``year``; returns the rows added."""
+    state_codes = pd.read_csv(STATE_CODES_CSV, encoding="utf-8-sig")
+    if chunksize:
+        new_rows = stream_results(results_path, year, state_codes, chunksize, booth_column, parquet_dir)
+    else:
+        new_rows = clean_results(pd.read_csv(results_path), year, state_codes)
+
+    header = pd.read_csv(COMBINED_CSV, nrows=0).columns
+    new_rows = new_rows.reindex(columns=header)
+
+    if year not in existing_years():
+        # Appending a new partition touches nothing already on disk
+        new_rows.to_csv(COMBINED_CSV, mode="a", header=False, index=False)
+        refresh_views(new_rows)
+    elif replace:
+        combined = pd.read_csv(COMBINED_CSV)
+        removed = combined[combined["year"] == year]
+        combined = pd.concat([combined[combined["year"] != year], new_rows], ignore_index=True)
+        combined.to_csv(COMBINED_CSV, index=False)
+        refresh_views(new_rows, removed)
+    else:
+        raise ValueError(f"{year} is already in {COMBINED_CSV.name}; pass --replace to reload it")
+
+    # Candidate-level files are sources etl.py and load_results() rebuild from;
+    # rolled-up booth files are not
+    if not chunksize:
+        data_store.register_raw(year, results_path)
+    return new_rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("results", help="per-candidate results CSV in the constituency_wise_results_<year>.csv layout")
+    parser.add_argument("--year", type=int, required=True)
+    parser.add_argument("--replace", action="store_true", help="reload a year that is already ingested")
+    parser.add_argument("--chunksize", type=int, help="stream the file this many rows at a time and roll it up per candidate")
+    parser.add_argument("--booth-column", help="column identifying a booth / polling station (electors are summed once per booth)")
+    parser.add_argument("--parquet-dir", help="also write the cleaned rows here, partitioned by year and state")
+    args = parser.parse_args(argv)
+
+    if (args.booth_column or args.parquet_dir) and not args.chunksize:
+        parser.error("--booth-column and --parquet-dir need --chunksize")
+    rows = ingest(args.results, args.year, replace=args.replace, chunksize=args.chunksize,
+                  booth_column=args.booth_column, parquet_dir=args.parquet_dir)
+    print(f"Ingested {len(rows):,} rows for {args.year}")
+
+
+if __name__ == "__main__":
+    main()
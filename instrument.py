@@ -0,0 +1,167 @@
+# instrument.py
+"""
+Opt-in stage timings for the dashboards.
+
+    ELECTION_PROFILE=1 streamlit run streamlit.py
+    ELECTION_PROFILE=1 ELECTION_PROFILE_LOG=profile.jsonl streamlit run streamlit2.py
+
+A ``Timer`` is created at the top of each script run and splits the run's
+wall time into stages: data load, the filter cascade, aggregation, figure
+build and rendering (``st.plotly_chart`` / ``st.dataframe`` serialization).
+Stages nest; each stage's time excludes the stages inside it, so a section
+built under "figures" that calls ``analyses.run`` under "aggregation"
+reports the two separately. ``lap(name)`` closes a top-level stretch of the
+script (everything since the previous lap not already in a stage).
+
+The apps show ``report()`` in a sidebar panel (``panel``) and append
+``record()`` as one JSON line to ELECTION_PROFILE_LOG (or
+profile_log.jsonl); ``read_log`` loads the log back as a frame. When ELECTION_PROFILE is unset, ``stage``
+returns a no-op context and ``timed`` returns its argument unchanged, so the
+instrumentation costs nothing.
+"""
+import contextlib
+import functools
+import json
+import os
+import time
+from pathlib import Path
+
+import pandas as pd
+
+DATA_DIR = Path(__file__).resolve().parent
+ENABLED = os.environ.get("ELECTION_PROFILE", "") not in ("", "0")
+# Every run is appended here when set; otherwise only on request from the panel
+LOG_PATH = os.environ.get("ELECTION_PROFILE_LOG")
+DEFAULT_LOG = DATA_DIR / "profile_log.jsonl"
+
+
+class _Stage:
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        self.timer._stack.append(0.0)
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        nested = self.timer._stack.pop()
+        self.timer._add(self.name, elapsed - nested)
+        if self.timer._stack:
+            self.timer._stack[-1] += elapsed
+        else:
+            self.timer._in_stages += elapsed
+
+
+class Timer:
+    def __init__(self, app, enabled=None):
+        self.app = app
+        self.view = None
+        self.enabled = ENABLED if enabled is None else enabled
+        self.start = self._mark = time.perf_counter()
+        self.seconds = {}
+        self.calls = {}
+        self._stack = []
+        self._in_stages = 0.0
+
+    def _add(self, name, seconds):
+        self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def stage(self, name):
+        """Context manager timing its body under ``name``."""
+        return _Stage(self, name) if self.enabled else contextlib.nullcontext()
+
+    def lap(self, name):
+        """Charge the time since the previous lap, less any stages, to ``name``."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self._add(name, now - self._mark - self._in_stages)
+        self._mark, self._in_stages = now, 0.0
+
+    def timed(self, obj, stage, methods=None):
+        """``obj`` with calls to its ``methods`` (default: all callables) timed under ``stage``."""
+        return _Timed(self, obj, stage, methods) if self.enabled else obj
+
+    # -----------------------------
+    # Results
+    # -----------------------------
+    def elapsed(self):
+        """Seconds since the run started (tracked even when profiling is off)."""
+        return time.perf_counter() - self.start
+
+    def report(self):
+        """One row per stage: calls, milliseconds and share of the run so far."""
+        total = time.perf_counter() - self.start
+        df = pd.DataFrame({
+            "stage": list(self.seconds),
+            "calls": list(self.calls.values()),
+            "ms": [s * 1000 for s in self.seconds.values()],
+        })
+        df["share_pct"] = df["ms"] / (total * 1000) * 100
+        return df.round(1)
+
+    def record(self, **extra):
+        return {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "app": self.app,
+            "view": self.view,
+            "total_ms": round((time.perf_counter() - self.start) * 1000, 1),
+            "stages": {k: round(v * 1000, 1) for k, v in self.seconds.items()},
+            **extra,
+        }
+
+    def append_log(self, path=None, **extra):
+        """Append ``record()`` as one JSON line; returns the path written."""
+        path = Path(path or LOG_PATH or DEFAULT_LOG)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(self.record(**extra), default=str) + "\n")
+        return path
+
+
+class _Timed:
+    def __init__(self, timer, obj, stage, methods):
+        self._timer = timer
+        self._obj = obj
+        self._stage = stage
+        self._methods = methods
+
+    def __getattr__(self, name):
+        attr = getattr(self._obj, name)
+        if not callable(attr) or (self._methods is not None and name not in self._methods):
+            return attr
+
+        @functools.wraps(attr)
+        def call(*args, **kwargs):
+            with self._timer.stage(self._stage):
+                return attr(*args, **kwargs)
+        return call
+
+
+def panel(st, timer, **extra):
+    """
+    Draw ``timer``'s stage table in the sidebar (``st`` is the app's streamlit
+    module; this file never imports it) and append the run to the JSON log:
+    every run when ELECTION_PROFILE_LOG is set, otherwise on a button press.
+    ``extra`` fields (backend, ...) go into the log record.
+    """
+    if not timer.enabled:
+        return
+    with st.sidebar.expander("⏱️ Stage timings", expanded=True):
+        report = timer.report()
+        st.caption(f"{timer.view or timer.app}: {report['ms'].sum():.0f} ms timed")
+        st.dataframe(report, hide_index=True)
+        if LOG_PATH:
+            timer.append_log(**extra)
+            st.caption(f"Logged to {LOG_PATH}")
+        elif st.button("Append to JSON log"):
+            st.caption(f"Appended to {timer.append_log(**extra)}")
+
+
+def read_log(path=None):
+    """The JSON log as a frame: one row per run, one ``ms`` column per stage."""
+    rows = [json.loads(line) for line in Path(path or LOG_PATH or DEFAULT_LOG).read_text(encoding="utf-8").splitlines() if line]
+    df = pd.json_normalize(rows)
+    return df.rename(columns=lambda c: c.replace("stages.", "") + "_ms" if c.startswith("stages.") else c)
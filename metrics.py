@@ -0,0 +1,158 @@
+# metrics.py
+"""
+Dashboard metrics in Prometheus text format, for the node_exporter textfile
+collector.
+
+    ELECTION_METRICS_DIR=/var/lib/node_exporter/textfile streamlit run streamlit.py
+
+Each app process keeps, across reruns and sessions:
+
+- ``election_rerun_duration_seconds``: a histogram of script run time per
+  app and view (section number or page), for p95 / p99 queries with
+  ``histogram_quantile``;
+- ``election_cache_requests_total``: calls and misses of cached loaders
+  (``load_data``), labelled ``result="hit"|"miss"``;
+- ``election_dataset_rows``: rows in the loaded dataset;
+- ``election_process_resident_bytes``: the process's resident set size.
+
+Every series carries a ``process`` label, and after every rerun the
+process's metrics are rewritten to ``election_<app>-<process>.prom`` in
+ELECTION_METRICS_DIR (written to a temporary file and renamed, as the
+collector requires). Replicas of one app on a host therefore each keep their
+own file and their counters stay monotonic; sum over ``process`` for the
+app. ``process`` is ELECTION_METRICS_INSTANCE when set (a stable replica
+name, so a restarted replica replaces its file) and the pid otherwise, in
+which case the files of exited processes stay until removed. Without
+ELECTION_METRICS_DIR nothing is recorded. The apps observe every rerun,
+including those cut short by ``st.stop()``.
+"""
+import math
+import os
+import resource
+import threading
+from pathlib import Path
+
+METRICS_DIR = os.environ.get("ELECTION_METRICS_DIR")
+ENABLED = bool(METRICS_DIR)
+# Replica name for the ``process`` label and file name (default: the pid)
+INSTANCE = os.environ.get("ELECTION_METRICS_INSTANCE")
+
+# Upper bounds (seconds) of the rerun duration buckets
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, math.inf)
+
+# Sessions rerun in threads of one process
+_lock = threading.Lock()
+_reruns = {}   # (app, view) -> {"buckets": [...], "sum": s, "count": n}
+_cache = {}    # (app, loader) -> {"calls": n, "misses": n}
+_rows = {}     # app -> rows
+
+
+# -----------------------------
+# Recording
+# -----------------------------
+def cache_call(app, loader):
+    """Count a call of a cached loader (hit or miss)."""
+    if ENABLED:
+        with _lock:
+            _cache.setdefault((app, loader), {"calls": 0, "misses": 0})["calls"] += 1
+
+
+def cache_miss(app, loader):
+    """Count a call that ran the loader's body; call from inside the cached function."""
+    if ENABLED:
+        with _lock:
+            _cache.setdefault((app, loader), {"calls": 0, "misses": 0})["misses"] += 1
+
+
+def observe_rerun(app, view, seconds, rows=None):
+    """Record one script run of ``app`` showing ``view`` and rewrite the app's metrics file."""
+    if not ENABLED:
+        return
+    with _lock:
+        entry = _reruns.setdefault((app, str(view)), {"buckets": [0] * len(BUCKETS), "sum": 0.0, "count": 0})
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                entry["buckets"][i] += 1
+        entry["sum"] += seconds
+        entry["count"] += 1
+        if rows is not None:
+            _rows[app] = rows
+        write(app)
+
+
+def process_label():
+    return INSTANCE or str(os.getpid())
+
+
+def rss_bytes():
+    """Current resident set size (peak RSS where /proc is unavailable)."""
+    try:
+        pages = int(Path("/proc/self/statm").read_text().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # kilobytes on Linux, bytes on macOS
+        return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+# -----------------------------
+# Exposition
+# -----------------------------
+def _labels(**labels):
+    def escape(v):
+        return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{k}="{escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _bound(b):
+    return "+Inf" if math.isinf(b) else repr(b)
+
+
+def render(app):
+    """The Prometheus text exposition of ``app``'s metrics in this process."""
+    process = process_label()
+    lines = [
+        "# HELP election_rerun_duration_seconds Dashboard script run time.",
+        "# TYPE election_rerun_duration_seconds histogram",
+    ]
+    for (a, view), entry in sorted(_reruns.items()):
+        if a != app:
+            continue
+        for bound, n in zip(BUCKETS, entry["buckets"]):
+            lines.append(f"election_rerun_duration_seconds_bucket{_labels(app=a, process=process, view=view, le=_bound(bound))} {n}")
+        lines.append(f"election_rerun_duration_seconds_sum{_labels(app=a, process=process, view=view)} {entry['sum']:.6f}")
+        lines.append(f"election_rerun_duration_seconds_count{_labels(app=a, process=process, view=view)} {entry['count']}")
+
+    lines += [
+        "# HELP election_cache_requests_total Calls of cached loaders by result.",
+        "# TYPE election_cache_requests_total counter",
+    ]
+    for (a, loader), c in sorted(_cache.items()):
+        if a != app:
+            continue
+        lines.append(f"election_cache_requests_total{_labels(app=a, process=process, loader=loader, result='hit')} {c['calls'] - c['misses']}")
+        lines.append(f"election_cache_requests_total{_labels(app=a, process=process, loader=loader, result='miss')} {c['misses']}")
+
+    lines += [
+        "# HELP election_dataset_rows Rows in the loaded dataset.",
+        "# TYPE election_dataset_rows gauge",
+    ]
+    if app in _rows:
+        lines.append(f"election_dataset_rows{_labels(app=app, process=process)} {_rows[app]}")
+
+    lines += [
+        "# HELP election_process_resident_bytes Resident set size of the dashboard process.",
+        "# TYPE election_process_resident_bytes gauge",
+        f"election_process_resident_bytes{_labels(app=app, process=process)} {rss_bytes()}",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def write(app, directory=None):
+    """Atomically rewrite ``election_<app>-<process>.prom`` in ``directory`` (default: ELECTION_METRICS_DIR)."""
+    directory = Path(directory or METRICS_DIR)
+    path = directory / f"election_{Path(app).stem}-{process_label()}.prom"
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(render(app), encoding="utf-8")
+    os.replace(tmp, path)
+    return path
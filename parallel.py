@@ -0,0 +1,200 @@
+# parallel.py
+"""
+State-partitioned grouped sums across a process pool.
+
+    ELECTION_BACKEND=parallel streamlit run streamlit.py
+
+``ParallelBackend`` is the ``group_sum`` engine of backends.py for large
+loads. When it is built, every row is assigned to a shard by ``state``
+(whole states per shard, shards balanced by row count). Each column an
+aggregation touches is factorized once into integer codes and copied into a
+shared-memory block; workers attach to those blocks, so a query ships only
+block names and shard bounds to the pool. Each worker sums its shard by
+key codes and returns the small partial table; the parent adds the partials
+up and maps codes back to the original values (categoricals stay
+categoricals, in pandas' group order). Sums decompose over any partition,
+so keys that don't include ``state`` are merged correctly too.
+
+Loads under ``min_rows`` rows run the same shard code in-process: for the
+real dataset the pool round trip costs more than the groupby.
+"""
+import os
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory, util
+
+import numpy as np
+import pandas as pd
+
+import data_store
+
+# Below this many rows, shards are summed in the calling process
+MIN_ROWS = 200_000
+
+# Worker-side attachments, by block name
+_attached = {}
+
+
+# -----------------------------
+# Shared arrays
+# -----------------------------
+def _share(arr):
+    """Copy ``arr`` into a new shared-memory block; returns (block, spec)."""
+    arr = np.ascontiguousarray(arr)
+    shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+    np.ndarray(arr.shape, arr.dtype, buffer=shm.buf)[:] = arr
+    return shm, (shm.name, arr.dtype.str, arr.shape)
+
+
+def _view(spec):
+    name, dtype, shape = spec
+    if name not in _attached:
+        _attached[name] = shared_memory.SharedMemory(name=name)
+    return np.ndarray(shape, np.dtype(dtype), buffer=_attached[name].buf)
+
+
+def _detach(names=None):
+    """Close this process's attachments to ``names`` (default: all of them)."""
+    for name in list(_attached if names is None else names):
+        shm = _attached.pop(name, None)
+        if shm is not None:
+            shm.close()
+
+
+def _init_worker():
+    # Pool workers leave through multiprocessing, which skips atexit but
+    # runs its own finalizers, when the pool shuts down
+    util.Finalize(None, _detach, exitpriority=10)
+
+
+def _release(blocks):
+    # Small loads attach in the calling process too (see _map)
+    _detach([shm.name for shm in blocks])
+    for shm in blocks:
+        shm.close()
+        shm.unlink()
+
+
+# -----------------------------
+# Worker
+# -----------------------------
+def _partial(task):
+    """Sums of one shard: a frame of key codes and summed values."""
+    order, lo, hi, keys, values, where = task
+    rows = _view(order)[lo:hi]
+    if where:
+        keep = np.ones(len(rows), dtype=bool)
+        for spec, allowed in where:
+            keep &= np.isin(_view(spec)[rows], allowed)
+        rows = rows[keep]
+
+    codes = {f"k{i}": _view(spec)[rows] for i, spec in enumerate(keys)}
+    present = np.all([c >= 0 for c in codes.values()], axis=0) if codes else slice(None)
+    frame = pd.DataFrame({**codes, **{f"v{i}": _view(spec)[rows] for i, spec in enumerate(values)}})
+    return frame[present].groupby(list(codes), sort=False).sum().reset_index()
+
+
+# -----------------------------
+# Backend
+# -----------------------------
+class ParallelBackend:
+    name = "parallel"
+
+    def __init__(self, df, workers=None, partition="state", min_rows=MIN_ROWS):
+        self.df = df
+        self.workers = workers or os.cpu_count() or 1
+        self.min_rows = min_rows
+        self._columns = {}
+        self._blocks = []
+        self._pool = None
+        self._finalizer = weakref.finalize(self, _release, self._blocks)
+
+        # Rows ordered by shard; shard i is order[bounds[i]:bounds[i + 1]]
+        part = self._factorized(partition)["codes"]
+        sizes = np.bincount(part[part >= 0], minlength=len(self._columns[partition]["uniques"]))
+        n_shards = min(self.workers * 2, max(len(sizes), 1)) if len(df) >= min_rows else 1
+        shard_of = np.zeros(len(sizes), dtype=np.int32)
+        load = np.zeros(n_shards, dtype=np.int64)
+        for state in np.argsort(sizes, kind="stable")[::-1]:
+            shard_of[state] = np.argmin(load)
+            load[shard_of[state]] += sizes[state]
+        row_shard = np.where(part >= 0, shard_of[np.maximum(part, 0)], 0)
+        order = np.argsort(row_shard, kind="stable").astype(np.int64)
+        self._bounds = np.searchsorted(row_shard[order], np.arange(n_shards + 1))
+        self._order = self._shared(order)
+
+    def _shared(self, arr):
+        shm, spec = _share(arr)
+        self._blocks.append(shm)
+        return spec
+
+    def _factorized(self, col):
+        """Codes of ``col`` (in pandas' group order) and their values, shared once per column."""
+        if col not in self._columns:
+            s = self.df[col]
+            if isinstance(s.dtype, pd.CategoricalDtype):
+                codes, uniques = s.cat.codes.to_numpy(), s.cat.categories
+            else:
+                codes, uniques = pd.factorize(s, sort=True)
+            codes = codes.astype(np.int32)
+            self._columns[col] = {"codes": codes, "uniques": uniques, "spec": self._shared(codes)}
+        return self._columns[col]
+
+    def _value_spec(self, col):
+        """Values of numeric ``col`` as a plain NumPy array, missing values as 0 (as pandas sums them)."""
+        key = ("value", col)
+        if key not in self._columns:
+            s = self.df[col]
+            if not pd.api.types.is_numeric_dtype(s):
+                raise TypeError(f"can't sum column {col!r} of dtype {s.dtype}")
+            dtype = getattr(s.dtype, "numpy_dtype", s.dtype)
+            self._columns[key] = self._shared(s.to_numpy(dtype=dtype, na_value=0))
+        return self._columns[key]
+
+    def _where(self, where):
+        out = []
+        for col, selected in (where or {}).items():
+            entry = self._factorized(col)
+            allowed = entry["uniques"].get_indexer(pd.Index(list(selected)))
+            out.append((entry["spec"], allowed[allowed >= 0].astype(np.int32)))
+        return out
+
+    def _map(self, tasks):
+        if len(tasks) == 1 or len(self.df) < self.min_rows:
+            return [_partial(t) for t in tasks]
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        return list(self._pool.map(_partial, tasks))
+
+    def group_sum(self, keys, values, where=None):
+        """Sum of ``values`` per ``keys`` over rows matching ``where`` ({column: allowed values})."""
+        keys, values = list(keys), list(values)
+        key_specs = [self._factorized(k)["spec"] for k in keys]
+        value_specs = [self._value_spec(v) for v in values]
+        where = self._where(where)
+        tasks = [
+            (self._order, lo, hi, key_specs, value_specs, where)
+            for lo, hi in zip(self._bounds[:-1], self._bounds[1:])
+        ]
+        names = [f"k{i}" for i in range(len(keys))]
+        merged = pd.concat(self._map(tasks), ignore_index=True).groupby(names, sort=True).sum()
+
+        codes = merged.index.to_frame(index=False) if len(keys) > 1 else pd.DataFrame({"k0": merged.index})
+        levels = []
+        for name, k in zip(names, keys):
+            entry = self._columns[k]
+            c = codes[name].to_numpy()
+            if isinstance(self.df[k].dtype, pd.CategoricalDtype):
+                levels.append(pd.Categorical.from_codes(c, dtype=self.df[k].dtype))
+            else:
+                levels.append(entry["uniques"].take(c))
+        index = pd.MultiIndex.from_arrays(levels, names=keys) if len(keys) > 1 else pd.Index(levels[0], name=keys[0])
+        out = pd.DataFrame(merged.to_numpy(), index=index, columns=values)
+        # Integer sums are int64 whatever the column width
+        return data_store.widen_sums(out, self.df.dtypes)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        self._finalizer()
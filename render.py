@@ -0,0 +1,116 @@
+# render.py
+"""
+Bounded-size Plotly figures for views whose row count grows with the data.
+
+A figure's JSON carries every point or bar it draws, so a chart built
+straight from per-constituency (or per-booth) rows grows with the dataset
+and eventually stalls the browser. The helpers here cut the data down on
+the server to a point budget before the figure is built:
+
+- ``scatter``: above the budget, one representative row per cell of a
+  2-D grid over (x, y), which keeps the shape of the cloud and its
+  outliers; rows flagged ``keep`` are always drawn. Markers use WebGL
+  (``Scattergl``), which stays responsive well past SVG's limits.
+- ``top_categories``: per group, the largest categories by value, with the
+  rest summed into one "Other" bar, so grouped bars stay bounded by
+  groups x (n + 1).
+- ``sankey``: flows between two sets of categories, each side cut to its
+  largest categories with the rest merged into "Other".
+
+``scatter`` notes in the title how many points it left out; "Other" bars
+carry the left-out totals.
+"""
+import numpy as np
+import pandas as pd
+
+from startup import lazy_import
+
+go = lazy_import("plotly.graph_objects")
+px = lazy_import("plotly.express")
+
+# Most markers / bars a single figure should carry
+POINT_BUDGET = 5000
+OTHER = "Other"
+
+
+# -----------------------------
+# Downsampling
+# -----------------------------
+def grid_sample(df, x, y, budget=POINT_BUDGET, keep=None):
+    """At most ~``budget`` rows of ``df``: the first row in each cell of a grid over (x, y), plus ``keep`` rows."""
+    if len(df) <= budget:
+        return df
+    keep = np.zeros(len(df), dtype=bool) if keep is None else np.asarray(keep, dtype=bool)
+    side = max(int(np.sqrt(max(budget - keep.sum(), 1))), 1)
+
+    def cells(col):
+        v = df[col].to_numpy(dtype=float)
+        lo, hi = np.nanmin(v), np.nanmax(v)
+        span = hi - lo if hi > lo else 1.0
+        return np.clip(((v - lo) / span * side).astype(np.int64), 0, side - 1)
+
+    cell = cells(x) * side + cells(y)
+    first = np.zeros(len(df), dtype=bool)
+    first[np.unique(cell, return_index=True)[1]] = True
+    return df[first | keep]
+
+
+def top_categories(df, group, category, value, n):
+    """Per ``group`` (a column or list), the ``n`` largest ``category`` rows by ``value``; the rest summed as "Other"."""
+    groups = [group] if isinstance(group, str) else list(group)
+    order = dict(by=groups + [value], ascending=[True] * len(groups) + [False])
+    df = df.sort_values(**order)
+    rank = df.groupby(groups, observed=True).cumcount()
+    top = df[rank < n]
+    rest = df[rank >= n]
+    if rest.empty:
+        return top
+    other = rest.groupby(groups, as_index=False, observed=True)[value].sum()
+    other[category] = OTHER
+    out = pd.concat([top.astype({category: str}), other], ignore_index=True)
+    return out.sort_values(**order, ignore_index=True)
+
+
+def categories_within(budget, n_groups):
+    """Categories per group (besides "Other") that keep ``n_groups`` groups under ``budget`` bars."""
+    return max(budget // max(n_groups, 1) - 1, 1)
+
+
+# -----------------------------
+# Figures
+# -----------------------------
+def scatter(df, x, y, budget=POINT_BUDGET, keep=None, title=None, **kwargs):
+    """WebGL ``px.scatter`` of ``df`` thinned to ``budget`` points (``keep`` rows always drawn)."""
+    shown = grid_sample(df, x, y, budget, keep)
+    if len(shown) < len(df):
+        title = f"{title or ''} (showing {len(shown):,} of {len(df):,} points)".strip()
+    return px.scatter(shown, x=x, y=y, title=title, render_mode="webgl", **kwargs)
+
+
+def sankey(flows, source, target, value, n=15, sides=None, title=None):
+    """
+    Sankey of ``value`` from ``source`` to ``target`` categories (one row per
+    pair). Each side keeps its ``n`` largest categories; the rest flow
+    through one "Other" node. Nodes are ranked by total and labelled
+    "<category> (<side>)", ``sides`` defaulting to the two column names.
+    """
+    flows = flows[[source, target, value]].astype({source: object, target: object})
+    for col in (source, target):
+        top = flows.groupby(col)[value].sum().nlargest(n).index
+        flows[col] = flows[col].where(flows[col].isin(top), OTHER)
+    flows = flows.groupby([source, target], as_index=False)[value].sum()
+    flows = flows[flows[value] > 0]
+
+    left = flows.groupby(source)[value].sum().sort_values(ascending=False).index.tolist()
+    right = flows.groupby(target)[value].sum().sort_values(ascending=False).index.tolist()
+    sides = sides or (source, target)
+    fig = go.Figure(go.Sankey(
+        node=dict(label=[f"{c} ({sides[0]})" for c in left] + [f"{c} ({sides[1]})" for c in right], pad=12),
+        link=dict(
+            source=flows[source].map({c: i for i, c in enumerate(left)}).tolist(),
+            target=flows[target].map({c: i + len(left) for i, c in enumerate(right)}).tolist(),
+            value=flows[value].tolist(),
+        ),
+    ))
+    fig.update_layout(title=title, height=max(450, 22 * max(len(left), len(right))))
+    return fig
@@ -0,0 +1,299 @@
+# report.py
+"""
+Export the dashboard answers and page charts as one offline HTML report.
+
+    python report.py                              # every pair + earliest vs latest
+    python report.py --pair 2014 2019 --workers 4 --out report.html
+
+The report holds every section of streamlit.py (sections.py) for each pair
+of elections, section 7 for every state, sections 8 / 9 for the default
+parties and section 18 for every zone, followed by the candidate dashboard
+pages of streamlit2.py (charts.py) over all years, states and parties. The
+Candidate Comparison page is driven by the sidebar's candidate pick and is
+left out.
+
+Each part is a task in a process pool that builds its tables and figures and
+returns them as an HTML fragment. The parent assembles the fragments in plan
+order under a single inline copy of plotly.js, so the file opens without a
+network connection. Workers read the memory-mapped Arrow caches the parent
+built before starting the pool (under fork they inherit the parent's open
+datasets); no worker parses the source CSVs.
+"""
+import argparse
+import html
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+import analyses
+import backends
+import batch
+import charts
+import data_store
+import dims
+import sections
+import snapshot
+from analyses import AnalysisStore
+from elections import ElectionSet
+from startup import lazy_import
+
+pio = lazy_import("plotly.io")
+plotly_offline = lazy_import("plotly.offline")
+
+_store = None
+_candidates = None
+
+
+def dashboard_store():
+    """Memoized analyses over the streamlit.py dataset, one per process."""
+    global _store
+    if _store is None:
+        _store = AnalysisStore(batch.load_elections(), data_store.dataset_version())
+    return _store
+
+
+def candidate_elections():
+    """The streamlit2.py dataset as an ElectionSet, one per process."""
+    global _candidates
+    if _candidates is None:
+        df = data_store.load_results(mapped=True)
+        _candidates = ElectionSet(df, backend=backends.create(df, dataset="results"))
+    return _candidates
+
+
+# -----------------------------
+# Candidate dashboard pages (streamlit2.py, no filters)
+# -----------------------------
+def statewise_page(years):
+    fig_bar, fig_pie = charts.statewise(analyses.state_votes(candidate_elections(), years), years)
+    return [("header", "📈 Statewise Votes"), ("subheader", "📊 Total Votes by State - Bar chart"), ("figure", fig_bar),
+            ("subheader", "🥧 Vote Share by State — Pie Chart"), ("figure", fig_pie)]
+
+
+def party_page(years):
+    trend_data = analyses.party_votes(candidate_elections(), years)
+    trend_data = trend_data[trend_data["party"].isin(batch.DEFAULT_PARTIES)]
+    bar_data = (
+        trend_data.groupby("party", as_index=False, observed=True)["total_votes"]
+        .sum()
+        .sort_values("total_votes", ascending=False)
+    )
+    fig_bar, fig_line, fig_pie = charts.party_performance(trend_data, bar_data, years)
+    return [("header", f"🏙️ Party Performance ({', '.join(batch.DEFAULT_PARTIES)})"), ("figure", fig_bar),
+            ("subheader", "📈 Party vote Trends"), ("figure", fig_line),
+            ("subheader", "🥧 Party Vote Share (Selected Parties Only)"), ("figure", fig_pie)]
+
+
+def party_state_page(years):
+    backend = candidate_elections().backend
+    state_party = backend.group_sum(["state", "party"], ["total_votes"], {"year": years}).reset_index()
+    year_state_party = backend.group_sum(["year", "state", "party"], ["total_votes"], {"year": years}).reset_index()
+    return [("header", "📊 Party-State Insights"),
+            ("figure", charts.party_state_treemap(state_party)),
+            ("figure", charts.party_state_bar(state_party)),
+            ("figure", charts.party_state_sunburst(year_state_party))]
+
+
+def turnout_page(years):
+    fig_bar = charts.state_turnout(analyses.state_turnout_pct(candidate_elections()))
+    return [("header", f"🗳️ Voter Turnout (%) Comparison by State — {' vs '.join(map(str, years))}"),
+            ("figure", fig_bar)]
+
+
+def top_candidates_page(years):
+    top = analyses.state_top_candidates(candidate_elections(), 5, year=years)
+    fig_bar, fig_pie = charts.top_candidates(top, years)
+    return [("header", "🎯 Top 5 Candidates by State (Overall)"), ("figure", fig_bar),
+            ("subheader", "🥧 Party-wise Vote Share among Top Candidates"), ("figure", fig_pie)]
+
+
+def turnout_change_page(y0, y1):
+    pivot_df = analyses.state_turnout_pct_change(candidate_elections(), y0, y1)
+    fig_up, fig_down, summary = charts.turnout_change(pivot_df, y0, y1)
+    return [("header", f"📈 Turnout Change Analysis ({y0} → {y1})"),
+            ("figure", fig_up), ("figure", fig_down), ("info", summary)]
+
+
+PAGES = {
+    "statewise": statewise_page,
+    "party": party_page,
+    "party_state": party_state_page,
+    "turnout": turnout_page,
+    "top_candidates": top_candidates_page,
+    "turnout_change": turnout_change_page,
+}
+
+
+# -----------------------------
+# Planning
+# -----------------------------
+def plan(pairs=None):
+    """Report parts in order: dashboard sections per pair, then the candidate dashboard pages."""
+    es = batch.load_elections()
+    pairs = pairs or snapshot.default_pairs(es)
+    tasks = []
+    for y0, y1 in pairs:
+        for number in sorted({*sections.SECTIONS, 7, 8, 9}):
+            if number == 7:
+                states = dashboard_store().run('state_party_share', y0=y0, y1=y1)['state_name'].unique()
+                tasks += [("state_share", y0, y1, state) for state in sorted(states)]
+            elif number in (8, 9):
+                tasks.append(("party_changes", y0, y1, batch.DEFAULT_PARTIES, number == 8))
+            else:
+                tasks.append(("section", number, y0, y1))
+            if number == 18:
+                tasks += [("seat_zone", y0, y1, zone) for zone in dims.ZONES]
+
+    years = candidate_elections().years
+    tasks += [("page", name, (years,)) for name in PAGES if name != "turnout_change"]
+    tasks += [("page", "turnout_change", pair) for pair in candidate_elections().pairs()]
+    return tasks
+
+
+def build_blocks(task):
+    kind, *args = task
+    store = dashboard_store()
+    if kind == "section":
+        number, y0, y1 = args
+        return sections.SECTIONS[number](store, y0, y1)
+    if kind == "state_share":
+        y0, y1, state = args
+        return [("header", f"State Level Party Vote Share Comparison ({y0} vs {y1}) — {state}")] + \
+            sections.state_share(store, y0, y1, state)
+    if kind == "party_changes":
+        y0, y1, parties, gains = args
+        title = "Gaining" if gains else "Losing"
+        return [("header", f"Top Constituencies {title} Votes (Major Parties, {y0} → {y1})")] + \
+            sections.party_changes(store, y0, y1, list(parties), gains)
+    if kind == "seat_zone":
+        y0, y1, zone = args
+        return sections.seat_gains(store, y0, y1, zone=zone)
+    name, params = args
+    return PAGES[name](*params)
+
+
+# -----------------------------
+# HTML
+# -----------------------------
+def _table(df):
+    if isinstance(df, pd.Series):
+        df = df.to_frame()
+    return df.to_html(classes="table", border=0, float_format=lambda v: f"{v:,.2f}", na_rep="")
+
+
+def _markdown(text):
+    if text.strip() == "---":
+        return "<hr>"
+    level = len(text) - len(text.lstrip("#"))
+    if level and text[level:level + 1] == " ":
+        return f"<h{level}>{html.escape(text[level + 1:])}</h{level}>"
+    return f"<p>{html.escape(text)}</p>"
+
+
+def blocks_html(blocks):
+    out = []
+    for kind, *args in blocks:
+        if kind == "columns":
+            cols = "".join(f'<div class="col">{blocks_html(col)}</div>' for col in args[0])
+            out.append(f'<div class="columns">{cols}</div>')
+        elif kind == "figure":
+            out.append(pio.to_html(args[0], full_html=False, include_plotlyjs=False))
+        elif kind == "dataframe":
+            out.append(_table(args[0]))
+        elif kind == "header":
+            out.append(f"<h2>{html.escape(args[0])}</h2>")
+        elif kind == "subheader":
+            out.append(f"<h3>{html.escape(args[0])}</h3>")
+        elif kind == "markdown":
+            out.append(_markdown(args[0]))
+        elif kind in ("warning", "info"):
+            out.append(f'<div class="{kind}">{html.escape(str(args[0]))}</div>')
+        else:  # write
+            out.append("".join(_table(a) if isinstance(a, (pd.DataFrame, pd.Series)) else
+                               f"<p>{html.escape(str(a))}</p>" for a in args))
+    return "\n".join(out)
+
+
+def render_task(task):
+    """(title, HTML fragment) of one report part."""
+    blocks = build_blocks(task)
+    title = next((args[0] for kind, *args in blocks if kind == "header"), str(task))
+    return title, blocks_html(blocks)
+
+
+STYLE = """
+body {font-family: sans-serif; margin: 2em auto; max-width: 1400px; color: #222;}
+h1 {border-bottom: 2px solid #ddd;}
+section {border-top: 1px solid #ddd; padding: 1em 0;}
+.columns {display: flex; gap: 2em;} .col {flex: 1; min-width: 0;}
+.table {border-collapse: collapse; font-size: 0.85em; margin: 0.5em 0;}
+.table th, .table td {padding: 2px 8px; border-bottom: 1px solid #eee; text-align: right;}
+.warning {background: #fff4e5; padding: 0.5em;} .info {background: #e8f1fb; padding: 0.5em;}
+nav li {font-size: 0.9em;}
+"""
+
+
+def assemble(parts, meta):
+    toc = "\n".join(f'<li><a href="#part-{i}">{html.escape(title)}</a></li>' for i, (title, _) in enumerate(parts))
+    body = "\n".join(f'<section id="part-{i}">\n{fragment}\n</section>' for i, (_, fragment) in enumerate(parts))
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Lok Sabha Election Analysis Report</title>
+<style>{STYLE}</style>
+<script type="text/javascript">{plotly_offline.get_plotlyjs()}</script>
+</head>
+<body>
+<h1>Lok Sabha Election Analysis Report</h1>
+<p>Dataset {html.escape(meta['dataset_version'])}, built {meta['built']}.</p>
+<nav><ol>
+{toc}
+</ol></nav>
+{body}
+</body>
+</html>
+"""
+
+
+# -----------------------------
+# Runner
+# -----------------------------
+def export(out="report.html", pairs=None, workers=None):
+    workers = workers or os.cpu_count() or 1
+    t = time.perf_counter()
+    # Build the caches once and open them here: workers map the same files
+    # (and inherit these objects under fork) instead of re-reading the data
+    tasks = plan(pairs)
+
+    if workers == 1:
+        parts = [render_task(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(render_task, tasks))
+
+    meta = {"dataset_version": data_store.dataset_version(), "built": time.strftime("%Y-%m-%d %H:%M:%S")}
+    Path(out).write_text(assemble(parts, meta), encoding="utf-8")
+    return {"parts": len(parts), "workers": workers, "seconds": round(time.perf_counter() - t, 3),
+            "bytes": Path(out).stat().st_size}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pair", nargs=2, type=int, action="append", metavar=("Y0", "Y1"),
+                        help="compare this pair of elections (repeatable; default: consecutive pairs and earliest vs latest)")
+    parser.add_argument("--out", default="report.html")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count; 1 runs inline)")
+    args = parser.parse_args(argv)
+
+    pairs = [tuple(p) for p in args.pair] if args.pair else None
+    summary = export(args.out, pairs, args.workers)
+    print(f"Wrote {summary['parts']} parts in {summary['seconds']:.2f}s "
+          f"({summary['bytes'] / 1e6:.1f} MB) -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,600 @@
+# sections.py
+"""
+The fixed sections of streamlit.py as functions that return what to draw.
+
+A section is ``fn(analyses, y0, y1)`` over an ``AnalysisStore`` and returns
+a list of blocks, ``(kind, *args)``: ``kind`` names the Streamlit call
+(``header``, ``subheader``, ``dataframe``, ``markdown``, ``warning``,
+``info``, ``write``), or is ``"figure"`` (a Plotly figure) or
+``"columns"`` (a list of block lists, one per column). Building a section
+never touches Streamlit, so snapshot.py can precompute it and the app
+draws precomputed and live sections the same way.
+
+Sections whose widgets take parameters (7, 8 and 9) are not registered:
+``state_share`` and ``party_changes`` build their body for a given state or
+party list, and streamlit.py draws the header and the widget around it.
+Section 18 is registered for the whole country; streamlit.py calls it with
+``state=`` or ``zone=`` to drill down.
+"""
+import pandas as pd
+
+import render
+from analyses import transition_flows
+from startup import lazy_import
+
+px = lazy_import("plotly.express")
+
+SECTIONS = {}
+
+
+def section(number):
+    """Register ``fn(analyses, y0, y1)`` as section ``number``."""
+    def register(fn):
+        SECTIONS[number] = fn
+        return fn
+    return register
+
+
+# ---------------------------------------------------------
+# 1. Top/Bottom Constituencies Turnout
+# ---------------------------------------------------------
+@section(1)
+def constituency_turnout(analyses, y0, y1):
+    blocks = [("header", f"Top & Bottom Constituencies by Voter Turnout ({y0} & {y1})")]
+    for year in [y0, y1]:
+        ranked = analyses.run('constituency_turnout', year=year)
+        top = ranked['top']
+        bottom = ranked['bottom']
+        fig = px.bar(top.head(10).sort_values('turnout'), x='turnout', y='pc_name', orientation='h',
+                     title=f'{year} Top Constituencies by Turnout')
+        fig2 = px.bar(bottom.head(10).sort_values('turnout', ascending=True), x='turnout', y='pc_name', orientation='h',
+                      title=f'{year} Bottom Constituencies by Turnout')
+        blocks.append(("columns", [
+            [
+                ("subheader", f"{year} — Top 10 by Turnout"),
+                ("dataframe", top[['pc_name', 'state_name', 'turnout']].reset_index(drop=True)),
+                ("figure", fig),
+            ],
+            [
+                ("subheader", f"{year} — Bottom 10 by Turnout"),
+                ("dataframe", bottom[['pc_name', 'state_name', 'turnout']].reset_index(drop=True)),
+                ("figure", fig2),
+            ],
+        ]))
+        if year == y0:
+            blocks.append(("markdown", "---"))
+    return blocks
+
+
+# ---------------------------------------------------------
+# 2. Top/Bottom States Turnout
+# ---------------------------------------------------------
+@section(2)
+def state_turnout(analyses, y0, y1):
+    blocks = [("header", f"Top & Bottom States by Average Voter Turnout ({y0} & {y1})")]
+    for year in [y0, y1]:
+        state_turnout_year = analyses.run('state_turnout', year=year)
+        fig = px.bar(state_turnout_year.tail(20).reset_index(), x='state_name', y='turnout', title=f'{year} Average Turnout by State')
+        blocks += [
+            ("subheader", f"{year} — Top 10"),
+            ("dataframe", state_turnout_year.tail(10).reset_index().rename(columns={'turnout': 'avg_turnout'})),
+            ("figure", fig),
+        ]
+    return blocks
+
+
+def _seat_counts(analyses, y0, y1, **scope):
+    """(seats retained by the same party, seats compared) from the transition matrix."""
+    flows = transition_flows(analyses.run('seat_transitions', y0=y0, y1=y1, **scope))
+    retained = flows.loc[flows[f'party_{y0}'] == flows[f'party_{y1}'], 'seats'].sum()
+    return retained, flows['seats'].sum()
+
+
+# ---------------------------------------------------------
+# 3. Same Party Constituencies
+# ---------------------------------------------------------
+@section(3)
+def same_party(analyses, y0, y1):
+    blocks = [("header", f"🏆 Constituencies Electing the Same Party in {y0} & {y1}")]
+
+    # Same-party constituencies, ranked by the winning party's vote % in the later election
+    ranked = analyses.run('same_party', y0=y0, y1=y1)
+
+    if ranked.empty:
+        return blocks + [("warning", "⚠️ No constituencies found where the same party won in both elections.")]
+
+    fig = px.bar(
+        ranked.head(10),
+        x=f'vote_pct_{y1}',
+        y='pc_name',
+        color=f'party_{y1}',
+        orientation='h',
+        title=f'Top 10 Same-Party Wins ({y0} → {y1})',
+        text=f'vote_pct_{y1}'
+    )
+    fig.update_traces(texttemplate='%{text:.1f}%', textposition='outside')
+    retained, total = _seat_counts(analyses, y0, y1)
+    return blocks + [
+        ("markdown", f"{retained} of {total} constituencies contested in both elections re-elected the same party."),
+        ("subheader", f"Top 10 — Highest {y1} Vote % (Same Party Wins {y0} & {y1})"),
+        ("columns", [
+            [("dataframe", ranked.head(10).round(2).reset_index(drop=True))],
+            [("figure", fig)],
+        ]),
+    ]
+
+
+# ---------------------------------------------------------
+# 4. Party Switch Constituencies (Enhanced)
+# ---------------------------------------------------------
+@section(4)
+def party_switch(analyses, y0, y1):
+    blocks = [("header", f"🔄 Constituencies Voting for Different Parties ({y0} vs {y1})")]
+
+    # Different-party constituencies, ranked by the absolute difference in winner vote %
+    ranked_diff = analyses.run('party_switch', y0=y0, y1=y1)
+
+    if ranked_diff.empty:
+        return blocks + [("warning", "⚠️ No constituencies found where different parties won in the two elections.")]
+
+    fig = px.bar(
+        ranked_diff.head(10),
+        x='vote_pct_diff',
+        y='pc_name',
+        color=f'party_{y1}',
+        title=f'Top 10 Constituencies by Vote % Difference ({y0} vs {y1})',
+        orientation='h'
+    )
+    retained, total = _seat_counts(analyses, y0, y1)
+    return blocks + [
+        ("markdown", f"{total - retained} of {total} constituencies contested in both elections changed party."),
+        ("subheader", "Top 10 — Largest Vote % Difference (Different Party Wins)"),
+        ("columns", [
+            [("dataframe", ranked_diff.head(10).round(2).reset_index(drop=True))],
+            [("figure", fig)],
+        ]),
+    ]
+
+
+# ---------------------------------------------------------
+# 5. Top Candidates by Margin Difference
+# ---------------------------------------------------------
+@section(5)
+def margin_change(analyses, y0, y1):
+    top_margin_diff = analyses.run('margin_change', y0=y0, y1=y1)
+    fig = px.bar(top_margin_diff.sort_values('margin_diff'), x='margin_diff', y='pc_name', orientation='h',
+                 title=f'Top Constituencies with Increase in Winning Margin ({y0}→{y1})')
+    return [
+        ("header", f"Top Candidates by Margin Difference ({y0} vs {y1})"),
+        ("dataframe", top_margin_diff),
+        ("figure", fig),
+    ]
+
+
+# ---------------------------------------------------------
+# 6. National Party Vote Share Comparison
+# ---------------------------------------------------------
+@section(6)
+def national_share(analyses, y0, y1):
+    vote_share_df = analyses.run('national_share', y0=y0, y1=y1)
+    fig = px.bar(vote_share_df, x='party', y=[f'{y0}_pct', f'{y1}_pct'], barmode='group', title="Party Vote Shares Nationally (%)")
+    return [
+        ("header", f"National Level Vote Share Comparison ({y0} vs {y1})"),
+        ("dataframe", vote_share_df[['party', f'{y0}_pct', f'{y1}_pct']].head(30).round(2)),
+        ("figure", fig),
+    ]
+
+
+# ---------------------------------------------------------
+# 7. State Party Vote Share Comparison (per state)
+# ---------------------------------------------------------
+def state_share(analyses, y0, y1, state):
+    filtered = analyses.run('state_party_share', y0=y0, y1=y1)
+    state_data = filtered[filtered['state_name'] == state].sort_values(f'vote_share_{y1}', ascending=False)
+    fig = px.bar(state_data, x='party', y=[f'vote_share_{y0}', f'vote_share_{y1}'], barmode='group',
+                 title=f"Party Vote Share in {state} ({y0} vs {y1}) (%)")
+    return [
+        ("dataframe", state_data[['party', f'vote_share_{y0}', f'vote_share_{y1}']].reset_index(drop=True).round(2)),
+        ("figure", fig),
+    ]
+
+
+# ---------------------------------------------------------
+# 8 / 9. Top Constituencies Gaining / Losing Votes (per party)
+# ---------------------------------------------------------
+def party_changes(analyses, y0, y1, parties, gains=True):
+    changes = analyses.run('party_vote_changes', y0=y0, y1=y1, parties=parties, gains=gains)
+    label = "Gains" if gains else "Losses"
+    blocks = []
+    for party in parties:
+        party_df = changes[party]
+        fig = px.bar(party_df.sort_values('vote_diff'), x='vote_diff', y='pc_name', orientation='h', title=f"{party} — Top 10 {label} ({y0}→{y1})")
+        blocks += [
+            ("subheader", f"{party} — Top {label}"),
+            ("dataframe", party_df[['pc_name', f'total_votes_{y0}', f'total_votes_{y1}', 'vote_diff']]),
+            ("figure", fig),
+        ]
+    return blocks
+
+
+# ---------------------------------------------------------
+# 10. Constituency with Highest NOTA Votes
+# ---------------------------------------------------------
+@section(10)
+def nota_top(analyses, y0, y1):
+    top5 = analyses.run('nota_top', y0=y0, y1=y1)
+    fig = px.bar(top5, x='pc_name', y=[f'nota_{y0}', f'nota_{y1}'], barmode='group', title=f'NOTA Votes by Constituency ({y0} vs {y1})')
+    return [
+        ("header", f"Constituency with Highest NOTA Votes ({y0} & {y1})"),
+        ("dataframe", top5),
+        ("figure", fig),
+    ]
+
+
+# ---------------------------------------------------------
+# 11. Candidates from Parties <10% State Vote Share
+# ---------------------------------------------------------
+@section(11)
+def low_share_winners(analyses, y0, y1):
+    result = analyses.run('low_share_winners', year=y1)
+    fig = px.bar(result.groupby('state_name', observed=True).size().reset_index(name='count'), x='state_name', y='count', title=f'How Many Winners belong to <10% State Parties ({y1})')
+    return [
+        ("header", f"Candidates from Parties with <10% State Vote Share ({y1})"),
+        ("dataframe", result.sort_values(['state_name', 'pc_name']).reset_index(drop=True)),
+        ("figure", fig),
+    ]
+
+
+# ---------------------------------------------------------
+# 12. States Highest Increase in Turnout
+# ---------------------------------------------------------
+@section(12)
+def turnout_increase(analyses, y0, y1):
+    inc = analyses.run('state_turnout_change', y0=y0, y1=y1)
+    top5 = inc.sort_values('change', ascending=False).head(10)
+    fig = px.bar(top5, x='state_name', y='change', title=f'States with Highest Increase in Turnout ({y0}→{y1})')
+    return [
+        ("header", f"States with Highest Increase in Turnout ({y0} → {y1})"),
+        ("dataframe", top5.round(2)),
+        ("figure", fig),
+    ]
+
+
+# ---------------------------------------------------------
+# 13. States Largest Decline in Turnout
+# ---------------------------------------------------------
+@section(13)
+def turnout_decline(analyses, y0, y1):
+    # Average turnout per state for both years, and the change (negative = decline)
+    dec = analyses.run('state_turnout_change', y0=y0, y1=y1)
+
+    # Sort by largest decline (most negative change)
+    top10_decline = dec.sort_values('change', ascending=True).head(10).reset_index(drop=True)
+
+    # Horizontal bar chart (largest decline on top)
+    fig = px.bar(
+        top10_decline.sort_values('change', ascending=True),
+        x='change',
+        y='state_name',
+        orientation='h',
+        text='change',
+        title=f'Top 10 States with Largest Decline in Voter Turnout ({y0} → {y1})',
+    )
+    fig.update_traces(texttemplate='%{text:.2f}', textposition='outside')
+    fig.update_layout(yaxis={'categoryorder': 'total ascending'})  # biggest decline at top
+
+    return [
+        ("header", f"📉 States with Largest Decline in Turnout ({y0} → {y1})"),
+        ("dataframe", top10_decline.round(2)),
+        ("figure", fig),
+    ]
+
+
+# ---------------------------------------------------------
+# 14. Most Competitive Elections (Smallest Winning Margins)
+# ---------------------------------------------------------
+@section(14)
+def competitive(analyses, y0, y1):
+    blocks = [("header", "⚔️ Most Competitive Elections (Smallest Winning Margins)")]
+
+    # Smallest winner vs runner-up margins on general (EVM) votes, NOTA counted,
+    # from each election's candidate rows (analyses.competitive)
+    for year in [y0, y1]:
+        blocks += [
+            ("subheader", f"Top 10 Most Competitive Constituencies ({year})"),
+            ("dataframe", analyses.run('competitive', year=year).rename(columns={
+                'state_name': 'State',
+                'pc_name': 'Constituency',
+                'candidate': 'Winning Candidate',
+                'party': 'Party',
+                'margin': 'Winning Margin (Votes)'
+            })),
+        ]
+
+    # Visualization for the later election
+    fig = px.bar(
+        analyses.run('competitive', year=y1).sort_values('margin', ascending=True),
+        x='margin',
+        y='pc_name',
+        color='party',
+        orientation='h',
+        title=f'Top 10 Most Competitive Constituencies ({y1})',
+        hover_data=['state_name', 'candidate', 'party']
+    )
+    fig.update_layout(
+        xaxis_title='Winning Margin (Votes)',
+        yaxis_title='Constituency',
+        yaxis={'categoryorder': 'total ascending'}
+    )
+    return blocks + [("figure", fig)]
+
+
+# ---------------------------------------------------------
+# 15. Largest Shift in Vote Share by Constituency
+# ---------------------------------------------------------
+@section(15)
+def share_shift(analyses, y0, y1):
+    # --- Top 20 biggest shifts, parties that contested the constituency in both years ---
+    top_shift = analyses.run('share_shift', y0=y0, y1=y1)
+
+    # --- Table ---
+    table = (
+        top_shift[['pc_name', 'party', f'share_{y0}', f'share_{y1}', 'vote_share_change']]
+        .round(2)
+        .rename(columns={
+            'pc_name': 'Constituency',
+            'party': 'Party',
+            f'share_{y0}': f'Vote Share {y0} (%)',
+            f'share_{y1}': f'Vote Share {y1} (%)',
+            'vote_share_change': f'Change ({y1}−{y0})'
+        })
+    )
+
+    # --- 📊 Grouped Bar Chart for both years ---
+    plot_data = pd.melt(
+        top_shift,
+        id_vars=['pc_name', 'party'],
+        value_vars=[f'share_{y0}', f'share_{y1}'],
+        var_name='Year',
+        value_name='Vote Share (%)'
+    )
+
+    # Clean year labels
+    plot_data['Year'] = plot_data['Year'].replace({f'share_{y0}': str(y0), f'share_{y1}': str(y1)})
+
+    fig = px.bar(
+        plot_data,
+        x='pc_name',
+        y='Vote Share (%)',
+        color='Year',
+        barmode='group',
+        facet_col='party',
+        facet_col_wrap=2,
+        title=f'Top 20 Constituencies — Party Vote Share Comparison ({y0} vs {y1})',
+        hover_data=['party']
+    )
+
+    fig.update_layout(
+        showlegend=True,
+        xaxis_title="Constituency",
+        yaxis_title="Vote Share (%)",
+        height=800
+    )
+
+    # --- Optional: Highlight change separately ---
+    fig_change = px.bar(
+        top_shift.sort_values('vote_share_change'),
+        x='vote_share_change',
+        y='pc_name',
+        color='party',
+        orientation='h',
+        title=f'Change in Vote Share ({y1}−{y0})',
+        hover_data=['party', f'share_{y0}', f'share_{y1}']
+    )
+
+    return [
+        ("header", "📊 Largest Shift in Vote Share by Constituency (Any Party)"),
+        ("subheader", "Top 20 Constituencies with Largest Vote Share Change"),
+        ("dataframe", table),
+        ("subheader", f"Vote Share Comparison: {y0} vs {y1}"),
+        ("figure", fig),
+        ("subheader", f"Change in Vote Share ({y1}−{y0})"),
+        ("figure", fig_change),
+    ]
+
+
+# ---------------------------------------------------------
+# 16. Candidates from Low Vote Share Parties
+# ---------------------------------------------------------
+@section(16)
+def low_share_parties(analyses, y0, y1):
+    blocks = [("header", "🏳️ Candidates from Low State-Level Vote Share Parties (Both Years)")]
+
+    for year in [y0, y1]:
+        # Winners from parties with <10% vote share in their state
+        result = analyses.run('low_share_winners', year=year)
+
+        # Table of top 50
+        blocks += [
+            ("subheader", f"🗳️ {year}"),
+            ("dataframe", result.sort_values(['state_name', 'pc_name']).reset_index(drop=True).head(50)),
+        ]
+
+        # -------------------------------------------------
+        # 📊 Visualization 1: Count of Wins by Low-Share Parties per State
+        # -------------------------------------------------
+        wins_by_state = result.groupby('state_name', observed=True).size().reset_index(name='num_constituencies')
+        if not wins_by_state.empty:
+            fig_state = px.bar(
+                wins_by_state.sort_values('num_constituencies', ascending=False),
+                x='state_name',
+                y='num_constituencies',
+                title=f"States Where Low Vote-Share Parties Won Constituencies ({year})",
+                text='num_constituencies'
+            )
+            fig_state.update_layout(
+                xaxis_title="State",
+                yaxis_title="Constituencies Won",
+                xaxis_tickangle=-45
+            )
+            blocks.append(("figure", fig_state))
+        else:
+            blocks.append(("info", f"No low-share party winners found in {year}."))
+
+        # -------------------------------------------------
+        # 📊 Visualization 2: Breakdown by Party (optional)
+        # -------------------------------------------------
+        wins_by_party = result.groupby('party', observed=True).size().reset_index(name='num_constituencies')
+        if not wins_by_party.empty:
+            fig_party = px.bar(
+                wins_by_party.sort_values('num_constituencies', ascending=False),
+                x='party',
+                y='num_constituencies',
+                title=f"Low Vote-Share Parties That Still Won Constituencies ({year})",
+                text='num_constituencies',
+                color='party'
+            )
+            fig_party.update_layout(xaxis_title="Party", yaxis_title="Constituencies Won")
+            blocks.append(("figure", fig_party))
+    return blocks
+
+
+# ---------------------------------------------------------
+# 17. NOTA Votes by State and Constituency
+# ---------------------------------------------------------
+@section(17)
+def nota_distribution(analyses, y0, y1):
+    nota = analyses.run('nota_distribution')
+    fig = px.bar(nota['state'], x='state_name', y='total_votes', color='year', barmode='group', title='NOTA Votes by State')
+    return [
+        ("header", "🗳️ NOTA Votes Distribution (State & Constituency)"),
+        ("figure", fig),
+        ("subheader", "Top Constituencies with Highest NOTA Votes (Both Years)"),
+        ("dataframe", nota['top']),
+    ]
+
+
+# ---------------------------------------------------------
+# 18. Parties Gaining Most Constituencies
+# ---------------------------------------------------------
+@section(18)
+def seat_gains(analyses, y0, y1, state=None, zone=None):
+    # One transition matrix per (pair, scope); gains are its off-diagonal column sums
+    scope = dict(state=state) if state else dict(zone=zone) if zone else {}
+    where = f" — {state or zone}" if scope else ""
+    blocks = [("header", f"📈 Parties Gaining Most New Constituencies in {y1}{where}")]
+
+    matrix = analyses.run('seat_transitions', y0=y0, y1=y1, **scope)
+    if matrix.empty:
+        return blocks + [("warning", "⚠️ No constituencies contested in both elections.")]
+
+    gains = analyses.run('seat_gains', y0=y0, y1=y1, **scope)
+    fig = px.bar(gains, x=f'party_{y1}', y='gains', title=f'Parties Winning New Constituencies in {y1} vs {y0}')
+
+    sankey = render.sankey(transition_flows(matrix), f'party_{y0}', f'party_{y1}', 'seats', sides=(y0, y1),
+                           title=f'Seat Transitions {y0} → {y1}{where}')
+    retained, total = _seat_counts(analyses, y0, y1, **scope)
+    return blocks + [
+        ("dataframe", gains),
+        ("figure", fig),
+        ("subheader", f"🔀 Seat Transition Matrix ({y0} winner → {y1} winner)"),
+        ("markdown", f"{retained} of {total} seats retained by the same party."),
+        ("dataframe", matrix.reset_index()),
+        ("figure", sankey),
+    ]
+
+
+# ---------------------------------------------------------
+# 19. Consistent High/Low Voter Turnout Constituencies
+# ---------------------------------------------------------
+@section(19)
+def turnout_consistency(analyses, y0, y1):
+    # Average turnout per constituency (rows) and year (columns), with the
+    # constituencies in the top / bottom 10% in both elections
+    consistency = analyses.run('turnout_consistency', y0=y0, y1=y1)
+    pivot = consistency['pivot']
+    consistent_high = consistency['high']
+    consistent_low = consistency['low']
+
+    # 📊 Scatter plot for clarity (WebGL, thinned above the point budget;
+    # the consistent high / low constituencies are always drawn)
+    points = pivot.reset_index()
+    points['change'] = points[y1] - points[y0]  # color shows change in turnout
+    fig = render.scatter(
+        points,
+        x=y0,
+        y=y1,
+        keep=points['pc_name'].isin(consistent_high.index.union(consistent_low.index)),
+        hover_name='pc_name',
+        title=f'{y0} vs {y1} Turnout by Constituency',
+        labels={y0: f'Turnout ({y0})', y1: f'Turnout ({y1})'},
+        color='change',
+        color_continuous_scale='RdBu'
+    )
+    return [
+        ("header", "📌 Consistently High / Low Turnout Constituencies"),
+        ("subheader", "🌟 Consistent High Turnout Constituencies"),
+        ("dataframe", consistent_high.reset_index().round(2)),
+        ("subheader", "⚠️ Consistent Low Turnout Constituencies"),
+        ("dataframe", consistent_low.reset_index().round(2)),
+        ("figure", fig),
+    ]
+
+
+# ---------------------------------------------------------
+# 20. Age Groups Contribution to Turnout Change
+# ---------------------------------------------------------
+@section(20)
+def age_turnout(analyses, y0, y1):
+    blocks = [("header", f"📊 Which Age Groups Drove Turnout Change ({y0} - {y1})")]
+    age = analyses.run('age_turnout', y0=y0, y1=y1)
+
+    if age is None:
+        return blocks + [("warning", "❌ Missing required columns ('age', 'general_votes', 'year').")]
+
+    blocks += [
+        ("write", "Valid age rows:", age['rows']),
+        ("write", "Unique years:", age['years']),
+        ("write", "Grouped data:", age['grouped'].head(), "Shape:", age['grouped'].shape),
+    ]
+    if age['grouped'].empty:
+        return blocks + [("warning", "No grouped data available. Check 'year' and 'age' columns.")]
+
+    age_turnout_pivot = age['change']
+    a, b = str(y0), str(y1)
+    blocks += [
+        ("write", "Pivot:", age['pivot']),
+        ("subheader", "Turnout Change by Age Group"),
+        ("dataframe", age_turnout_pivot[['age_group', a, b, 'change']].round(0)),
+    ]
+    if age_turnout_pivot.empty:
+        return blocks + [("warning", "No data available after processing.")]
+
+    fig = px.bar(age_turnout_pivot, x='age_group', y='change',
+                 title=f'Change in General Votes by Age Group ({y0}→{y1})', text='change')
+    return blocks + [("figure", fig)]
+
+
+# ---------------------------------------------------------
+# 21. Youth Turnout Increase vs Winning Party (Enhanced)
+# ---------------------------------------------------------
+@section(21)
+def youth_turnout(analyses, y0, y1):
+    blocks = [("header", f"📈 Youth (18–25) Turnout Increase vs Winning Party ({y0} → {y1})")]
+
+    top_rising = analyses.run('youth_turnout', y0=y0, y1=y1)
+
+    if top_rising is None:
+        return blocks + [("warning", "Required columns 'age' or 'general_votes' missing in dataset.")]
+
+    # 🔹 Bar Chart
+    fig_bar = px.bar(
+        top_rising, x='pc_name', y='youth_turnout_change', color='party',
+        title=f'Top 20 Constituencies by Youth Turnout Increase ({y0}→{y1})',
+        hover_data=['state_name', f'turnout_{y0}', f'turnout_{y1}']
+    )
+    return blocks + [
+        ("subheader", "Top Constituencies with Highest Youth Turnout Increase"),
+        ("dataframe", top_rising[['pc_name', 'state_name', 'party', f'turnout_{y0}', f'turnout_{y1}', 'youth_turnout_change']].round(2)),
+        ("figure", fig_bar),
+    ]
@@ -0,0 +1,235 @@
+# snapshot.py
+"""
+Precompute the fixed sections of streamlit.py into a snapshot on disk.
+
+    python snapshot.py                       # every consecutive pair + earliest vs latest
+    python snapshot.py --pair 2014 2019 --out snapshot/
+
+Every section registered in sections.py is built for each pair of elections
+and stored as its blocks: tables as Parquet files, Plotly figures as their
+JSON, everything else inline in ``manifest.json``. The manifest records the
+snapshot format (``SNAPSHOT_VERSION``) and the dataset version it was built
+from; ``Snapshot.open`` returns None when either does not match, and the
+dashboard then computes sections live.
+
+Each build goes to its own directory under the snapshot directory, and the
+``CURRENT`` file there names the live one. The pointer is replaced
+atomically once a build is complete, and the previous build is kept, so an
+app still serving it can finish reading. Apps compare ``current_build()``
+with the build they have open on every rerun and reopen when it changes;
+a block that can't be read (a build removed under a long-running app)
+makes ``get`` return None and the section is computed live.
+
+Sections with parameter widgets (7, 8, 9) and pairs that weren't built are
+always computed live.
+"""
+import argparse
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import data_store
+import sections
+from startup import lazy_import
+
+pio = lazy_import("plotly.io")
+
+SNAPSHOT_VERSION = 3
+SNAPSHOT_DIR = data_store.DATA_DIR / "snapshot"
+POINTER = "CURRENT"
+
+
+def entry_key(number, y0, y1):
+    return f"{number:02d}__y0={y0}__y1={y1}"
+
+
+# -----------------------------
+# Encoding blocks
+# -----------------------------
+def _encode(value, stem, out_dir, files):
+    """JSON-able form of one block argument; tables and figures go to files."""
+    if isinstance(value, np.ndarray):
+        value = pd.DataFrame(value)
+    if isinstance(value, pd.Series):
+        value = value.to_frame()
+    if isinstance(value, pd.DataFrame):
+        name = f"{stem}.{len(files)}.parquet"
+        df = value.copy()
+        df.columns = [str(c) for c in df.columns]
+        df.to_parquet(out_dir / name)
+        files.append(name)
+        return {"table": name}
+    if hasattr(value, "to_plotly_json"):
+        name = f"{stem}.{len(files)}.json"
+        (out_dir / name).write_text(value.to_json(), encoding="utf-8")
+        files.append(name)
+        return {"figure": name}
+    if isinstance(value, tuple):
+        # JSON has no tuples; st.write shows a shape as (rows, cols), not a list
+        return {"tuple": list(value)}
+    return {"value": value}
+
+
+def encode_blocks(blocks, stem, out_dir, files):
+    out = []
+    for kind, *args in blocks:
+        if kind == "columns":
+            args = [[encode_blocks(col, stem, out_dir, files) for col in args[0]]]
+        else:
+            args = [_encode(a, stem, out_dir, files) for a in args]
+        out.append([kind, *args])
+    return out
+
+
+# -----------------------------
+# Build
+# -----------------------------
+def default_pairs(elections):
+    """Consecutive pairs plus the dashboard's default (earliest, latest)."""
+    pairs = elections.pairs()
+    if len(elections.years) > 1:
+        pairs.append((elections.years[0], elections.years[-1]))
+    return list(dict.fromkeys(pairs))
+
+
+def current_build(out_dir=SNAPSHOT_DIR):
+    """Name of the live build directory in ``out_dir``, or None before the first build."""
+    try:
+        return (Path(out_dir) / POINTER).read_text(encoding="utf-8").strip() or None
+    except OSError:
+        return None
+
+
+def build(out_dir=SNAPSHOT_DIR, pairs=None):
+    """Build every section for ``pairs`` into a new build in ``out_dir`` and make it current; returns the manifest."""
+    import batch
+    from analyses import AnalysisStore
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    previous = current_build(out_dir)
+    name = f"build-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+    # Hidden while in progress, so a concurrent build's clean-up leaves it alone
+    build_dir = out_dir / f".{name}"
+    build_dir.mkdir()
+
+    elections = batch.load_elections()
+    version = data_store.dataset_version()
+    store = AnalysisStore(elections, version)
+    pairs = pairs or default_pairs(elections)
+
+    t = time.perf_counter()
+    entries, files = {}, []
+    for y0, y1 in pairs:
+        for number, fn in sorted(sections.SECTIONS.items()):
+            key = entry_key(number, y0, y1)
+            entries[key] = encode_blocks(fn(store, y0, y1), key, build_dir, files)
+
+    manifest = {
+        "version": SNAPSHOT_VERSION,
+        "dataset_version": version,
+        "built": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "seconds": round(time.perf_counter() - t, 3),
+        "pairs": [list(p) for p in pairs],
+        "entries": entries,
+    }
+    (build_dir / "manifest.json").write_text(json.dumps(manifest, default=str), encoding="utf-8")
+    build_dir.rename(out_dir / name)
+
+    # Switch the pointer, then drop everything but this build and the one before
+    tmp = out_dir / f".{POINTER}.{os.getpid()}.tmp"
+    tmp.write_text(name, encoding="utf-8")
+    os.replace(tmp, out_dir / POINTER)
+    for old in out_dir.iterdir():
+        if old.name in (POINTER, name, previous) or old.name.startswith("."):
+            continue
+        if old.is_dir():
+            shutil.rmtree(old, ignore_errors=True)
+        else:
+            old.unlink(missing_ok=True)
+    return manifest
+
+
+# -----------------------------
+# Serving
+# -----------------------------
+class Snapshot:
+    def __init__(self, path, manifest, build=None):
+        self.path = Path(path)
+        self.manifest = manifest
+        self.build = build
+        self._tables = {}
+
+    @classmethod
+    def open(cls, out_dir=SNAPSHOT_DIR, dataset_version=None, build=None):
+        """
+        Build ``build`` (default: the current one) in ``out_dir``, or None if
+        missing or built for another format / dataset.
+        """
+        build = build or current_build(out_dir)
+        if build is None:
+            return None
+        path = Path(out_dir) / build
+        try:
+            manifest = json.loads((path / "manifest.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if manifest.get("version") != SNAPSHOT_VERSION:
+            return None
+        if dataset_version is not None and manifest.get("dataset_version") != dataset_version:
+            return None
+        return cls(path, manifest, build)
+
+    def _decode(self, value):
+        if "table" in value:
+            name = value["table"]
+            if name not in self._tables:
+                self._tables[name] = pd.read_parquet(self.path / name)
+            return self._tables[name]
+        if "figure" in value:
+            # A fresh figure per call: Streamlit may restyle what it is given
+            return pio.from_json((self.path / value["figure"]).read_text(encoding="utf-8"))
+        if "tuple" in value:
+            return tuple(value["tuple"])
+        return value["value"]
+
+    def _blocks(self, encoded):
+        out = []
+        for kind, *args in encoded:
+            if kind == "columns":
+                out.append((kind, [self._blocks(col) for col in args[0]]))
+            else:
+                out.append((kind, *map(self._decode, args)))
+        return out
+
+    def get(self, number, y0, y1):
+        """Blocks of section ``number`` for (y0, y1), or None if not precomputed or no longer readable."""
+        encoded = self.manifest["entries"].get(entry_key(number, y0, y1))
+        if encoded is None:
+            return None
+        try:
+            return self._blocks(encoded)
+        except (OSError, KeyError, ValueError):
+            return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pair", nargs=2, type=int, action="append", metavar=("Y0", "Y1"),
+                        help="build this pair of elections (repeatable; default: consecutive pairs and earliest vs latest)")
+    parser.add_argument("--out", default=str(SNAPSHOT_DIR))
+    args = parser.parse_args(argv)
+
+    pairs = [tuple(p) for p in args.pair] if args.pair else None
+    manifest = build(args.out, pairs)
+    print(f"Built {len(manifest['entries'])} sections for {len(manifest['pairs'])} pair(s) "
+          f"in {manifest['seconds']:.2f}s -> {args.out}/")
+
+
+if __name__ == "__main__":
+    main()
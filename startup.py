@@ -0,0 +1,96 @@
+# startup.py
+"""
+Cold-start helpers: lazy module imports and an import-time profiler.
+
+    python startup.py streamlit.py          # slowest imports of an app
+    python startup.py streamlit2.py --top 25
+
+``lazy_import(name)`` returns a module whose code only runs on first
+attribute access, so ``px = lazy_import("plotly.express")`` at the top of a
+dashboard costs nothing until a chart is actually drawn.
+
+The profiler reads an app's top-level imports, runs them in a fresh
+interpreter under ``python -X importtime`` and prints the modules with the
+largest cumulative import time. The child runs outside this directory, so
+``import streamlit`` resolves to the installed package rather than to the
+streamlit.py dashboard.
+"""
+import argparse
+import ast
+import importlib.util
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+DATA_DIR = Path(__file__).resolve().parent
+
+
+# -----------------------------
+# Lazy imports
+# -----------------------------
+def lazy_import(name):
+    """``name`` as a module that is executed on first attribute access."""
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+# -----------------------------
+# Import-time profile
+# -----------------------------
+def top_level_imports(script):
+    """Module names imported at the top level of ``script``, in order."""
+    tree = ast.parse(Path(script).read_text(encoding="utf-8"))
+    names = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names += [a.name for a in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.append(node.module)
+    return list(dict.fromkeys(names))
+
+
+def profile_imports(modules):
+    """[(cumulative_us, self_us, module)] for importing ``modules`` in a fresh interpreter."""
+    code = f"import sys; sys.path.append({str(DATA_DIR)!r})\n" + "\n".join(f"import {m}" for m in modules)
+    with tempfile.TemporaryDirectory() as cwd:
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                              cwd=cwd, capture_output=True, text=True)
+    if proc.returncode:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        # One space after the separator, then two per nesting level
+        rows.append((int(cumulative_us), int(self_us), name[1:].rstrip()))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("script", help="dashboard script whose top-level imports to profile")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args(argv)
+
+    modules = top_level_imports(args.script)
+    rows = profile_imports(modules)
+    roots = {name.strip(): cum for cum, _, name in rows if not name.startswith(" ")}
+    print(f"{args.script}: {sum(roots.values()) / 1000:.0f} ms importing {', '.join(modules)}")
+    print(f"{'cumulative':>12} {'self':>9}  module")
+    for cum, self_us, name in sorted(rows, reverse=True)[:args.top]:
+        print(f"{cum / 1000:9.1f} ms {self_us / 1000:6.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,42 @@
 # streamlit2.py
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import json
-import urllib.request
-from urllib.error import URLError, HTTPError
-from pathlib import Path
+import analyses
+import backends
+import charts
+import data_store
+import dims
+import geo
+import instrument
+import metrics
+from elections import ElectionSet
+from filter_index import FilterIndex
+from startup import lazy_import
+
+# Stage timings for this run (opt-in: ELECTION_PROFILE=1); px and charts
+# calls are timed as figure builds, analyses calls as aggregation
+timer = instrument.Timer("streamlit2.py")
+
+# Plotly Express is loaded on the first chart, not at startup
+px = timer.timed(lazy_import("plotly.express"), "figures")
+charts = timer.timed(charts, "figures")
+analyses = timer.timed(analyses, "aggregation")
+
+
+def plotly_chart(fig):
+    with timer.stage("render"):
+        st.plotly_chart(fig, use_container_width=True)
+
+# Every rerun ends here, including those cut short with stop(): the stage
+# timings panel and the rerun latency metric
+def finish():
+    timer.lap("page")
+    instrument.panel(st, timer, backend=elections.backend.name)
+    metrics.observe_rerun("streamlit2.py", page, timer.elapsed(), rows=len(df_all))
+
+def stop():
+    finish()
+    st.stop()
 
 # -----------------------------
 # Page config
@@ -60,99 +91,65 @@ st.markdown(
     """,
     unsafe_allow_html=True,
 )
-pages = ["🏠 Home", "📈 Statewise Votes", "🏙️ Party Performance(Trends)", "📊 Party-State Insights", "🗳️ Turnout Comparison", "🎯 Top Candidates","🧑‍🤝‍🧑 Candidate Comparison (2014 vs 2019)", "📈 Turnout Change Analysis"]
+pages = ["🏠 Home", "📈 Statewise Votes", "🏙️ Party Performance(Trends)", "📊 Party-State Insights", "🗳️ Turnout Comparison", "🎯 Top Candidates","🧑‍🤝‍🧑 Candidate Comparison", "📈 Turnout Change Analysis"]
 page = st.radio("Navigation", pages, horizontal=True, label_visibility="collapsed")
 
 # -----------------------------
 # Load election data
 # -----------------------------
-@st.cache_data
+# cache_resource, not cache_data: every session gets the same read-only
+# frame over the memory-mapped Arrow cache instead of a pickled copy
+@st.cache_resource
 def load_data():
-    # Adjust filenames if yours differ
-    df_2014 = pd.read_csv("constituency_wise_results_2014.csv")
-    df_2019 = pd.read_csv("constituency_wise_results_2019.csv")
-    df_2014["year"] = 2014
-    df_2019["year"] = 2019
-
-    # Fix Telangana constituencies for 2014
-    telangana_constituencies = [
-        "Adilabad", "Nizamabad", "Karimnagar", "Medak", "Malkajgiri",
-        "Secunderabad", "Hyderabad", "Chevella", "Mahbubnagar",
-        "Nagarkurnool", "Nalgonda", "Bhongir", "Warangal",
-        "Mahabubabad", "Khammam", "Zahirabad"
-    ]
-    if "pc_name" in df_2014.columns and "state" in df_2014.columns:
-        df_2014["state"] = df_2014.apply(
-            lambda r: "Telangana" if r["pc_name"] in telangana_constituencies else r["state"],
-            axis=1
-        )
-
-    df = pd.concat([df_2014, df_2019], ignore_index=True)
-    return df
+    metrics.cache_miss("streamlit2.py", "load_data")
+    # Telangana fix-up, numeric coercion, 'Unknown' fills and 'sex'
+    # standardization are applied once when the cache is built
+    return data_store.load_results(mapped=True)
 
+metrics.cache_call("streamlit2.py", "load_data")
 df_all = load_data()
-# -----------------------------
-# 🧹 Handle Missing (Null) Values
-# -----------------------------
 
-# Fill missing demographic or categorical fields with 'Unknown'
-for col in ["sex", "age", "category", "party_symbol"]:
-    if col in df_all.columns:
-        df_all[col].fillna("Unknown", inplace=True)
+# Year-level views shared with the batch runner (analyses.py)
+@st.cache_resource
+def load_elections():
+    df = load_data()
+    return ElectionSet(df, backend=backends.create(df, dataset="results"))
 
-# Standardize 'sex' column values for consistency
-if "sex" in df_all.columns:
-    df_all["sex"] = (
-        df_all["sex"]
-        .astype(str)
-        .str.strip()
-        .str.title()
-        .replace({"Nan": "Unknown"})
-    )
+elections = load_elections()
 
 
 # -----------------------------
-# Zones
-# -----------------------------
-# -----------------------------
-# Zones (All States + UTs included as States)
-# -----------------------------
-zones = {
-    "🧭 North Zone": [
-        "Jammu & Kashmir", "Ladakh", "Himachal Pradesh", "Punjab",
-        "Haryana", "Uttarakhand", "Uttar Pradesh", "NCT OF Delhi" , "Chandigarh"
-    ],
-    "🌾 East Zone": [
-        "Bihar", "Jharkhand", "Odisha", "West Bengal"
-    ],
-    "🐪 West Zone": [
-        "Rajasthan", "Gujarat", "Maharashtra", "Goa", "Dadra & Nagar Haveli", "Daman & Diu"
-    ],
-    "🌴 South Zone": [
-        "Andhra Pradesh", "Karnataka", "Kerala", "Tamil Nadu", "Telangana",
-        "Puducherry", "Andaman & Nicobar Islands", "Lakshadweep"
-    ],
-    "🌿 Central Zone": [
-        "Madhya Pradesh", "Chhattisgarh"
-    ],
-    "⛰️ North East Zone": [
-        "Assam", "Arunachal Pradesh", "Manipur", "Meghalaya",
-        "Mizoram", "Nagaland", "Tripura", "Sikkim"
-    ]
-}
+# Zones (all states and UTs, see dims.ZONES)
+# -----------------------------
+zones = dims.ZONES
 
 # -----------------------------
 # Sidebar filters (Years → Zones → States → Constituencies)
 # -----------------------------
 st.sidebar.header(" Filters")
 
+@st.cache_resource
+def load_filter_index():
+    # Built once per process over the same rows load_data() returns
+    return FilterIndex(load_data(), ["year", "state", "pc_name", "party", "candidate"])
+
+filter_index = load_filter_index()
+
+# Deep memory use walks every string column: measured once per dataset version
+@st.cache_resource(max_entries=2)
+def load_memory_report(version):
+    return data_store.memory_report(load_data())
+
+timer.lap("data load")
+
 # -----------------------------
-# Year selection
+# Year selection (every election present in the data)
 # -----------------------------
+all_years = filter_index.values("year")
 year_selected = st.sidebar.multiselect(
     "Select Year(s):",
-    [2014, 2019],
-    default=[2019]
+    all_years,
+    default=[all_years[-1]]
 )
 
 # -----------------------------
@@ -175,14 +172,9 @@ else:
 selected_zone_states = sorted({s for zone in selected_zones for s in zones[zone]})
 
 # -----------------------------
-# Filter dataset by year and zones
+# Filter rows by year and zones (row masks from the filter index)
 # -----------------------------
-df_filtered = df_all[df_all["year"].isin(year_selected)]
-
-if "state" in df_filtered.columns:
-    df_filtered = df_filtered[df_filtered["state"].isin(selected_zone_states)]
-else:
-    st.warning("Data missing 'state' column — filters may not work as expected.")
+row_mask = filter_index.select(year=year_selected, state=selected_zone_states)
 
 
 # -----------------------------
@@ -191,10 +183,7 @@ else:
 st.sidebar.markdown("### Select States")
 
 # Generate available states from data
-if "state" in df_filtered.columns:
-    all_states = sorted(df_filtered["state"].dropna().unique())
-else:
-    all_states = []
+all_states = filter_index.options("state", row_mask)
 
 # ✅ Always ensure Delhi and Chandigarh appear in sidebar list
 essential_states = ["NCT OF Delhi", "Chandigarh"]
@@ -212,15 +201,14 @@ if select_all_states:
 else:
     selected_states = st.sidebar.multiselect("Select State(s):", all_states, default=essential_states)
 
-# Filter the dataframe
-if "state" in df_filtered.columns:
-    df_filtered = df_filtered[df_filtered["state"].isin(selected_states)]
+# Filter the rows
+row_mask &= filter_index.mask("state", selected_states)
 
 # -----------------------------
 # Constituency selection (with Select All)
 # -----------------------------
 st.sidebar.markdown("### Select Constituencies")
-all_const = sorted(df_filtered["pc_name"].dropna().unique()) if "pc_name" in df_filtered.columns else []
+all_const = filter_index.options("pc_name", row_mask)
 
 select_all_const = st.sidebar.checkbox("Select All Constituencies", value=True, key="const_all")
 if select_all_const:
@@ -232,19 +220,15 @@ else:
 # -----------------------------
 # Party selection (with Select All)
 # -----------------------------
-if "pc_name" in df_filtered.columns:
-    df_filtered = df_filtered[df_filtered["pc_name"].isin(selected_const)] 
+row_mask &= filter_index.mask("pc_name", selected_const)
 
 # -----------------------------
 # Party selection (default: BJP, INC)
 # -----------------------------
 st.sidebar.markdown("### 🇮🇳 Select Parties")
 
-# Generate all unique party names from the filtered dataset
-if "party" in df_all.columns:
-    all_parties = sorted(df_all["party"].dropna().unique())
-else:
-    all_parties = []
+# Generate all unique party names from the full dataset
+all_parties = filter_index.values("party")
 
 # Define default parties (only if they exist in the dataset)
 default_parties = [p for p in ["BJP", "INC"] if p in all_parties]
@@ -262,20 +246,16 @@ else:
         default=default_parties
     )
 
-# Filter the dataframe based on selected parties
-if "party" in df_filtered.columns:
-    df_filtered = df_filtered[df_filtered["party"].isin(selected_parties)]
+# Filter the rows based on selected parties
+row_mask &= filter_index.mask("party", selected_parties)
 
 # -----------------------------
 # Candidate selection (under Parties)
 # -----------------------------
 st.sidebar.markdown("### 🧑 Select Candidate(s)")
 
-if "candidate" in df_filtered.columns:
-    # Only show candidates from the already selected parties
-    all_candidates = sorted(df_filtered["candidate"].dropna().unique())
-else:
-    all_candidates = []
+# Only show candidates from the already selected parties
+all_candidates = filter_index.options("candidate", row_mask)
 
 select_all_candidates = st.sidebar.checkbox("Select All Candidates", value=False, key="candidates_all")
 
@@ -288,9 +268,24 @@ else:
         default=[]
     )
 
-# Filter the dataframe based on selected candidates
-if "candidate" in df_filtered.columns and selected_candidates:
-    df_filtered = df_filtered[df_filtered["candidate"].isin(selected_candidates)]
+# Filter the rows based on selected candidates
+if selected_candidates:
+    row_mask &= filter_index.mask("candidate", selected_candidates)
+
+# One row selection for the whole cascade
+df_filtered = df_all[row_mask]
+
+# The same selection as column filters, for aggregations run by the backend
+row_filters = {
+    "year": year_selected,
+    "state": sorted(set(selected_zone_states) & set(selected_states)),
+    "pc_name": selected_const,
+    "party": selected_parties,
+}
+if selected_candidates:
+    row_filters["candidate"] = selected_candidates
+timer.lap("filters")
+timer.view = page
 
 # -----------------------------
 # Sidebar summary info
@@ -302,70 +297,24 @@ st.sidebar.write(f"🗳️ States: {len(selected_states)} selected")
 st.sidebar.write(f"🏙️ Constituencies: {len(selected_const)} selected")
 st.sidebar.write(f"🏛️ Parties: {len(selected_parties)} selected")
 st.sidebar.write(f"🧑 Candidates: {len(selected_candidates)} selected")
+with st.sidebar.expander("🧠 Memory"):
+    memory = load_memory_report(data_store.dataset_version())
+    st.caption(f"Election data: {memory['mb'].sum():.1f} MB in memory")
+    st.dataframe(memory, hide_index=True)
 # -----------------------------
 # PAGE: Home (map)
 # -----------------------------
 
 # Optional: Check null values after cleaning
 
-@st.cache_data
-def load_geojson_try_sources(local_paths=None):
-    """
-    Try multiple remote GeoJSON URLs; fallback to local files if provided.
-    Returns tuple (geojson_dict, state_name_property) or raises Exception.
-    """
-    urls = [
-        "https://raw.githubusercontent.com/geohacker/india/master/state/india_telengana.geojson",
-    ]
-    for url in urls:
-        try:
-            with urllib.request.urlopen(url, timeout=15) as response:
-                geo = json.load(response)
-            example_props = geo["features"][0]["properties"]
-            for cand in ("ST_NM", "st_name", "st_nm", "st_name_1", "NAME_1", "NAME", "state"):
-                if any(cand in p.upper() for p in example_props.keys()):
-                    for k in example_props.keys():
-                        if k.upper() == cand.upper():
-                            return geo, k
-            for k, v in example_props.items():
-                if isinstance(v, str) and len(v) > 2:
-                    return geo, k
-        except (HTTPError, URLError, Exception):
-            continue
-
-    local_try = local_paths or ["india_states.geojson", "data/india_states.geojson"]
-    for lp in local_try:
-        p = Path(lp)
-        if p.exists():
-            with open(p, "r", encoding="utf-8") as f:
-                geo = json.load(f)
-            example_props = geo["features"][0]["properties"]
-            for cand in ("ST_NM", "st_name", "st_nm", "NAME_1", "NAME"):
-                for k in example_props.keys():
-                    if k.upper() == cand.upper():
-                        return geo, k
-            for k, v in example_props.items():
-                if isinstance(v, str) and len(v) > 2:
-                    return geo, k
-    raise RuntimeError(
-        "Could not load a working India GeoJSON from remote URLs or local files. "
-        "Please download a valid 'india_states.geojson' and place it next to this script."
-    )
-
+@st.cache_resource
+def load_geometry():
+    # Bundled, pre-simplified geometry; feature ids are state_id (see geo.py)
+    try:
+        return geo.load(), None
+    except OSError as e:
+        return None, str(e)
 
-# Utility to normalize state names
-# -----------------------------
-state_name_corrections = {
-    "Odisha": "Orissa",              
-    "Uttarakhand": "Uttaranchal",    
-    "Telangana": "Telengana",       
-    "Delhi": "NCT of Delhi",
-    "Puducherry": "Pondicherry",
-    "Andaman and Nicobar Islands": "Andaman & Nicobar Islands", 
-    "Dadra and Nagar Haveli and Daman and Diu": "Dadra & Nagar Haveli",
-    "Jammu and Kashmir": "Jammu & Kashmir"
-}
-NAME_REPLACE = state_name_corrections
 
 # -----------------------------
 # PAGE: Home (map)
@@ -375,63 +324,49 @@ NAME_REPLACE = state_name_corrections
 if page == "🏠 Home":
     st.markdown("### 🗺️ Total Votes by State")
 
-    try:
-        geojson_data, state_prop = load_geojson_try_sources()
-    except Exception as e:
-        st.error("Map GeoJSON load failed: " + str(e))
-        st.info("You can download a valid india_states.geojson from e.g. datameet/github and place it next to this script.")
-        st.stop()
+    geometry, geometry_error = load_geometry()
 
     # prepare state totals
     if "state" not in df_filtered.columns:
         st.error("Data does not contain 'state' column — cannot map.")
-        st.stop()
-    df_state = df_filtered.groupby("state", as_index=False)["total_votes"].sum()
-    # normalize names from CSV to match GeoJSON naming convention
-    df_state["state_norm"] = df_state["state"].replace(NAME_REPLACE)
-
-    # normalize feature properties (if necessary) so matching works
-    # we won't overwrite, but create a consistent mapping in memory
-    geo_state_names = []
-    for feat in geojson_data["features"]:
-        v = feat["properties"].get(state_prop) or ""
-        geo_state_names.append(v)
-
-    # find which CSV names are missing and attempt reasonable conversions
-    missing = set(df_state["state_norm"]) - set(geo_state_names)
-    # try to also handle 'Delhi' vs 'NCT of Delhi' etc (reverse mapping)
-    reverse_name_map = {v: k for k, v in NAME_REPLACE.items()}
-
-    # attempt to map any missing CSV names using reverse_name_map
-    df_state["state_match"] = df_state["state_norm"].apply(
-        lambda s: s if s in geo_state_names else reverse_name_map.get(s, s)
-    )
-
-    # final check
-    unmatched = set(df_state["state_match"]) - set(geo_state_names)
-    if unmatched:
-        # show warning but still attempt to render available matches
-        st.warning("Some states couldn't be matched to the GeoJSON and will not appear on the map: "
-                   + ", ".join(sorted(unmatched)))
-    # reduce df_state to rows that match geojson
-    df_state_plot = df_state[df_state["state_match"].isin(geo_state_names)].copy()
-    df_state_plot = df_state_plot.rename(columns={"state_match": "state_for_map"})
-
-    # build choropleth
-    featureidkey = f"properties.{state_prop}"
-    fig = px.choropleth(
-        df_state_plot,
-        geojson=geojson_data,
-        locations="state_for_map",
-        featureidkey=featureidkey,
-        color="total_votes",
-        color_continuous_scale="Viridis",
-        title=f"({', '.join(map(str, year_selected))})",
-        hover_data=["state", "total_votes"]
-    )
-    fig.update_geos(fitbounds="locations", visible=False)
-    fig.update_layout(margin={"r":0,"t":40,"l":0,"b":0})
-    st.plotly_chart(fig, use_container_width=True)
+        stop()
+    with timer.stage("aggregation"):
+        df_state = analyses.home_state_votes(df_filtered)
+
+    if geometry is None:
+        # No map available: the same totals as a bar chart
+        st.warning("Map GeoJSON load failed: " + geometry_error)
+        fig = px.bar(
+            df_state.sort_values("total_votes", ascending=False),
+            x="state",
+            y="total_votes",
+            title=f"({', '.join(map(str, year_selected))})",
+        )
+        plotly_chart(fig)
+    else:
+        geojson_data, geo_states = geometry
+
+        # final check
+        mapped = df_state["state_id"].isin(geo_states["state_id"])
+        if not mapped.all():
+            # show warning but still attempt to render available matches
+            st.warning("Some states couldn't be matched to the GeoJSON and will not appear on the map: "
+                       + ", ".join(sorted(df_state.loc[~mapped, "state"].astype(str))))
+
+        # build choropleth
+        fig = px.choropleth(
+            df_state[mapped],
+            geojson=geojson_data,
+            locations="state_id",
+            featureidkey="id",
+            color="total_votes",
+            color_continuous_scale="Viridis",
+            title=f"({', '.join(map(str, year_selected))})",
+            hover_data=["state", "total_votes"]
+        )
+        fig.update_geos(fitbounds="locations", visible=False)
+        fig.update_layout(margin={"r":0,"t":40,"l":0,"b":0})
+        plotly_chart(fig)
 
 # -----------------------------
 # PAGE: Statewise Votes (bar + pie)
@@ -441,29 +376,14 @@ elif page == "📈 Statewise Votes":
     if "state" not in df_filtered.columns:
         st.error("Data missing 'state' column.")
     else:
-        state_votes = df_filtered.groupby(["state"], as_index=False)["total_votes"].sum()
-        state_votes = state_votes.sort_values("total_votes", ascending=False)
+        with timer.stage("aggregation"):
+            state_votes = analyses.statewise_votes(df_filtered)
 
-        fig_bar = px.bar(
-            state_votes,
-            x="state",
-            y="total_votes",
-            color="total_votes",
-            color_continuous_scale="Blues",
-            title=f"({', '.join(map(str, year_selected))})"
-        )
-        fig_bar.update_layout(height=450)
-        st.plotly_chart(fig_bar, use_container_width=True)
+        fig_bar, fig_pie = charts.statewise(state_votes, year_selected)
+        plotly_chart(fig_bar)
 
         st.markdown("### 🥧 Vote Share by State — Pie Chart")
-        fig_pie = px.pie(
-            state_votes,
-            names="state",
-            values="total_votes",
-            hole=0.35
-        )
-        fig_pie.update_traces(textposition="inside", textinfo="percent+label")
-        st.plotly_chart(fig_pie, use_container_width=True)
+        plotly_chart(fig_pie)
 
 
 
@@ -478,88 +398,45 @@ elif page == "🏙️ Party Performance(Trends)":
         st.error("⚠️ Required columns missing: year, state, party, total_votes")
     else:
         # Apply all active filters
-        df_trend = df_all[
-            (df_all["year"].isin(year_selected)) &
-            (df_all["state"].isin(selected_states))
-        ].copy()
-
-        if "pc_name" in df_all.columns and selected_const:
-            df_trend = df_trend[df_trend["pc_name"].isin(selected_const)]
-
-        # ✅ Apply Party Filter (from sidebar)
-        df_trend = df_trend[df_trend["party"].isin(selected_parties)]
+        df_trend = df_all[filter_index.select(
+            year=year_selected,
+            state=selected_states,
+            pc_name=selected_const or None,
+            party=selected_parties,
+        )]
 
         if df_trend.empty:
             st.warning("No data found for the selected Year, Zone, State, Constituency, or Party.")
-            st.stop()
+            stop()
 
         # Aggregate by party and year
-        trend_data = (
-            df_trend.groupby(["year", "party"], as_index=False)["total_votes"]
-            .sum()
-            .sort_values(["party", "year"])
-        )
+        with timer.stage("aggregation"):
+            trend_data, bar_data = analyses.party_performance(df_trend)
 
         # -----------------------------
         # 📊 Bar chart — Only selected parties
         # -----------------------------
         st.markdown("### ")
-        bar_data = (
-            df_trend.groupby(["party"], as_index=False)["total_votes"]
-            .sum()
-            .sort_values("total_votes", ascending=False)
-        )
 
         # ✅ Filter bar data to show only selected parties
         bar_data = bar_data[bar_data["party"].isin(selected_parties)]
 
-        fig_bar = px.bar(
-            bar_data,
-            x="party",
-            y="total_votes",
-            color="party",
-            title=f"{', '.join(map(str, year_selected))}",
-        )
-        fig_bar.update_layout(height=450, showlegend=False)
-        st.plotly_chart(fig_bar, use_container_width=True)
+        fig_bar, fig_line, fig_pie = charts.party_performance(trend_data, bar_data, year_selected)
+        plotly_chart(fig_bar)
 
 
         # -----------------------------
         # 📈 Line chart — Party vote trends over selected year(s)
         # -----------------------------
         st.markdown("### 📈 Party vote Trends")
-        fig_line = px.line(
-            trend_data,
-            x="year",
-            y="total_votes",
-            color="party",
-            markers=True,
-            title=f"{', '.join(map(str, year_selected))}",
-        )
-        fig_line.update_layout(
-            height=500,
-            xaxis=dict(tickmode="linear"),
-            legend_title_text="Party",
-        )
-        st.plotly_chart(fig_line, use_container_width=True)
+        plotly_chart(fig_line)
 
 
         # -----------------------------
         # 🥧 Pie chart — Only selected parties
         # -----------------------------
         st.markdown("### 🥧 Party Vote Share (Selected Parties Only)")
-        pie_data = bar_data.copy()  # reuse filtered data
-
-        fig_pie = px.pie(
-            pie_data,
-            names="party",
-            values="total_votes",
-            hole=0.3,
-            title=f"{', '.join(map(str, year_selected))}",
-        )
-        fig_pie.update_traces(textposition="inside", textinfo="percent+label")
-        fig_pie.update_layout(showlegend=True, title_x=0.5)
-        st.plotly_chart(fig_pie, use_container_width=True)
+        plotly_chart(fig_pie)
 
 # -----------------------------
 # PAGE: Party-State Insights
@@ -571,15 +448,15 @@ elif page == "📊 Party-State Insights":
     if not required_cols.issubset(df_all.columns):
         st.error("⚠️ Required columns missing: year, state, party, total_votes")
     else:
-        df_viz = df_all[
-            (df_all["year"].isin(year_selected)) &
-            (df_all["state"].isin(selected_states)) &
-            (df_all["party"].isin(selected_parties))
-        ].copy()
+        df_viz = df_all[filter_index.select(year=year_selected, state=selected_states, party=selected_parties)]
 
         if df_viz.empty:
             st.warning("No data found for selected filters.")
-            st.stop()
+            stop()
+
+        # State x party totals for the charts (bounded to the point budget in charts.py)
+        with timer.stage("aggregation"):
+            df_state_party = analyses.state_party_votes(df_viz)
 
         # -----------------------------
         # User choice for visualization type
@@ -594,61 +471,25 @@ elif page == "📊 Party-State Insights":
         # Treemap
         # -----------------------------
         if view_type == "🗺️ Treemap":
-            fig_tree = px.treemap(
-                df_viz,
-                path=["state", "party"],
-                values="total_votes",
-                title="State-wise Party Vote Distribution",
-            )
-            fig_tree.update_layout(height=750)
-            st.plotly_chart(fig_tree, use_container_width=True)
+            fig_tree = charts.party_state_treemap(df_state_party)
+            plotly_chart(fig_tree)
 
         # -----------------------------
         # Bar Graph
         # -----------------------------
         if view_type == "📊 Bar Graph":
 
-            # Aggregate total votes by State and Party
-            df_bar = (
-                df_viz.groupby(["state", "party"], as_index=False)["total_votes"]
-                .sum()
-                .sort_values(["state", "total_votes"], ascending=[True, False])
-            )
-
-            # Create grouped bar chart
-            fig_bar = px.bar(
-                df_bar,
-                x="state",
-                y="total_votes",
-                color="party",
-                barmode="group",
-                title="State-wise Party Vote Distribution",
-                labels={"total_votes": "Total Votes", "state": "State"},
-            )
-
-            # Improve readability
-            fig_bar.update_layout(
-                height=750,
-                xaxis_tickangle=-45,
-                legend_title_text="Party",
-                title_x=0.5,
-                margin=dict(t=80, l=20, r=20, b=80)
-            )
-
-            st.plotly_chart(fig_bar, use_container_width=True)
+            fig_bar = charts.party_state_bar(df_state_party)
+            plotly_chart(fig_bar)
 
         # -----------------------------
         # Sunburst
         # -----------------------------
         elif view_type == "🌞 Sunburst":
-            fig_sun = px.sunburst(
-                df_viz,
-                path=["year", "state", "party"],
-                values="total_votes",
-                title="Party Dominance by Year and State",
-            )
-            fig_sun.update_layout(height=750)
-            st.plotly_chart(fig_sun, use_container_width=True)
+            with timer.stage("aggregation"):
+                df_sun = analyses.state_party_votes(df_viz, by_year=True)
+            fig_sun = charts.party_state_sunburst(df_sun)
+            plotly_chart(fig_sun)
 
         # -----------------------------
         # Data Table
@@ -665,30 +506,19 @@ elif page == "📊 Party-State Insights":
 # PAGE: Turnout Comparison
 # -----------------------------
 elif page == "🗳️ Turnout Comparison":
-    st.markdown("### 🗳️ Voter Turnout (%) Comparison by State — 2014 vs 2019")
+    st.markdown(f"### 🗳️ Voter Turnout (%) Comparison by State — {' vs '.join(map(str, all_years))}")
 
     if "total_electors" in df_all.columns:
         # -----------------------------
         # Compute turnout percentage
         # -----------------------------
-        turnout = (
-            df_all.groupby(["state", "year"], as_index=False)[["total_votes", "total_electors"]]
-            .sum()
-        )
-        turnout["turnout_pct"] = (turnout["total_votes"] / turnout["total_electors"]) * 100
+        turnout = analyses.state_turnout_pct(elections)
 
         # -----------------------------
-        # Bar chart comparison (2014 vs 2019)
+        # Bar chart comparison (one bar per election)
         # -----------------------------
-        fig_bar = px.bar(
-            turnout,
-            x="state",
-            y="turnout_pct",
-            color="year",
-            barmode="group",
-        )
-        fig_bar.update_layout(height=600)
-        st.plotly_chart(fig_bar, use_container_width=True)
+        fig_bar = charts.state_turnout(turnout)
+        plotly_chart(fig_bar)
 # -----------------------------
 # PAGE: Top Candidates
 # -----------------------------
@@ -698,64 +528,18 @@ elif page == "🎯 Top Candidates":
     required_cols = {"state", "candidate", "party", "total_votes"}
     if required_cols.issubset(df_filtered.columns):
 
-        # 🔹 Clean and prepare data
-        df_filtered["state"] = df_filtered["state"].astype(str).str.strip().str.title()
-        df_filtered["candidate"] = df_filtered["candidate"].astype(str).str.strip()
-        df_filtered["party"] = df_filtered["party"].astype(str).str.strip()
-        df_filtered["total_votes"] = pd.to_numeric(df_filtered["total_votes"], errors="coerce")
-        df_filtered = df_filtered.dropna(subset=["total_votes"])
-
-        # 🔹 Compute Top 5 Candidates per State
-        top_candidates = (
-            df_filtered.groupby(["state", "candidate", "party"], as_index=False)["total_votes"]
-            .sum()
-            .sort_values(["state", "total_votes"], ascending=[True, False])
-            .groupby("state", group_keys=False)
-            .apply(lambda x: x.nlargest(5, "total_votes"))
-        )
+        # 🔹 Compute Top 5 Candidates per State (names are canonical from load time)
+        top_candidates = analyses.state_top_candidates(elections, 5, **row_filters)
         
 
 
-        # 🔹 Bar Chart — Faceted by State
-        fig_bar = px.bar(
-            top_candidates,
-            x="candidate",
-            y="total_votes",
-            color="party",
-            facet_col="state",
-            facet_col_wrap=3,
-            text="total_votes",
-            title=f"({', '.join(map(str, year_selected))})",
-        )
-
-        fig_bar.update_traces(texttemplate="%{text:,}", textposition="outside")
-        fig_bar.update_layout(
-            height=900,
-            bargap=0.3,
-            showlegend=True,
-            title_x=0.5,
-            margin=dict(t=80, l=20, r=20, b=80)
-        )
-        st.plotly_chart(fig_bar, use_container_width=True)
+        # 🔹 Bar Chart — Faceted by State, and party-wise pie chart
+        fig_bar, fig_pie = charts.top_candidates(top_candidates, year_selected)
+        plotly_chart(fig_bar)
 
         # 🔹 Party-wise Pie Chart
         st.markdown("### 🥧 Party-wise Vote Share among Top Candidates")
-        pie_data = (
-            top_candidates.groupby("party", as_index=False)["total_votes"]
-            .sum()
-            .sort_values("total_votes", ascending=False)
-        )
-
-        fig_pie = px.pie(
-            pie_data,
-            names="party",
-            values="total_votes",
-            hole=0.3,
-            title=f"({', '.join(map(str, year_selected))})"
-        )
-        fig_pie.update_traces(textposition="inside", textinfo="percent+label")
-        fig_pie.update_layout(showlegend=True, title_x=0.5)
-        st.plotly_chart(fig_pie, use_container_width=True)
+        plotly_chart(fig_pie)
 
     else:
         st.error("⚠️ Required columns missing: state, candidate, party, total_votes")
@@ -763,27 +547,23 @@ elif page == "🎯 Top Candidates":
 # -----------------------------
 # Candidate Comparison Page (Fixed)
 # -----------------------------
-if page == "🧑‍🤝‍🧑 Candidate Comparison (2014 vs 2019)":
-    st.markdown("## 🧑‍🤝‍🧑 Candidate Vote Comparison — 2014 vs 2019")
+if page == "🧑‍🤝‍🧑 Candidate Comparison":
+    st.markdown(f"## 🧑‍🤝‍🧑 Candidate Vote Comparison — {' vs '.join(map(str, sorted(year_selected)))}")
 
     required_cols = {"year", "state", "candidate", "party", "total_votes"}
     if not required_cols.issubset(df_all.columns):
         st.error("Required columns missing.")
-        st.stop()
+        stop()
 
-    # Use filtered dataframe
-    df_cmp = df_filtered.copy()
+    # Use filtered dataframe (votes are numeric from load time)
+    df_cmp = df_filtered
     if df_cmp.empty:
         st.warning("No data found for selected filters.")
-        st.stop()
+        stop()
 
     # Aggregate votes per candidate per state per year
-    df_cmp["total_votes"] = pd.to_numeric(df_cmp["total_votes"], errors='coerce')
-    candidate_votes = (
-        df_cmp.groupby(["year","state","candidate","party"], as_index=False)["total_votes"]
-        .sum()
-        .sort_values(["state","candidate","year"])
-    )
+    with timer.stage("aggregation"):
+        candidate_votes = analyses.candidate_votes(df_cmp)
 
     view_type = st.radio("Select View Type:", ["📊 Bar Chart","📈 Line Chart (Trend)","📋 Data Table"], horizontal=True)
 
@@ -816,7 +596,7 @@ if page == "🧑‍🤝‍🧑 Candidate Comparison (2014 vs 2019)":
         # Format text and layout
         fig.update_traces(texttemplate="%{text:,}", textposition="outside")
         fig.update_layout(height=900, bargap=0.3, title_x=0.5, margin=dict(t=80,l=20,r=20,b=80))
-        st.plotly_chart(fig, use_container_width=True)
+        plotly_chart(fig)
 
     elif view_type == "📈 Line Chart (Trend)":
         fig = px.line(
@@ -827,11 +607,11 @@ if page == "🧑‍🤝‍🧑 Candidate Comparison (2014 vs 2019)":
             line_group="candidate",
             facet_col="state",
             facet_col_wrap=3,
-            title="Candidate Vote Trend (2014 vs 2019)",
+            title=f"Candidate Vote Trend ({' vs '.join(map(str, sorted(year_selected)))})",
             markers=True
         )
         fig.update_layout(height=900, title_x=0.5)
-        st.plotly_chart(fig, use_container_width=True)
+        plotly_chart(fig)
 
     else:
         st.dataframe(
@@ -841,84 +621,48 @@ if page == "🧑‍🤝‍🧑 Candidate Comparison (2014 vs 2019)":
 
 
 # -----------------------------
-# PAGE: Turnout Change Analysis (2014 → 2019)
+# PAGE: Turnout Change Analysis (earliest → latest selected election)
 # -----------------------------
 elif page == "📈 Turnout Change Analysis":
-    st.markdown("## 📈 Turnout Change Analysis (2014 → 2019)")
+    # Compare the first and last selected years, or the whole range if fewer than two are selected
+    cmp_years = sorted(year_selected) if len(year_selected) > 1 else all_years
+    y0, y1 = cmp_years[0], cmp_years[-1]
+    st.markdown(f"## 📈 Turnout Change Analysis ({y0} → {y1})")
 
     required_cols = {"state", "year", "total_votes", "total_electors"}
     if required_cols.issubset(df_all.columns):
 
-        # Compute turnout %
-        turnout_df = (
-            df_all.groupby(["state", "year"], as_index=False)[["total_votes", "total_electors"]]
-            .sum()
-        )
-        turnout_df["turnout_pct"] = (turnout_df["total_votes"] / turnout_df["total_electors"]) * 100
-
-        # Pivot to compare 2014 vs 2019
-        pivot_df = turnout_df.pivot(index="state", columns="year", values="turnout_pct").reset_index()
-        pivot_df.columns.name = None  # remove pivot name
-        if 2014 in pivot_df.columns and 2019 in pivot_df.columns:
-            pivot_df["change_pct"] = pivot_df[2019] - pivot_df[2014]
-
-            # Rank top and bottom performers
-            top_increase = pivot_df.nlargest(10, "change_pct")
-            top_decrease = pivot_df.nsmallest(10, "change_pct")
+        if y0 != y1:
+            # Turnout % per state in both elections and the change
+            pivot_df = analyses.state_turnout_pct_change(elections, y0, y1)
 
-            # Show key metrics
-            avg_change = pivot_df["change_pct"].mean()
+            # Top / bottom 10 states by change, and an auto-generated summary
+            fig_up, fig_down, summary = charts.turnout_change(pivot_df, y0, y1)
 
             # -----------------------------
             # Top 10 States with Highest Increase
             # -----------------------------
             st.markdown("### ")
-            fig_up = px.bar(
-                top_increase.sort_values("change_pct", ascending=True),
-                x="change_pct",
-                y="state",
-                orientation="h",
-                color="change_pct",
-                color_continuous_scale="Greens",
-                labels={"change_pct": "Turnout % Change"},
-                title="🔼 States with Highest Increase in Turnout",
-            )
-            st.plotly_chart(fig_up, use_container_width=True)
+            plotly_chart(fig_up)
 
             # -----------------------------
             # Top 10 States with Decline
             # -----------------------------
             st.markdown("### ")
-            fig_down = px.bar(
-                top_decrease.sort_values("change_pct"),
-                x="change_pct",
-                y="state",
-                orientation="h",
-                color="change_pct",
-                color_continuous_scale="Reds",
-                labels={"change_pct": "Turnout % Change"},
-                title="🔽 States with Decline in Turnout",
-            )
-            st.plotly_chart(fig_down, use_container_width=True)
+            plotly_chart(fig_down)
 
             # -----------------------------
             # Insight Summary (auto-generated)
             # -----------------------------
-            best_state = top_increase.iloc[-1]["state"]
-            best_val = top_increase.iloc[-1]["change_pct"]
-            worst_state = top_decrease.iloc[0]["state"]
-            worst_val = top_decrease.iloc[0]["change_pct"]
-
-            st.info(
-                f"🔍 Between 2014 and 2019, "
-                f"{best_state} recorded the highest turnout growth (+{best_val:.2f}%), "
-                f"while {worst_state} saw the steepest decline ({worst_val:.2f}%). "
-                f"On average, national turnout changed by {avg_change:.2f}%."
-            )
+            st.info(summary)
 
         else:
-            st.warning("Insufficient year data (need both 2014 and 2019).")
+            st.warning("Insufficient year data (need at least two elections).")
 
     else:
         st.error("Required columns missing: state, year, total_votes, total_electors")
 
+# -----------------------------
+# Stage timings (ELECTION_PROFILE=1)
+# -----------------------------
+finish()
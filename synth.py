@@ -0,0 +1,285 @@
+# synth.py
+"""
+Synthetic election results in the layout of constituency_wise_results_2019.csv.
+
+    python synth.py --states 36 --pcs-per-state 15 --years 2014 2019
+    python synth.py --states 40 --pcs-per-state 2000 --years $(seq 1952 5 2047) --out synthetic/
+    python bench.py --data synthetic/ --scales 1
+
+Writes one ``constituency_wise_results_<year>.csv`` per year with the same
+columns, value formats and NOTA rows as the real files, so ingest.py and
+the loaders read them unchanged. The results files are constituency-level
+(there is no booth column to fill), so size comes from states x seats x
+candidates x years: 40 states, 2000 seats each, ~15 candidates and 20
+elections is about 24 million rows.
+
+The shape follows the real data: every state has a few strong parties
+(national parties plus its own regional ones) whose strength drifts from
+one election to the next, and a long tail of small parties and
+independents. Vote shares are Dirichlet draws weighted by that strength and
+by a persistent per-seat lean, so seats have realistic winners, margins
+and NOTA counts. Rows are generated and appended a chunk of seats at a
+time; memory is bounded by ``--chunk-rows``, not by the output size. The
+same arguments and ``--seed`` give the same files.
+"""
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import data_store
+import dims
+
+COLUMNS = [
+    "state", "pc_name", "candidate", "sex", "age", "category", "party", "party_symbol",
+    "general_votes", "postal_votes", "total_votes", "total_electors",
+]
+
+# National parties: (party, symbol, mean strength, chance of contesting a seat)
+NATIONAL = [
+    ("BJP", "Lotus", 1.0, 0.95),
+    ("INC", "Hand", 0.8, 0.9),
+    ("BSP", "Elephant", 0.12, 0.7),
+    ("CPI(M)", "Hammer, Sickle and Star", 0.08, 0.2),
+]
+# Each state gets a few regional parties named <state code><suffix>
+REGIONAL_SUFFIXES = ["JP", "KP", "SP"]
+REGIONAL_STRENGTH = 0.9
+REGIONAL_CONTEST = 0.8
+N_MINOR_PARTIES = 300
+
+SYMBOLS = [
+    "Almirah", "Auto- Rickshaw", "Bat", "Battery Torch", "Bicycle", "Black Board", "Bucket",
+    "Cake", "Ceiling Fan", "Coat", "Cot", "Cup & Saucer", "Diamond", "Football", "Gas Cylinder",
+    "Glass Tumbler", "Helicopter", "Key", "Kite", "Lady Finger", "Letter Box", "Pressure Cooker",
+    "Ring", "Road Roller", "Scissors", "Sewing Machine", "Ship", "Table", "Tractor Chalata Kisan",
+    "Truck", "Umbrella", "Walking Stick", "Whistle",
+]
+MALE_NAMES = [
+    "RAJESH", "SURESH", "RAMESH", "ANIL", "SUNIL", "VIJAY", "SANJAY", "AJAY", "ASHOK", "MANOJ",
+    "RAKESH", "MUKESH", "DINESH", "PRAKASH", "SANTOSH", "RAVI", "KRISHNA", "GOPAL", "MOHAMMED",
+    "ABDUL",
+]
+FEMALE_NAMES = ["SUNITA", "ANITA", "KAVITA", "MEENA", "REKHA", "LAKSHMI", "PRIYA", "GEETA"]
+LAST_NAMES = [
+    "KUMAR", "SINGH", "SHARMA", "YADAV", "PATEL", "REDDY", "RAO", "DAS", "GUPTA", "VERMA",
+    "PRASAD", "MISHRA", "KHAN", "NAIR", "PILLAI", "MEHTA", "JAIN", "CHAUHAN", "PAWAR", "GOWDA",
+]
+
+# Real-data proportions (2019 file)
+SEX = (["MALE", "FEMALE", "THIRD"], [0.91, 0.0892, 0.0008])
+SEAT_CATEGORY = (["GENERAL", "SC", "ST"], [0.76, 0.155, 0.085])
+GENERAL_SEAT_CATEGORY = (["GENERAL", "SC", "ST"], [0.88, 0.1, 0.02])
+
+
+# -----------------------------
+# World: states, seats, parties
+# -----------------------------
+def state_names(n):
+    """The first ``n`` real states (with codes), then 'State NN' placeholders."""
+    codes = pd.read_csv(data_store.DATA_DIR / "dim_states_codes.csv", encoding="utf-8-sig")
+    names = list(codes["state_name"].str.strip())[:n]
+    abbrs = list(codes["abbreviation"].str.strip())[:n]
+    for i in range(len(names), n):
+        names.append(f"State {i + 1:02d}")
+        abbrs.append(f"S{i + 1:02d}")
+    return names, abbrs
+
+
+def make_world(rng, n_states, pcs_per_state, n_years):
+    names, abbrs = state_names(n_states)
+    n_seats = n_states * pcs_per_state
+
+    parties = [(p, sym) for p, sym, _, _ in NATIONAL]
+    # Major-party slots per state: national parties, then that state's regional ones
+    major = np.empty((n_states, len(NATIONAL) + len(REGIONAL_SUFFIXES)), dtype=np.int32)
+    base = np.empty(major.shape)
+    contest = np.empty(major.shape)
+    major[:, :len(NATIONAL)] = np.arange(len(NATIONAL))
+    base[:, :len(NATIONAL)] = [s for _, _, s, _ in NATIONAL]
+    contest[:, :len(NATIONAL)] = [c for _, _, _, c in NATIONAL]
+    symbols = rng.permutation(SYMBOLS)
+    for s, abbr in enumerate(abbrs):
+        for j, suffix in enumerate(REGIONAL_SUFFIXES):
+            major[s, len(NATIONAL) + j] = len(parties)
+            parties.append((f"{abbr}{suffix}", symbols[(s * len(REGIONAL_SUFFIXES) + j) % len(symbols)]))
+    base[:, len(NATIONAL):] = REGIONAL_STRENGTH
+    contest[:, len(NATIONAL):] = REGIONAL_CONTEST
+    # Not every state has every regional party
+    contest[:, len(NATIONAL):] *= rng.random((n_states, len(REGIONAL_SUFFIXES))) < 0.6
+
+    minor_start = len(parties)
+    parties += [(f"P{i:03d}", SYMBOLS[i % len(SYMBOLS)]) for i in range(N_MINOR_PARTIES)]
+    parties.append(("IND", ""))
+
+    # State strength per election: a random walk around the base strength
+    strength = base * rng.lognormal(0, 0.5, base.shape)
+    drift = rng.lognormal(0, 0.3, (n_years,) + base.shape).cumprod(axis=0)
+    seat_state = np.repeat(np.arange(n_states), pcs_per_state)
+    return {
+        "states": np.array(names, dtype=object),
+        "parties": np.array([p for p, _ in parties], dtype=object),
+        "party_symbols": np.array([sym for _, sym in parties], dtype=object),
+        "minor_start": minor_start,
+        "major": major,
+        "contest": contest,
+        "strength": strength * drift,
+        "seat_state": seat_state,
+        "seat_name": np.array([f"Constituency {s + 1}-{i + 1}" for s in range(n_states)
+                               for i in range(pcs_per_state)], dtype=object),
+        "seat_category": rng.choice(SEAT_CATEGORY[0], n_seats, p=SEAT_CATEGORY[1]),
+        "seat_lean": rng.lognormal(0, 0.4, (n_seats, major.shape[1])),
+        "electors": rng.lognormal(np.log(1.6e6), 0.2, n_seats),
+    }
+
+
+# -----------------------------
+# One chunk of seats for one election
+# -----------------------------
+def generate(rng, world, seats, year_index, candidates):
+    """Candidate rows for ``seats`` (array of seat ids) in election ``year_index``."""
+    n = len(seats)
+    state = world["seat_state"][seats]
+    n_major = world["major"].shape[1]
+
+    # Contesting major parties and their Dirichlet weights
+    in_race = rng.random((n, n_major)) < world["contest"][state]
+    alpha = world["strength"][year_index][state] * world["seat_lean"][seats] * 6
+    # A minor-party / independent tail to reach ~``candidates`` per seat
+    n_tail = np.maximum(rng.poisson(max(candidates - 4, 0), n), 1)
+    width = n_major + n_tail.max()
+    valid = np.zeros((n, width), dtype=bool)
+    valid[:, :n_major] = in_race
+    valid[:, n_major:] = np.arange(width - n_major) < n_tail[:, None]
+    weights = np.full((n, width), 0.08)
+    weights[:, :n_major] = alpha
+
+    shares = rng.gamma(np.where(valid, weights, 1.0)) * valid
+    shares /= shares.sum(axis=1, keepdims=True)
+
+    electors = np.round(world["electors"][seats] * 1.015 ** year_index).astype(np.int64)
+    cast = electors * rng.beta(20, 10, n)
+    nota = rng.beta(2, 200, n)
+    votes = np.round(shares * (cast * (1 - nota))[:, None]).astype(np.int64)
+    nota_votes = np.round(cast * nota).astype(np.int64)
+
+    rows, cols = np.nonzero(valid)
+    party = np.where(
+        cols < n_major,
+        world["major"][state[rows], np.minimum(cols, n_major - 1)],
+        np.where(rng.random(len(rows)) < 0.45, len(world["parties"]) - 1,
+                 world["minor_start"] + rng.integers(0, N_MINOR_PARTIES, len(rows))),
+    )
+    symbol = world["party_symbols"][party]
+    independent = world["parties"][party] == "IND"
+    symbol[independent] = rng.choice(SYMBOLS, independent.sum())
+
+    seat_cat = world["seat_category"][seats][rows]
+    category = np.where(
+        seat_cat == "GENERAL",
+        rng.choice(GENERAL_SEAT_CATEGORY[0], len(rows), p=GENERAL_SEAT_CATEGORY[1]),
+        seat_cat,
+    )
+    sex = rng.choice(SEX[0], len(rows), p=SEX[1])
+    first = np.where(sex == "FEMALE", rng.choice(FEMALE_NAMES, len(rows)), rng.choice(MALE_NAMES, len(rows)))
+    total = votes[rows, cols]
+    postal = rng.binomial(total, rng.beta(2, 400, len(rows)))
+    candidates_df = pd.DataFrame({
+        "seat": rows,
+        "state": world["states"][state[rows]],
+        "pc_name": world["seat_name"][seats][rows],
+        "candidate": first.astype(object) + " " + rng.choice(LAST_NAMES, len(rows)).astype(object),
+        "sex": sex,
+        "age": np.clip(np.round(rng.normal(47, 12, len(rows))), 25, 90).astype(float),
+        "category": category,
+        "party": world["parties"][party],
+        "party_symbol": symbol,
+        "general_votes": total - postal,
+        "postal_votes": postal,
+        "total_votes": total,
+        "total_electors": electors[rows],
+    })
+    nota_postal = rng.binomial(nota_votes, 0.002)
+    nota_df = pd.DataFrame({
+        "seat": np.arange(n),
+        "state": world["states"][state],
+        "pc_name": world["seat_name"][seats],
+        "candidate": "NOTA",
+        "party": "NOTA",
+        "general_votes": nota_votes - nota_postal,
+        "postal_votes": nota_postal,
+        "total_votes": nota_votes,
+        "total_electors": electors,
+    })
+    # Within a seat: candidates by votes, NOTA last, as in the real files
+    out = pd.concat([
+        candidates_df.sort_values(["seat", "total_votes"], ascending=[True, False], kind="stable"),
+        nota_df,
+    ]).sort_values("seat", kind="stable")
+    return out.reindex(columns=COLUMNS)
+
+
+# -----------------------------
+# Writer
+# -----------------------------
+def write(out_dir, n_states=36, pcs_per_state=15, years=(2014, 2019), candidates=15,
+          seed=0, chunk_rows=1_000_000):
+    """Write one results CSV per year to ``out_dir``; returns {year: rows}."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    world = make_world(rng, n_states, pcs_per_state, len(years))
+    n_seats = len(world["seat_name"])
+    step = max(chunk_rows // (candidates + 1), 1)
+
+    written = {}
+    for i, year in enumerate(years):
+        path = out_dir / f"constituency_wise_results_{year}.csv"
+        written[year] = 0
+        for start in range(0, n_seats, step):
+            chunk = generate(rng, world, np.arange(start, min(start + step, n_seats)), i, candidates)
+            chunk.to_csv(path, mode="w" if start == 0 else "a", header=start == 0, index=False)
+            written[year] += len(chunk)
+        print(f"{path.name}: {written[year]:,} rows")
+    return written
+
+
+# -----------------------------
+# Loading a synthetic set like data_store.load_combined()
+# -----------------------------
+def load(out_dir):
+    """Every results CSV in ``out_dir`` as one frame with ``year``, turnout and dimension keys."""
+    frames = []
+    for path in sorted(Path(out_dir).glob("constituency_wise_results_*.csv")):
+        df = pd.read_csv(path)
+        df["year"] = int(path.stem.rsplit("_", 1)[1])
+        frames.append(df)
+    if not frames:
+        raise FileNotFoundError(f"no constituency_wise_results_<year>.csv files in {out_dir}")
+
+    state_codes = pd.read_csv(data_store.DATA_DIR / "dim_states_codes.csv", encoding="utf-8-sig")
+    states = dims.build_states(state_codes)
+    df = dims.canonicalize(data_store.coerce_numeric(pd.concat(frames, ignore_index=True)), states)
+    df["turnout"] = (df["total_votes"] / df["total_electors"]) * 100
+    return data_store.compact(dims.encode(df, dims.build_dims([df], state_codes)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--states", type=int, default=36)
+    parser.add_argument("--pcs-per-state", type=int, default=15)
+    parser.add_argument("--years", nargs="+", type=int, default=[2014, 2019])
+    parser.add_argument("--candidates", type=int, default=15, help="mean candidates per seat, NOTA excluded")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-rows", type=int, default=1_000_000, help="rows generated per write")
+    parser.add_argument("--out", default="synthetic")
+    args = parser.parse_args(argv)
+
+    written = write(args.out, args.states, args.pcs_per_state, sorted(args.years), args.candidates,
+                    args.seed, args.chunk_rows)
+    print(f"Wrote {sum(written.values()):,} rows to {args.out}/")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import backends
+import data_store
+
+QUERIES = [
+    (["state", "year"], ["total_votes", "total_electors"], None),
+    (["party"], ["total_votes"], {"year": [2019], "state": ["Kerala", "Tamil Nadu"]}),
+    (["year", "state", "party"], ["general_votes", "postal_votes"], {"party": ["BJP", "INC", "NOTA"]}),
+    (["state"], ["total_votes"], {"party": []}),
+]
+
+
+@pytest.fixture(scope="module")
+def df():
+    return data_store.load_results()
+
+
+def comparable(result):
+    """Rows sorted by their labels, keys as plain strings."""
+    out = result.reset_index()
+    keys = list(result.index.names)
+    out[keys] = out[keys].astype(str)
+    return out.sort_values(keys).reset_index(drop=True)
+
+
+def assert_same_sums(backend, df):
+    reference = backends.PandasBackend(df)
+    for keys, values, where in QUERIES:
+        want = reference.group_sum(keys, values, where)
+        got = backend.group_sum(keys, values, where)
+        pd.testing.assert_frame_equal(comparable(got), comparable(want))
+        assert all(got[v].dtype == np.int64 for v in values)
+
+
+def test_pandas_sums_are_int64(df):
+    # pandas keeps int32 through some groupby sums; the backend must not
+    out = backends.PandasBackend(df).group_sum(["year"], ["total_votes"])
+    assert out["total_votes"].dtype == np.int64
+    assert out["total_votes"].sum() == df["total_votes"].astype("int64").sum()
+
+
+def test_duckdb_matches_pandas(df):
+    pytest.importorskip("duckdb")
+    assert_same_sums(backends.DuckDBBackend(df), df)
+
+
+def test_duckdb_parquet_source_matches_pandas(df):
+    pytest.importorskip("duckdb")
+    assert_same_sums(backends.create(df, "duckdb", "results"), df)
+
+
+def test_parallel_in_process_matches_pandas(df):
+    backend = backends.ParallelBackend(df)
+    try:
+        assert_same_sums(backend, df)
+    finally:
+        backend.close()
+
+
+def test_parallel_pool_matches_pandas(df):
+    # min_rows=0 sends even the real dataset through the process pool
+    backend = backends.ParallelBackend(df, workers=2, min_rows=0)
+    try:
+        assert_same_sums(backend, df)
+    finally:
+        backend.close()
+
+
+def test_parallel_nullable_column_matches_pandas(df):
+    backend = backends.ParallelBackend(df, workers=2, min_rows=0)
+    try:
+        got = backend.group_sum(["year"], ["age"])
+    finally:
+        backend.close()
+    want = backends.PandasBackend(df).group_sum(["year"], ["age"])
+    pd.testing.assert_frame_equal(comparable(got), comparable(want))
+
+
+def test_parallel_rejects_non_numeric_values(df):
+    backend = backends.ParallelBackend(df)
+    try:
+        with pytest.raises(TypeError):
+            backend.group_sum(["year"], ["candidate"])
+    finally:
+        backend.close()
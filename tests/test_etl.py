@@ -0,0 +1,34 @@
+import pandas as pd
+import pytest
+
+import data_store
+import etl
+
+OUTPUTS = ["cleaned_combined_data.csv", "party_summary.csv", "state_summary.csv"]
+
+
+@pytest.fixture(scope="module")
+def built(tmp_path_factory):
+    out = tmp_path_factory.mktemp("etl")
+    status = etl.run(data_store.DATA_DIR, out, workers=1)
+    return out, status
+
+
+def test_outputs_match_committed_csvs(built):
+    out, status = built
+    assert set(status.values()) == {"ran"}
+    for name in OUTPUTS:
+        assert (out / name).read_bytes() == (data_store.DATA_DIR / name).read_bytes(), name
+
+
+def test_second_run_skips_every_step(built):
+    out, _ = built
+    assert set(etl.run(data_store.DATA_DIR, out, workers=1).values()) == {"skipped"}
+
+
+def test_refuses_to_drop_years_without_a_raw_file(tmp_path):
+    combined = pd.read_csv(data_store.DATA_DIR / "cleaned_combined_data.csv")
+    extra = combined[combined["year"] == 2019].assign(year=2029)
+    pd.concat([combined, extra]).to_csv(tmp_path / "cleaned_combined_data.csv", index=False)
+    with pytest.raises(ValueError, match="2029"):
+        etl.run(data_store.DATA_DIR, tmp_path, workers=1)
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+
+import facts
+
+
+def candidates(rows):
+    return pd.DataFrame(rows, columns=["year", "state", "pc_name", "candidate", "party", "total_votes"])
+
+
+def test_top2_tie_goes_to_the_earlier_row():
+    codes = np.array([0, 0, 0, 1, 1])
+    votes = np.array([50, 80, 80, 10, 10])
+    groups, first, second = facts.top2(codes, votes)
+    assert groups.tolist() == [0, 1]
+    assert first.tolist() == [1, 3]
+    assert second.tolist() == [2, 4]
+
+
+def test_margins_tied_seat_matches_idxmax():
+    df = candidates([
+        (2019, "S", "Tied", "A", "P1", 300),
+        (2019, "S", "Tied", "B", "P2", 300),
+        (2019, "S", "Tied", "C", "P3", 100),
+    ])
+    out = facts.margins(df, ["year", "state", "pc_name"])
+    assert out.loc[0, "winner"] == df.loc[df["total_votes"].idxmax(), "candidate"] == "A"
+    assert out.loc[0, "runner_up"] == "B"
+    assert out.loc[0, "margin"] == 0
+
+
+def reference_margins(df, by):
+    """Winner and runner-up by a stable descending sort per group, as the sections did before the kernel."""
+    ranked = df.sort_values("total_votes", ascending=False, kind="stable")
+    rank = ranked.groupby(by, sort=False).cumcount()
+    first = ranked[rank == 0].set_index(by)
+    second = ranked[rank == 1].set_index(by)
+    out = first[["candidate", "total_votes"]].rename(columns={"candidate": "winner", "total_votes": "winner_votes"})
+    out["runner_up"] = second["candidate"]
+    out["margin"] = out["winner_votes"] - second["total_votes"].reindex(out.index).fillna(0).astype("int64")
+    return out.sort_index()
+
+
+def test_margins_match_a_sort_per_group():
+    rng = np.random.default_rng(0)
+    n = 5000
+    # Few distinct vote counts, so many seats have ties
+    df = pd.DataFrame({
+        "year": rng.choice([2014, 2019], n),
+        "state": rng.choice(["S1", "S2", "S3"], n),
+        "pc_name": rng.integers(0, 400, n).astype(str),
+        "candidate": [f"c{i}" for i in range(n)],
+        "party": rng.choice(["P1", "P2", "P3"], n),
+        "total_votes": rng.integers(0, 20, n),
+    })
+    by = ["year", "state", "pc_name"]
+    out = facts.margins(df, by).set_index(by).sort_index()
+    expected = reference_margins(df, by)
+    pd.testing.assert_series_equal(out["winner"], expected["winner"], check_dtype=False)
+    pd.testing.assert_series_equal(out["runner_up"], expected["runner_up"], check_dtype=False)
+    pd.testing.assert_series_equal(out["margin"], expected["margin"], check_dtype=False)
+    total = df.groupby(by)["total_votes"].sum().sort_index()
+    np.testing.assert_allclose(out["margin_pct"], expected["margin"] / total * 100)
+
+
+def test_build_facts_single_candidate_and_nota():
+    df = candidates([
+        (2019, "S", "Solo", "A", "P1", 500),
+        (2019, "S", "Pair", "B", "P1", 400),
+        (2019, "S", "Pair", "N", "NOTA", 450),
+        (2019, "S", "Pair", "C", "P2", 300),
+    ]).assign(state_name="S", total_electors=1000)
+    out = facts.build_facts(df).set_index("pc_name")
+    assert out.loc["Solo", "runner_up_votes"] == 0
+    assert out.loc["Solo", "margin"] == 500
+    # NOTA neither wins nor comes second
+    assert (out.loc["Pair", "winner"], out.loc["Pair", "runner_up"]) == ("B", "C")
+    assert out.loc["Pair", "nota_votes"] == 450
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import data_store
+from filter_index import FilterIndex
+
+COLUMNS = ["year", "state", "pc_name", "party", "candidate"]
+
+
+@pytest.fixture(scope="module")
+def df():
+    return data_store.load_results()
+
+
+@pytest.fixture(scope="module")
+def index(df):
+    # max_bitmaps between the state and constituency counts, so both layouts are exercised
+    return FilterIndex(df, COLUMNS, max_bitmaps=64)
+
+
+def test_mask_matches_isin(df, index):
+    rng = np.random.default_rng(0)
+    for col in COLUMNS:
+        values = pd.unique(df[col].dropna())
+        for k in (1, 3, 25):
+            selected = list(rng.choice(values, min(k, len(values)), replace=False))
+            np.testing.assert_array_equal(index.mask(col, selected), df[col].isin(selected).to_numpy())
+
+
+def test_unknown_and_empty_selections(df, index):
+    assert not index.mask("party", []).any()
+    assert not index.mask("party", ["no such party"]).any()
+    np.testing.assert_array_equal(index.mask("party", ["BJP", "no such party"]), (df["party"] == "BJP").to_numpy())
+
+
+def test_select_matches_combined_filters(df, index):
+    filters = {"year": [2019], "state": ["Kerala", "Goa", "NCT OF Delhi"], "party": ["BJP", "INC"]}
+    expected = np.ones(len(df), dtype=bool)
+    for col, selected in filters.items():
+        expected &= df[col].isin(selected).to_numpy()
+    np.testing.assert_array_equal(index.select(**filters, pc_name=None), expected)
+
+
+def test_options_match_unique_values(df, index):
+    mask = index.select(year=[2014], state=["Kerala"])
+    rows = df[mask]
+    for col in ("pc_name", "party", "candidate"):
+        assert index.options(col, mask) == sorted(rows[col].dropna().unique())
+    assert index.values("year") == sorted(df["year"].unique())
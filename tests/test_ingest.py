@@ -0,0 +1,65 @@
+import shutil
+
+import pandas as pd
+import pytest
+
+import data_store
+import ingest
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """The combined CSV and its summaries copied to ``tmp_path``, with ingest pointed at them."""
+    for name in ("cleaned_combined_data.csv", "party_summary.csv", "state_summary.csv"):
+        shutil.copy(data_store.DATA_DIR / name, tmp_path / name)
+    monkeypatch.setattr(ingest, "COMBINED_CSV", tmp_path / "cleaned_combined_data.csv")
+    views = {name: {**view, "path": tmp_path / view["path"].name} for name, view in ingest.VIEWS.items()}
+    monkeypatch.setattr(ingest, "VIEWS", views)
+    monkeypatch.setattr(data_store, "register_raw", lambda year, path, src=None: None)
+    return tmp_path
+
+
+def rebuilt(name):
+    """Summary ``name`` aggregated from scratch over the combined CSV, as etl.py writes it."""
+    view = ingest.VIEWS[name]
+    out = ingest.aggregate(pd.read_csv(ingest.COMBINED_CSV), view).reset_index()
+    return out.sort_values(ingest.SUMMARY_ORDER[name]).reset_index(drop=True)
+
+
+def test_committed_summaries_match_a_rebuild(store):
+    for name, view in ingest.VIEWS.items():
+        pd.testing.assert_frame_equal(pd.read_csv(view["path"]), rebuilt(name))
+
+
+def test_append_matches_full_rebuild(store):
+    raw = pd.read_csv(data_store.DATA_DIR / "constituency_wise_results_2019.csv")
+    raw.iloc[::2].to_csv(store / "results_2024.csv", index=False)
+    added = ingest.ingest(store / "results_2024.csv", 2024)
+
+    assert len(added) == len(raw.iloc[::2])
+    assert ingest.existing_years() == {2014, 2019, 2024}
+    for name, view in ingest.VIEWS.items():
+        pd.testing.assert_frame_equal(pd.read_csv(view["path"]), rebuilt(name))
+
+
+def test_existing_year_needs_replace(store):
+    with pytest.raises(ValueError, match="--replace"):
+        ingest.ingest(data_store.DATA_DIR / "constituency_wise_results_2019.csv", 2019)
+
+
+def test_replace_matches_full_rebuild(store):
+    raw = pd.read_csv(data_store.DATA_DIR / "constituency_wise_results_2019.csv")
+    raw.to_csv(store / "results_2024.csv", index=False)
+    ingest.ingest(store / "results_2024.csv", 2024)
+
+    # The reloaded year loses a party and a state altogether
+    party = raw["party"].value_counts().index[-1]
+    state = raw["state"].iloc[-1]
+    raw[(raw["party"] != party) & (raw["state"] != state)].to_csv(store / "results_2024.csv", index=False)
+    ingest.ingest(store / "results_2024.csv", 2024, replace=True)
+
+    for name, view in ingest.VIEWS.items():
+        stored = pd.read_csv(view["path"])
+        pd.testing.assert_frame_equal(stored, rebuilt(name))
+    party_summary = pd.read_csv(ingest.VIEWS["party_summary"]["path"])
+    assert not ((party_summary["party"] == party) & (party_summary["year"] == 2024)).any()
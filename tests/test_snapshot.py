@@ -0,0 +1,81 @@
+import json
+import shutil
+
+import numpy as np
+import pandas as pd
+import plotly.io as pio
+import pytest
+
+import batch
+import data_store
+import sections
+import snapshot
+from analyses import AnalysisStore
+
+PAIR = (2014, 2019)
+
+
+@pytest.fixture(scope="module")
+def built(tmp_path_factory):
+    out = tmp_path_factory.mktemp("snapshot")
+    snapshot.build(out, [PAIR])
+    return out
+
+
+def assert_same_value(got, want):
+    if isinstance(want, np.ndarray):
+        want = pd.DataFrame(want)
+    if isinstance(want, pd.Series):
+        want = want.to_frame()
+    if isinstance(want, pd.DataFrame):
+        want = want.copy()
+        want.columns = [str(c) for c in want.columns]
+        pd.testing.assert_frame_equal(got, want)
+    elif hasattr(want, "to_plotly_json"):
+        # Through JSON on both sides: plotly drops empty properties (facet annotation fonts) on reload
+        assert json.loads(got.to_json()) == json.loads(pio.from_json(want.to_json()).to_json())
+    else:
+        assert got == want
+
+
+def assert_same_blocks(got, want):
+    assert len(got) == len(want)
+    for (kind, *args), (want_kind, *want_args) in zip(got, want):
+        assert kind == want_kind
+        if kind == "columns":
+            for col, want_col in zip(args[0], want_args[0]):
+                assert_same_blocks(col, want_col)
+        else:
+            for a, b in zip(args, want_args):
+                assert_same_value(a, b)
+
+
+def test_round_trip(built):
+    snap = snapshot.Snapshot.open(built, dataset_version=data_store.dataset_version())
+    assert snap is not None
+    store = AnalysisStore(batch.load_elections(), data_store.dataset_version())
+    for number, fn in sorted(sections.SECTIONS.items()):
+        assert_same_blocks(snap.get(number, *PAIR), fn(store, *PAIR))
+
+
+def test_stale_or_missing(built):
+    assert snapshot.Snapshot.open(built, dataset_version="other") is None
+    assert snapshot.Snapshot.open(built.parent / "nowhere") is None
+    snap = snapshot.Snapshot.open(built)
+    assert snap.get(min(sections.SECTIONS), 2019, 2014) is None
+
+
+def test_rebuild_switches_pointer_and_keeps_previous(tmp_path):
+    snapshot.build(tmp_path, [PAIR])
+    first = snapshot.current_build(tmp_path)
+    snap = snapshot.Snapshot.open(tmp_path)
+    snapshot.build(tmp_path, [PAIR])
+    second = snapshot.current_build(tmp_path)
+
+    assert second != first
+    assert (tmp_path / first).is_dir() and (tmp_path / second).is_dir()
+    # An app still on the first build keeps reading it, and falls back once it is gone
+    assert all(snap.get(n, *PAIR) is not None for n in sections.SECTIONS)
+    shutil.rmtree(tmp_path / first)
+    snap._tables.clear()
+    assert None in [snap.get(n, *PAIR) for n in sections.SECTIONS]